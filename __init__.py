@@ -72,8 +72,9 @@ from . properties import M4SceneProperties, M4ObjectProperties
 from . utils.registration import get_core, get_prefs, get_tools, get_pie_menus, get_path
 from . utils.registration import register_classes, unregister_classes, register_keymaps, unregister_keymaps, register_icons, unregister_icons, register_msgbus, unregister_msgbus
 from . utils.system import verify_update, install_update
+from . utils.developer import profiler
 from . ui.menus import asset_browser_bookmark_buttons, object_context_menu, mesh_context_menu, add_object_buttons, material_pick_button, outliner_group_toggles, extrude_menu, group_origin_adjustment_toggle, render_menu, render_buttons
-from . handlers import load_post, undo_pre, depsgraph_update_post, render_start, render_end
+from . handlers import load_post, undo_pre, undo_post, frame_change_post, depsgraph_update_post, render_start, render_end
 from time import time
 def update_check():
     def hook(resp, *args, **kwargs):
@@ -297,12 +298,17 @@ def register():
 
     bpy.app.handlers.load_post.append(load_post)
     bpy.app.handlers.depsgraph_update_post.append(depsgraph_update_post)
+    bpy.app.handlers.frame_change_post.append(frame_change_post)
 
     bpy.app.handlers.render_init.append(render_start)
     bpy.app.handlers.render_cancel.append(render_end)
     bpy.app.handlers.render_complete.append(render_end)
 
     bpy.app.handlers.undo_pre.append(undo_pre)
+    bpy.app.handlers.undo_post.append(undo_post)
+    bpy.app.handlers.redo_post.append(undo_post)
+
+    profiler.enabled = get_prefs().profiling
 
     if get_prefs().registration_debug:
         print(f"Registered {bl_info['name']} {'.'.join([str(i) for i in bl_info['version']])} with {tool_count} {'tool' if tool_count == 1 else 'tools'}, {pie_count} pie {'menu' if pie_count == 1 else 'menus'}")
@@ -340,12 +346,15 @@ def unregister():
         bpy.types.SpaceView3D.draw_handler_remove(screencastHUD, 'WINDOW')
 
     bpy.app.handlers.depsgraph_update_post.remove(depsgraph_update_post)
+    bpy.app.handlers.frame_change_post.remove(frame_change_post)
 
     bpy.app.handlers.render_init.remove(render_start)
     bpy.app.handlers.render_cancel.remove(render_end)
     bpy.app.handlers.render_complete.remove(render_end)
 
     bpy.app.handlers.undo_pre.remove(undo_pre)
+    bpy.app.handlers.undo_post.remove(undo_post)
+    bpy.app.handlers.redo_post.remove(undo_post)
 
     unregister_msgbus(owner)
 
@@ -0,0 +1,482 @@
+'''
+M4A1tools benchmark suite, run headless:
+
+    blender --background --factory-startup --python benchmarks/run.py -- --scales 1000 100000 --baseline benchmarks/baseline.json
+
+--save-baseline writes the current results as the new baseline, --threshold sets the allowed slowdown (0.25 = 25%).
+The exit code is 1, if any case regressed against the baseline.
+
+Each case runs in its own Blender process, so its peak memory is the RSS growth of that process alone.
+'''
+
+import bpy
+import bmesh
+import addon_utils
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from importlib import import_module
+import numpy as np
+
+try:
+    import resource
+
+except ImportError:
+    resource = None
+
+path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+name = os.path.basename(path)
+
+default_scales = [1000, 10000, 100000, 1000000, 5000000]
+
+def get_args():
+    argv = sys.argv[sys.argv.index('--') + 1:] if '--' in sys.argv else []
+
+    parser = argparse.ArgumentParser(prog='benchmarks/run.py')
+    parser.add_argument('--scales', type=int, nargs='+', default=default_scales, help="vertex counts of the synthetic meshes, up to 5000000")
+    parser.add_argument('--cases', nargs='+', default=[], help="only run cases starting with these names")
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per case, the median is compared")
+    parser.add_argument('--baseline', default=os.path.join(path, 'benchmarks', 'baseline.json'))
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--output', default='', help="write the results to this JSON file")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed relative slowdown before a case counts as a regression")
+    parser.add_argument('--min-delta', type=float, default=0.002, help="slowdowns below this many seconds are ignored as noise")
+    parser.add_argument('--worker', nargs=2, metavar=('CASE', 'SCALE'), help=argparse.SUPPRESS)
+
+    return parser.parse_args(argv)
+
+def get_module(module):
+    return import_module(f"{name}.{module}")
+
+def enable_addon():
+    sys.path.insert(0, os.path.dirname(path))
+
+    addon_utils.enable(name, default_set=True)
+
+    if name not in bpy.context.preferences.addons:
+        raise RuntimeError(f"Could not enable {name}")
+
+
+# SYNTHETIC MESHES
+
+def get_grid_arrays(count):
+    side = max(int(np.ceil(np.sqrt(count))), 2)
+
+    x, y = np.meshgrid(np.linspace(-1, 1, side), np.linspace(-1, 1, side))
+    z = 0.05 * np.sin(x * 12) * np.cos(y * 12)
+
+    coords = np.stack((x, y, z), axis=-1).reshape(-1, 3).astype(np.float32)
+
+    idx = np.arange(side * side).reshape(side, side)
+    quads = np.stack((idx[:-1, :-1], idx[:-1, 1:], idx[1:, 1:], idx[1:, :-1]), axis=-1).reshape(-1, 4).astype(np.int32)
+
+    return side, coords, quads
+
+def create_mesh_object(name, coords, quads):
+    mesh = bpy.data.meshes.new(name)
+
+    mesh.vertices.add(len(coords))
+    mesh.vertices.foreach_set('co', coords.ravel())
+
+    mesh.loops.add(quads.size)
+    mesh.loops.foreach_set('vertex_index', quads.ravel())
+
+    mesh.polygons.add(len(quads))
+    mesh.polygons.foreach_set('loop_start', np.arange(0, quads.size, 4, dtype=np.int32))
+
+    if bpy.app.version < (4, 0, 0):
+        mesh.polygons.foreach_set('loop_total', np.full(len(quads), 4, dtype=np.int32))
+
+    mesh.update(calc_edges=True)
+
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+
+    return obj
+
+def get_grid_object(count):
+    side, coords, quads = get_grid_arrays(count)
+    obj = create_mesh_object(f"Grid_{count}", coords, quads)
+
+    rows, cols = np.divmod(np.arange(len(quads)), side - 1)
+
+    obj.data.polygons.foreach_set('select', ((rows % 9 < 8) & (cols % 9 < 8)))
+
+    group = obj.vertex_groups.new(name='Left')
+    left = np.flatnonzero(coords[:, 0] > 0).tolist()
+
+    if left:
+        group.add(left, 1, 'REPLACE')
+
+    return obj
+
+def set_active(obj, mode='OBJECT'):
+    if bpy.context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    for o in bpy.context.selected_objects:
+        o.select_set(False)
+
+    obj.select_set(True)
+    bpy.context.view_layer.objects.active = obj
+
+    if mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode=mode)
+
+def remove_object(obj):
+    if bpy.context.mode != 'OBJECT':
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+    mesh = obj.data if obj.type == 'MESH' else None
+    bpy.data.objects.remove(obj, do_unlink=True)
+
+    if mesh and not mesh.users:
+        bpy.data.meshes.remove(mesh)
+
+def select_center_faces(obj, fraction=0.1):
+    mesh = obj.data
+
+    count = len(mesh.polygons)
+    loop_starts = np.empty(count, dtype=np.int32)
+    mesh.polygons.foreach_get('loop_start', loop_starts)
+
+    loops = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', loops)
+
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get('vertices', edges)
+
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', coords)
+
+    limit = np.sqrt(fraction)
+    inside = np.all(np.abs(coords.reshape(-1, 3)[:, :2]) <= limit, axis=1)
+
+    face_select = np.logical_and.reduceat(inside[loops], loop_starts) if count else np.zeros(0, dtype=bool)
+
+    vert_select = np.zeros(len(inside), dtype=bool)
+    vert_select[loops[np.repeat(face_select, np.diff(np.append(loop_starts, len(loops))))]] = True
+
+    mesh.vertices.foreach_set('select', vert_select)
+    mesh.edges.foreach_set('select', np.all(vert_select[edges.reshape(-1, 2)], axis=1))
+    mesh.polygons.foreach_set('select', face_select)
+
+
+# CASES
+
+def bench_get_coords(obj):
+    get_coords = get_module('utils.mesh').get_coords
+
+    def run():
+        get_coords(obj.data, mx=obj.matrix_world, indices=True)
+
+    return run, None
+
+def bench_shortest_path(obj):
+    get_shortest_path = get_module('utils.graph').get_shortest_path
+
+    invalidate_mesh_graphs = get_module('utils.graph').invalidate_mesh_graphs
+
+    bm = bmesh.new()
+    bm.from_mesh(obj.data)
+    bm.verts.ensure_lookup_table()
+
+    def run():
+        get_shortest_path(bm, bm.verts[0], bm.verts[-1], topo=False, obj=obj)
+        get_shortest_path(bm, bm.verts[0], bm.verts[-1], topo=True, obj=obj)
+
+    def teardown():
+        invalidate_mesh_graphs()
+        bm.free()
+
+    return run, teardown
+
+def bench_selection_islands(obj):
+    get_selection_islands = get_module('utils.selection').get_selection_islands
+
+    bm = bmesh.new()
+    bm.from_mesh(obj.data)
+
+    def run():
+        get_selection_islands([f for f in bm.faces if f.select])
+
+    return run, bm.free
+
+def bench_raycast(obj):
+    geometry_cache = get_module('utils.raycast').geometry_cache
+
+    origins = [(x, y, 1) for x in np.linspace(-0.9, 0.9, 32) for y in np.linspace(-0.9, 0.9, 32)]
+
+    def run():
+        geometry_cache.invalidate(obj=obj)
+        bvh = geometry_cache.get(obj)['bvh']
+
+        for origin in origins:
+            bvh.ray_cast(origin, (0, 0, -1))
+
+    return run, lambda: geometry_cache.invalidate(obj=obj)
+
+def bench_mirror_vg(obj):
+    mirror_vg = get_module('operators.mirror_vg')
+
+    def run():
+        mirror_vg.mirror_maps.clear()
+
+        mirror_vg.get_vgroup_influences(obj)
+        mirror_vg.get_mirror_map(obj.data, method='NEAREST')
+
+    return run, mirror_vg.mirror_maps.clear
+
+def bench_clean_up(obj):
+    original = obj.data
+
+    def run():
+        obj.data = original.copy()
+
+        set_active(obj, mode='EDIT')
+        bpy.ops.mesh.select_all(action='SELECT')
+        bpy.ops.m4a1.clean_up()
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        temp = obj.data
+        obj.data = original
+        bpy.data.meshes.remove(temp)
+
+    return run, None
+
+def bench_punch_it(obj):
+    original = obj.data
+
+    def run():
+        obj.data = original.copy()
+        select_center_faces(obj)
+
+        set_active(obj, mode='EDIT')
+        bpy.ops.m4a1.punch_it('INVOKE_DEFAULT', amount=0.1)
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        temp = obj.data
+        obj.data = original
+        bpy.data.meshes.remove(temp)
+
+    return run, None
+
+def bench_thread(obj):
+    segments = max(len(obj.data.vertices) // 2, 5)
+
+    def run():
+        set_active(obj)
+
+        bpy.ops.mesh.primitive_cylinder_add(vertices=segments, end_fill_type='NOTHING')
+        cylinder = bpy.context.active_object
+
+        bpy.ops.object.mode_set(mode='EDIT')
+        bpy.ops.mesh.select_all(action='SELECT')
+        bpy.ops.m4a1.add_thread()
+
+        remove_object(cylinder)
+
+    return run, None
+
+def bench_lattice(obj):
+    def run():
+        existing = set(bpy.data.objects)
+
+        set_active(obj)
+        bpy.ops.m4a1.lattice_operator()
+
+        for o in set(bpy.data.objects) - existing:
+            bpy.data.objects.remove(o, do_unlink=True)
+
+        obj.modifiers.clear()
+
+    return run, None
+
+cases = [('mesh.get_coords', bench_get_coords, 5000000),
+         ('graph.shortest_path', bench_shortest_path, 1000000),
+         ('selection.islands', bench_selection_islands, 1000000),
+         ('raycast.geometry_cache', bench_raycast, 5000000),
+         ('mirror_vg.mirror_map', bench_mirror_vg, 5000000),
+         ('op.clean_up', bench_clean_up, 1000000),
+         ('op.punch_it', bench_punch_it, 1000000),
+         ('op.thread', bench_thread, 100000),
+         ('op.lattice', bench_lattice, 5000000)]
+
+
+# RUNNER
+
+def get_proc_status(field):
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024
+
+    except OSError:
+        pass
+
+def reset_peak_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+
+    except OSError:
+        pass
+
+def get_rss():
+    return get_proc_status('VmRSS')
+
+def get_peak_rss():
+    if (peak := get_proc_status('VmHWM')) is not None:
+        return peak
+
+    if resource:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss / 1024 ** 2 if sys.platform == 'darwin' else rss / 1024
+
+def measure(run, repeat):
+    times = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    return {'median_s': float(np.median(times)),
+            'min_s': min(times)}
+
+def run_worker(args):
+    case, count = args.worker[0], int(args.worker[1])
+    setup = next(setup for name, setup, _ in cases if name == case)
+
+    obj = get_grid_object(count)
+
+    reset_peak_rss()
+    before = get_rss() or get_peak_rss()
+
+    try:
+        run, teardown = setup(obj)
+
+        try:
+            result = measure(run, args.repeat)
+
+            if before is not None:
+                result['peak_mb'] = max(get_peak_rss() - before, 0)
+
+        finally:
+            if teardown:
+                teardown()
+
+    except Exception as e:
+        result = {'error': f"{type(e).__name__}: {e}"}
+
+    print(f"RESULT {json.dumps(result)}", flush=True)
+
+def spawn_worker(case, count, repeat):
+    cmd = [bpy.app.binary_path, '--background', '--factory-startup', '--python', os.path.realpath(__file__), '--', '--worker', case, str(count), '--repeat', str(repeat)]
+
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith('RESULT '):
+            return json.loads(line[7:])
+
+    lines = (proc.stderr or proc.stdout).strip().splitlines()
+
+    return {'error': f"worker exited with {proc.returncode}: {lines[-1] if lines else ''}"}
+
+def run_cases(args):
+    results = {}
+
+    for count in sorted(args.scales):
+        print(f"\nScale: {count} verts")
+
+        for case, _, max_count in cases:
+            if args.cases and not any(case.startswith(c) for c in args.cases):
+                continue
+
+            if count > max_count:
+                continue
+
+            key = f"{case}@{count}"
+            result = results[key] = spawn_worker(case, count, args.repeat)
+
+            if 'error' in result:
+                print(f" {key:<40} ERROR {result['error']}")
+
+            else:
+                print(f" {key:<40} {result['median_s'] * 1000:10.2f} ms {result.get('peak_mb', 0):10.2f} MB")
+
+    return results
+
+def compare(results, baseline, threshold, min_delta):
+    regressions = []
+
+    for key, result in results.items():
+        base = baseline.get(key)
+
+        if not base or 'median_s' not in base:
+            continue
+
+        if 'error' in result:
+            regressions.append((key, base['median_s'], None))
+            continue
+
+        delta = result['median_s'] - base['median_s']
+
+        if delta > min_delta and result['median_s'] > base['median_s'] * (1 + threshold):
+            regressions.append((key, base['median_s'], result['median_s']))
+
+    return regressions
+
+def main():
+    args = get_args()
+
+    if args.worker:
+        enable_addon()
+        run_worker(args)
+        return 0
+
+    results = run_cases(args)
+
+    data = {'addon': name,
+            'blender': bpy.app.version_string,
+            'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'results': results}
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(data, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(data, f, indent=2)
+
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}, run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)['results']
+
+    regressions = compare(results, baseline, args.threshold, args.min_delta)
+
+    if regressions:
+        print(f"\n{len(regressions)} regressions above {args.threshold * 100:.0f}%:")
+
+        for key, before, after in regressions:
+            print(f" {key:<40} {before * 1000:10.2f} ms -> {'ERROR' if after is None else f'{after * 1000:.2f} ms'}")
+
+        return 1
+
+    print("\nNo regressions")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
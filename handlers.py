@@ -4,11 +4,14 @@ from bpy.app.handlers import persistent
 from time import time
 from . utils.application import delay_execution
 from . utils.asset import validate_assetbrowser_bookmarks
-from . utils.draw import draw_axes_HUD, draw_focus_HUD, draw_surface_slide_HUD, draw_screen_cast_HUD, draw_group_poses_VIEW3D
-from . utils.group import get_pose_batches, process_group_poses, select_group_children, set_group_pose, set_pose_uuid
+from . utils.developer import profile
+from . utils.draw import axes_hud, draw_axes_HUD, draw_focus_HUD, draw_surface_slide_HUD, draw_screen_cast_HUD, draw_group_poses_VIEW3D
+from . utils.group import group_index, pose_preview, process_group_poses, select_group_children, set_group_pose, set_pose_uuid
 from . utils.light import adjust_lights_for_rendering, get_area_light_poll
 from . utils.math import compare_quat
-from . utils.object import get_active_object, get_visible_objects
+from . utils.object import get_active_object, visible_index
+from . utils.raycast import geometry_cache, bounds_bvh, data_bounds_bvh
+from . utils.graph import invalidate_mesh_graphs
 from . utils.registration import get_prefs, reload_msgbus, get_addon
 from . utils.system import get_temp_dir
 from . utils.view import sync_light_visibility
@@ -18,6 +21,7 @@ global_debug = False
 axesHUD = None
 prev_axes_objects = []
 
+@profile()
 def manage_axes_HUD():
     global global_debug, axesHUD, prev_axes_objects
 
@@ -33,7 +37,7 @@ def manage_axes_HUD():
         if axesHUD and "RNA_HANDLE_REMOVED" in str(axesHUD):
             axesHUD = None
 
-        axes_objects = [obj for obj in get_visible_objects(bpy.context) if obj.M4.draw_axes]
+        axes_objects = visible_index.get_axes_objects(bpy.context)
 
         active = get_active_object(bpy.context)
 
@@ -74,6 +78,7 @@ def manage_axes_HUD():
 
 focusHUD = None
 
+@profile()
 def manage_focus_HUD():
     global global_debug, focusHUD
 
@@ -107,6 +112,7 @@ def manage_focus_HUD():
 
 surfaceslideHUD = None
 
+@profile()
 def manage_surface_slide_HUD():
     global global_debug, surfaceslideHUD
 
@@ -138,6 +144,7 @@ def manage_surface_slide_HUD():
 
 screencastHUD = None
 
+@profile()
 def manage_screen_cast_HUD():
     global global_debug, screencastHUD
 
@@ -165,6 +172,7 @@ def manage_screen_cast_HUD():
         bpy.types.SpaceView3D.draw_handler_remove(screencastHUD, 'WINDOW')
         screencastHUD = None
 
+@profile()
 def manage_group():
     global global_debug
 
@@ -193,9 +201,7 @@ def manage_group():
             if round(active.empty_display_size, 4) != 0.0001 and active.empty_display_size != active.M4.group_size:
                 active.M4.group_size = active.empty_display_size
 
-        if (visible := get_visible_objects(C)):
-
-            group_empties = [obj for obj in visible if obj.M4.is_group_empty]
+        if (group_empties := visible_index.get_group_empties(C)):
 
             if m3.group_hide:
                 if debug:
@@ -236,6 +242,7 @@ def manage_group():
 
                     group.empty_display_type = 'CUBE'
 
+@profile()
 def manage_legacy_group_poses():
     global global_debug
 
@@ -279,6 +286,7 @@ def manage_legacy_group_poses():
 groupposesVIEW3D = None
 olddrawn = None
 
+@profile()
 def manage_group_poses_VIEW3D():
     global global_debug, groupposesVIEW3D, olddrawn
 
@@ -298,25 +306,30 @@ def manage_group_poses_VIEW3D():
 
         if active and active.M4.draw_active_group_pose and pose:
 
-            if not groupposesVIEW3D or (active, active.M4.group_pose_IDX, active.M4.group_pose_alpha, pose.uuid, pose.index, pose.batch, pose.batchlinked, pose.mx, pose.forced_preview_update) != olddrawn:
+            # children's matrices only depend on the pose, if it's a linked batch pose, affecting other group empties too
+            is_batch_pose = pose.batch and pose.batchlinked
+            geometry = (active, pose.uuid if is_batch_pose else None, is_batch_pose)
+
+            if not groupposesVIEW3D or geometry != olddrawn or pose.forced_preview_update:
                 if pose.forced_preview_update:
                     pose.forced_preview_update = False
 
-                olddrawn = (active, active.M4.group_pose_IDX, active.M4.group_pose_alpha, pose.uuid, pose.index, pose.batch, pose.batchlinked, pose.mx.copy(), pose.forced_preview_update)
+                olddrawn = geometry
 
                 if debug:
-                    if not groupposesVIEW3D:
-                        print("   adding VIEW3D handler")
-                    else:
-                        print("   re-creating VIEW3D handler because active, pose preview alpha, pose uuid, pose index, mx, batch of batchlinked props")
+                    print("   building pose preview because of new active, batch pose or forced update")
 
-                if groupposesVIEW3D:
-                    bpy.types.SpaceView3D.draw_handler_remove(groupposesVIEW3D, 'WINDOW')
+                pose_preview.build(bpy.context, active, pose, preview_batch_poses=True)
 
-                batches = []
-                get_pose_batches(bpy.context, active, pose, batches, preview_batch_poses=True)
+                if not groupposesVIEW3D:
+                    if debug:
+                        print("   adding VIEW3D handler")
+
+                    groupposesVIEW3D = bpy.types.SpaceView3D.draw_handler_add(draw_group_poses_VIEW3D, (pose_preview, ), 'WINDOW', 'POST_VIEW')
 
-                groupposesVIEW3D = bpy.types.SpaceView3D.draw_handler_add(draw_group_poses_VIEW3D, (pose, batches, active.M4.group_pose_alpha, ), 'WINDOW', 'POST_VIEW')
+            else:
+                pose_preview.update(bpy.context, pose=pose)
+                pose_preview.set_style(active, pose)
 
         elif groupposesVIEW3D:
             if debug:
@@ -324,11 +337,15 @@ def manage_group_poses_VIEW3D():
 
             bpy.types.SpaceView3D.draw_handler_remove(groupposesVIEW3D, 'WINDOW')
             groupposesVIEW3D = None
+            olddrawn = None
+
+            pose_preview.clear()
 
 meshmachine = None
 decalmachine = None
 was_asset_drop_cleanup_executed = False
 
+@profile()
 def manage_asset_drop_cleanup():
     global global_debug, was_asset_drop_cleanup_executed
 
@@ -391,31 +408,32 @@ def manage_asset_drop_cleanup():
                     print()
                     print("    asset drop detected!")
 
-                visible = get_visible_objects(C)
+                stashes = visible_index.get_stashes(C) if meshmachine else []
+                backups = visible_index.get_decal_backups(C) if decalmachine else []
 
-                for obj in visible:
-                    if meshmachine and obj.MM.isstashobj:
+                for obj in stashes:
+                    if debug:
+                        print("     stash object:", obj.name)
+
+                    for col in obj.users_collection:
                         if debug:
-                            print("     stash object:", obj.name)
+                            print(f"      unlinking from {col.name}")
 
-                        for col in obj.users_collection:
-                            if debug:
-                                print(f"      unlinking from {col.name}")
+                        col.objects.unlink(obj)
 
-                            col.objects.unlink(obj)
+                for obj in backups:
+                    if debug:
+                        print("     decal backup object:", obj.name)
 
-                    if decalmachine and obj.DM.isbackup:
+                    for col in obj.users_collection:
                         if debug:
-                            print("     decal backup object:", obj.name)
-
-                        for col in obj.users_collection:
-                            if debug:
-                                print(f"      unlinking from {col.name}")
+                            print(f"      unlinking from {col.name}")
 
-                            col.objects.unlink(obj)
+                        col.objects.unlink(obj)
 
             was_asset_drop_cleanup_executed = True
 
+@profile()
 def manage_lights_decrease_and_visibility_sync():
     global global_debug
 
@@ -450,6 +468,7 @@ def manage_lights_decrease_and_visibility_sync():
 
             sync_light_visibility(scene)
 
+@profile()
 def manage_lights_increase():
     global global_debug
     
@@ -477,6 +496,7 @@ def manage_lights_increase():
 
                     adjust_lights_for_rendering(mode='INCREASE', debug=debug)
 
+@profile()
 def pre_undo_save():
     global global_debug
 
@@ -537,6 +557,7 @@ def pre_undo_save():
                     if debug:
                         print("     save time:", time() - start)
 
+@profile()
 def manage_assetbrowser_bookmarks():
     global global_debug
 
@@ -547,6 +568,7 @@ def manage_assetbrowser_bookmarks():
 
     validate_assetbrowser_bookmarks()
 
+@profile()
 def fix_empty_display_type():
     global global_debug
 
@@ -555,7 +577,7 @@ def fix_empty_display_type():
     if debug:
         print("  fix emtpy display types")
 
-        empty_display_type = [obj for obj in get_visible_objects(bpy.context) if not obj.display_type]
+        empty_display_type = [obj for obj in visible_index.get_visible(bpy.context) if not obj.display_type]
 
         for obj in empty_display_type:
             display_type = 'WIRE' if obj.hide_render or not obj.visible_camera else 'TEXTURED'
@@ -563,6 +585,7 @@ def fix_empty_display_type():
             print(f"INFO: Restored {obj.name}'s display type to {display_type}")
 
 @persistent
+@profile()
 def load_post(none):
     global global_debug
 
@@ -573,6 +596,8 @@ def load_post(none):
 
     reload_msgbus()
 
+    reset_depsgraph_changes()
+
     if global_debug:
         print(" managing legacy group poses")
 
@@ -591,6 +616,7 @@ def load_post(none):
 last_active_operator = None
 
 @persistent
+@profile()
 def undo_pre(scene):
     global global_debug
 
@@ -607,6 +633,29 @@ def undo_pre(scene):
         delay_execution(pre_undo_save)
 
 @persistent
+@profile()
+def undo_post(scene):
+    if global_debug:
+        print()
+        print("M4A1tools undo/redo post handler:")
+        print(" invalidating visible object index")
+
+    reset_depsgraph_changes()
+
+@persistent
+def frame_change_post(scene, depsgraph=None):
+    if global_debug:
+        print()
+        print("M4A1tools frame change post handler:")
+        print(" invalidating axes HUD and object bounds")
+
+    axes_hud.invalidate()
+
+    bounds_bvh.clear()
+    data_bounds_bvh.clear()
+
+@persistent
+@profile()
 def render_start(scene):
     global global_debug
 
@@ -623,6 +672,7 @@ def render_start(scene):
     #     delay_execution(manage_lights_decrease_and_visibility_sync)
 
 @persistent
+@profile()
 def render_end(scene):
     global global_debug
 
@@ -638,52 +688,153 @@ def render_end(scene):
     #
     #     delay_execution(manage_lights_increase)
 
-@persistent
-def depsgraph_update_post(scene):
-    global global_debug
+depsgraph_change_kinds = ['SELECTION', 'TRANSFORM', 'GEOMETRY', 'OBJECT', 'SCENE', 'OPERATOR']
 
-    if global_debug:
-        print()
-        print("M4A1tools depsgraph update post handler:")
+prev_selection = None
+prev_operator = None
+prev_local_view = None
 
-    p = get_prefs()
+def get_local_view_state(context):
+    wm = context.window_manager
 
-    if p.activate_shading_pie:
-        if global_debug:
-            print(" managing axes HUD")
+    if wm:
+        return tuple(space.as_pointer() for window in wm.windows for area in window.screen.areas if area.type == 'VIEW_3D' for space in area.spaces if space.type == 'VIEW_3D' and space.local_view)
 
-        delay_execution(manage_axes_HUD)
+@profile()
+def get_depsgraph_changes(depsgraph):
+    global prev_selection, prev_operator, prev_local_view
 
-    if p.activate_focus:
-        if global_debug:
-            print(" managing focus HUD")
+    if depsgraph is None:
+        visible_index.invalidate()
+        group_index.invalidate()
+        geometry_cache.clear()
+        invalidate_mesh_graphs()
+        bounds_bvh.clear()
+        data_bounds_bvh.clear()
+        return set(depsgraph_change_kinds)
 
-        delay_execution(manage_focus_HUD)
+    changes = set()
 
-    if p.activate_surface_slide:
-        if global_debug:
-            print(" managing surface slide HUD")
+    objects = set()
 
-        delay_execution(manage_surface_slide_HUD)
+    for update in depsgraph.updates:
+        id = update.id
 
-    if p.activate_save_pie and p.show_screencast:
-        if global_debug:
-            print(" managing screen cast HUD")
+        if isinstance(id, bpy.types.Object):
+            objects.add(id.original)
 
-        delay_execution(manage_screen_cast_HUD)
+            if update.is_updated_transform or update.is_updated_geometry:
+                bounds_bvh.invalidate(id.original)
+                data_bounds_bvh.invalidate(id.original)
+                pose_preview.invalidate(id.original, geometry=update.is_updated_geometry)
 
-    if p.activate_group:
-        if global_debug:
-            print(" managing group")
+            if update.is_updated_transform:
+                changes.add('TRANSFORM')
+                axes_hud.invalidate()
+
+            if update.is_updated_geometry:
+                changes.add('GEOMETRY')
+                geometry_cache.invalidate(obj=id.original)
+
+                if id.original.type == 'MESH':
+                    invalidate_mesh_graphs(id.original.data)
+
+            if not (update.is_updated_transform or update.is_updated_geometry):
+                changes.add('OBJECT')
+
+        elif isinstance(id, bpy.types.Scene):
+            changes.add('SCENE')
+
+        elif isinstance(id, bpy.types.Collection):
+            objects.update(id.original.all_objects)
+
+            changes.add('OBJECT')
+            group_index.invalidate()
+
+        elif update.is_updated_geometry:
+            changes.add('GEOMETRY')
+
+            if isinstance(id, bpy.types.Mesh):
+                geometry_cache.invalidate(mesh=id.original)
+                invalidate_mesh_graphs(id.original)
+
+    C = bpy.context
+    view_layer = getattr(C, 'view_layer', None)
+
+    if 'SCENE' in changes and view_layer:
+        active = view_layer.objects.active
+        selection = (active.as_pointer() if active else None, tuple(obj.as_pointer() for obj in view_layer.objects.selected))
+
+        if selection != prev_selection:
+            prev_selection = selection
+            changes.add('SELECTION')
+
+    operators = C.window_manager.operators if C.window_manager else []
+    operator = (len(operators), operators[-1].as_pointer() if operators else None)
+
+    if operator != prev_operator:
+        prev_operator = operator
+        changes.add('OPERATOR')
+
+    local_view = get_local_view_state(C)
 
-        delay_execution(manage_group)
+    if local_view != prev_local_view:
+        prev_local_view = local_view
+        visible_index.invalidate()
 
+    visible_index.sync(C, objects=objects)
+
+    group_index.sync(C, objects=objects)
+
+    return changes
+
+depsgraph_managers = [(manage_axes_HUD, lambda p: p.activate_shading_pie, {'SELECTION', 'OBJECT', 'SCENE'}, 0.05),
+                      (manage_focus_HUD, lambda p: p.activate_focus, {'SCENE'}, 0.05),
+                      (manage_surface_slide_HUD, lambda p: p.activate_surface_slide, {'SELECTION', 'GEOMETRY', 'OBJECT'}, 0.05),
+                      (manage_screen_cast_HUD, lambda p: p.activate_save_pie and p.show_screencast, {'SELECTION', 'OPERATOR'}, 0.05),
+                      (manage_group, lambda p: p.activate_group, {'SELECTION', 'OBJECT', 'SCENE'}, 0.1),
+                      (manage_group_poses_VIEW3D, None, {'SELECTION', 'TRANSFORM', 'GEOMETRY', 'OBJECT', 'SCENE'}, 0.03),
+                      (manage_asset_drop_cleanup, None, {'OPERATOR'}, 0)]
+
+def reset_depsgraph_changes():
+    global prev_selection, prev_operator, prev_local_view
+
+    prev_selection = None
+    prev_operator = None
+    prev_local_view = None
+
+    visible_index.invalidate()
+    group_index.invalidate()
+    geometry_cache.clear()
+    invalidate_mesh_graphs()
+    bounds_bvh.clear()
+    data_bounds_bvh.clear()
+    pose_preview.clear()
+    axes_hud.invalidate()
+
+@persistent
+@profile()
+def depsgraph_update_post(scene, depsgraph=None):
     if global_debug:
-        print(" managing group poses VIEW3D")
+        print()
+        print("M4A1tools depsgraph update post handler:")
 
-    delay_execution(manage_group_poses_VIEW3D)
+    changes = get_depsgraph_changes(depsgraph)
 
     if global_debug:
-        print(" managing asset drop cleanup")
+        print(" changes:", ', '.join(kind for kind in depsgraph_change_kinds if kind in changes))
+
+    if not changes:
+        return
+
+    p = get_prefs()
+
+    for manager, poll, kinds, delay in depsgraph_managers:
+        if poll and not poll(p):
+            continue
+
+        if kinds & changes:
+            if global_debug:
+                print(f" {manager.__name__.replace('_', ' ')}")
 
-    delay_execution(manage_asset_drop_cleanup)
+            delay_execution(manager, delay=delay, coalesce=True)
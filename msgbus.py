@@ -1,6 +1,7 @@
 import bpy
 from . utils import registration as r
 from . utils.group import update_group_name
+from . utils.object import visible_index
 
 def group_name_change():
     active = bpy.context.active_object
@@ -16,3 +17,6 @@ def group_color_change():
 
         for obj in objects:
             obj.color = active.color
+
+def visibility_change():
+    visible_index.invalidate()
@@ -138,6 +138,9 @@ class CleanUp(bpy.types.Operator):
             color = green
             text = [_("Nothing to remove.")]
 
+        if getattr(self, 'coords', None) is None:
+            return {'FINISHED'}
+
         time = get_prefs().HUD_fade_clean_up
 
         if is_any_non_manifold:
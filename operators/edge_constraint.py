@@ -4,9 +4,11 @@ from bpy.props import EnumProperty, BoolProperty, IntProperty
 from bpy_extras.view3d_utils import region_2d_to_origin_3d, region_2d_to_vector_3d, location_3d_to_region_2d
 from bl_ui.space_statusbar import STATUSBAR_HT_header as statusbar
 from mathutils import Vector, Matrix, Quaternion
-from mathutils.geometry import intersect_line_plane, intersect_point_line, intersect_line_line, distance_point_to_plane
+from mathutils.geometry import intersect_line_plane, intersect_point_line, distance_point_to_plane
 from math import radians, degrees
+import numpy as np
 from .. utils.selection import get_selected_vert_sequences
+from .. utils.bmesh import VertSnapshot
 from .. utils.math import average_locations, get_loc_matrix, get_face_center
 from .. utils.draw import draw_point, draw_vector, draw_line, draw_points, draw_lines, draw_label
 from .. utils.system import printd
@@ -48,6 +50,255 @@ def create_rotation_matrix_from_vector(vector, mx=None):
 
     return rot
 
+def get_normalized_array(vectors):
+    lengths = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return np.divide(vectors, lengths, out=np.zeros_like(vectors), where=lengths > 0)
+
+def intersect_line_plane_array(line_co, line_dir, plane_co, plane_no):
+    dot = np.einsum('ij,ij->i', plane_no, line_dir)
+    mask = np.abs(dot) > 1.1920929e-07
+
+    factor = -np.einsum('ij,ij->i', plane_no, line_co - plane_co) / np.where(mask, dot, 1)
+    return line_co + line_dir * factor[:, None], mask
+
+def intersect_line_line_array(co1, dir1, co2, dir2):
+    offset = co1 - co2
+
+    a = np.einsum('ij,ij->i', dir1, dir1)
+    b = np.einsum('ij,ij->i', dir1, dir2)
+    c = np.einsum('ij,ij->i', dir2, dir2)
+    d = np.einsum('ij,ij->i', dir1, offset)
+    e = np.einsum('ij,ij->i', dir2, offset)
+
+    denom = a * c - b * b
+    mask = denom > 1e-12 * a * c
+
+    factor = (a * e - b * d) / np.where(mask, denom, 1)
+    return co2 + dir2 * factor[:, None], mask
+
+class EdgeConstraintSolver:
+    debug = False
+
+    dir_keys = ['left_edge', 'right_edge', 'left_face_edge', 'right_face_edge', 'left_face', 'right_face']
+
+    def __init__(self, mx, data, debug=False):
+        if debug:
+            self.debug = debug
+
+        self.verts = []
+        self.vdata = []
+
+        seq_indices = []
+        prev_indices = []
+        next_indices = []
+        endverts = []
+        cyclics = []
+        flats = []
+        origins = []
+
+        for sidx, selection in enumerate(data.values()):
+            verts = selection['verts']
+            cyclic = selection['cyclic']
+
+            offset = len(self.verts)
+            positions = {v: offset + idx for idx, v in enumerate(verts)}
+
+            is_flat = self.check_if_flat(selection)
+
+            for v in verts:
+                vdata = selection[v]
+
+                self.verts.append(v)
+                self.vdata.append(vdata)
+
+                seq_indices.append(sidx)
+                prev_indices.append(positions[vdata['prev_vert']] if vdata['prev_vert'] else -1)
+                next_indices.append(positions[vdata['next_vert']] if vdata['next_vert'] else -1)
+                endverts.append(v == verts[0] or v == verts[-1])
+                cyclics.append(cyclic)
+                flats.append(is_flat)
+
+            origins.append(mx.inverted_safe() @ selection['origin'])
+
+        self.seq_indices = np.array(seq_indices, dtype=np.int32)
+        self.prev_indices = np.array(prev_indices, dtype=np.int32)
+        self.next_indices = np.array(next_indices, dtype=np.int32)
+
+        self.endverts = np.array(endverts, dtype=bool)
+        self.cyclic = np.array(cyclics, dtype=bool)
+        self.flat = np.array(flats, dtype=bool)
+
+        self.origins = np.array(origins, dtype=np.float64).reshape(-1, 3)
+
+        self.init_co = np.array([vdata['co'] for vdata in self.vdata], dtype=np.float64).reshape(-1, 3)
+        self.init_no = np.array([vdata['no'] for vdata in self.vdata], dtype=np.float64).reshape(-1, 3)
+        self.cross = np.array([vdata['cross'] for vdata in self.vdata], dtype=np.float64).reshape(-1, 3)
+
+        count = len(self.verts)
+
+        self.dirs = np.zeros((len(self.dir_keys), count, 3), dtype=np.float64)
+        self.has_dirs = np.zeros((len(self.dir_keys), count), dtype=bool)
+
+        for kidx, key in enumerate(self.dir_keys):
+            for idx, vdata in enumerate(self.vdata):
+                vdir = vdata[f'{key}_dir']
+
+                if vdir:
+                    self.dirs[kidx, idx] = vdir
+                    self.has_dirs[kidx, idx] = True
+
+        self.edges_differ = np.array([[bool(vdata[f'{side}_edge'] and vdata[f'{side}_face_edge'] and vdata[f'{side}_edge'] != vdata[f'{side}_face_edge']) for vdata in self.vdata] for side in ['left', 'right']], dtype=bool).reshape(2, count)
+
+        self.log(f"packed {count} verts in {len(origins)} sequences")
+
+    def log(self, *args, **kwargs):
+        if self.debug:
+            print(*args, **kwargs)
+
+    def check_if_flat(self, selection):
+        verts = selection['verts']
+
+        if len(verts) >= 3:
+            plane_co = selection[verts[1]]['co']
+            plane_no = selection[verts[1]]['no']
+
+            for v in verts:
+                if v != verts[1]:
+                    d = distance_point_to_plane(selection[v]['co'], plane_co, plane_no)
+
+                    if abs(round(d, 6)) > 0:
+                        return False
+        return True
+
+    def get_transformed_coords(self, matrices):
+        mxs = np.array([[row[:] for row in mx] for mx in matrices], dtype=np.float64).reshape(-1, 4, 4)
+
+        if len(mxs) == 1:
+            return self.init_co @ mxs[0, :3, :3].T + mxs[0, :3, 3]
+
+        mxs = mxs[self.seq_indices]
+        return np.einsum('nij,nj->ni', mxs[:, :3, :3], self.init_co) + mxs[:, :3, 3]
+
+    def get_rotated_dirs(self, co):
+        has_prev = self.prev_indices != -1
+        has_next = self.next_indices != -1
+
+        next_dirs = get_normalized_array(co[self.next_indices] - co) * has_next[:, None]
+        prev_dirs = get_normalized_array(co - co[self.prev_indices]) * has_prev[:, None]
+
+        return get_normalized_array(next_dirs + prev_dirs)
+
+    def get_edge_dirs(self, co, end_align=True, face_align=False):
+        count = len(self.verts)
+        indices = np.arange(count)
+
+        moved_dirs = get_normalized_array(co - self.init_co)
+        side = np.where(np.einsum('ij,ij->i', moved_dirs, self.cross) > 0, 0, 1)
+
+        edge_key = side
+        face_edge_key = 2 + side
+        face_key = 4 + side
+
+        has_edge = self.has_dirs[edge_key, indices]
+        has_face_edge = self.has_dirs[face_edge_key, indices]
+        has_face = self.has_dirs[face_key, indices]
+
+        is_end_aligned = end_align & ~self.cyclic & self.endverts & has_face_edge
+
+        keys = np.where(has_edge, edge_key, np.where(has_face_edge, face_edge_key, np.where(has_face, face_key, -1)))
+        keys = np.where(is_end_aligned, face_edge_key, keys)
+
+        if face_align:
+            check = ~is_end_aligned & (keys != -1) & self.has_dirs[4]
+
+            if check.any():
+                dots = np.abs(np.stack([np.einsum('ij,ij->i', moved_dirs, self.dirs[keys, indices]),
+                                        np.einsum('ij,ij->i', moved_dirs, self.dirs[4]),
+                                        np.einsum('ij,ij->i', moved_dirs, self.dirs[5])]))
+
+                best = np.argmax(dots, axis=0)
+                keys = np.where(check & (best == 1), 4, np.where(check & (best == 2), 5, keys))
+
+        valid = keys != -1
+        edge_dirs = self.dirs[np.where(valid, keys, 0), indices]
+
+        slide_coords = []
+        draw_end_align = False
+
+        for idx in np.flatnonzero(valid & ~self.cyclic & self.endverts & self.edges_differ[side, indices]):
+            coords = self.vdata[idx][f'{self.dir_keys[keys[idx]]}_coords']
+
+            if coords:
+                slide_coords.extend(coords)
+                draw_end_align = True
+
+        return edge_dirs, valid, slide_coords, draw_end_align
+
+    def solve(self, matrices, constrain_mode=None, scale_dir=None, rotation=None, origin=None, origin_dir=None, mouse_dir=None, individual_origins=False, end_align=True, face_align=False):
+        co = self.get_transformed_coords(matrices)
+        init_co = self.init_co
+
+        edge_dirs, valid, slide_coords, draw_end_align = self.get_edge_dirs(co, end_align=end_align, face_align=face_align)
+
+        candidates = []
+
+        def broadcast(vector):
+            return np.broadcast_to(np.array(vector, dtype=np.float64), co.shape)
+
+        if constrain_mode is None:
+            candidates.append(intersect_line_plane_array(init_co, edge_dirs, co, broadcast(scale_dir)))
+
+        else:
+            rotated_dirs = self.get_rotated_dirs(co)
+            origins = self.origins[self.seq_indices] if individual_origins else broadcast(origin)
+
+            def get_direct():
+                return intersect_line_line_array(origins, co - origins, init_co, edge_dirs)
+
+            def get_proximity():
+                factor = np.einsum('ij,ij->i', co - init_co, edge_dirs) / np.maximum(np.einsum('ij,ij->i', edge_dirs, edge_dirs), 1e-30)
+                return init_co + edge_dirs * factor[:, None], np.ones(len(co), dtype=bool)
+
+            def get_projected_plane():
+                projected, projected_mask = intersect_line_plane_array(co, broadcast(origin_dir), origins, broadcast(origin_dir))
+                i, mask = intersect_line_plane_array(init_co, edge_dirs, co, np.cross(rotated_dirs, projected - co))
+                return i, mask & projected_mask
+
+            if constrain_mode == 'DIRECT':
+                candidates.append(get_direct())
+
+            elif constrain_mode == 'PROXIMITY':
+                candidates.append(get_proximity())
+
+            elif constrain_mode == 'INTERSECTION':
+                candidates.append(intersect_line_line_array(co, rotated_dirs, init_co, edge_dirs))
+
+            elif constrain_mode == 'PLANE_INTERSECTION':
+                rotated_normals = self.init_no @ np.array(rotation, dtype=np.float64).T
+                candidates.append(intersect_line_plane_array(init_co, edge_dirs, co, np.cross(rotated_dirs, rotated_normals)))
+
+            elif constrain_mode == 'PROJECTED_PLANE_INTERSECTION':
+                candidates.extend([get_projected_plane(), get_direct(), get_proximity()])
+
+            elif constrain_mode == 'DIRECT_PLANE_INTERSECTION':
+                projected_plane = get_projected_plane()
+
+                direct_plane, direct_plane_mask = intersect_line_plane_array(init_co, edge_dirs, co, np.cross(rotated_dirs, get_normalized_array(co - origins)))
+
+                flat = self.flat[:, None]
+                direct_plane = np.where(flat, projected_plane[0], direct_plane)
+                direct_plane_mask = np.where(self.flat, projected_plane[1], direct_plane_mask)
+
+                candidates.extend([(direct_plane, direct_plane_mask), projected_plane, get_direct(), get_proximity()])
+
+            elif constrain_mode == 'MOUSEDIR_PLANE_INTERSECTION':
+                candidates.append(intersect_line_plane_array(init_co, edge_dirs, co, broadcast(mouse_dir)))
+
+        for coords, mask in reversed(candidates):
+            co = np.where((mask & valid)[:, None], coords, co)
+
+        return co, slide_coords, draw_end_align
+
 def draw_edge_constrained_transform_status(op):
     def draw(self, context):
         layout = self.layout
@@ -337,6 +588,8 @@ class TransformEdgeConstrained(bpy.types.Operator):
         sequences = get_selected_vert_sequences(verts, ensure_seq_len=True, debug=False)
 
         self.data = self.get_data(self.bm, sequences)
+        self.snapshot = VertSnapshot(self.bm, verts=[v for selection in self.data.values() for v in selection['verts']])
+        self.solver = EdgeConstraintSolver(self.mx, self.data)
 
         self.transform_axis = 'VIEW'
 
@@ -767,13 +1020,13 @@ class TransformEdgeConstrained(bpy.types.Operator):
 
         self.intersection = i
 
-    def reset_mesh(self):
-        for selection in self.data.values():
-            for v in selection['verts']:
-                v.co = selection[v]['co']
+    def reset_mesh(self, update=True):
+        self.snapshot.restore()
 
         self.bm.normal_update()
-        bmesh.update_edit_mesh(self.active.data)
+
+        if update:
+            bmesh.update_edit_mesh(self.active.data)
 
     def transform(self, context):
         def get_rotation():
@@ -849,371 +1102,48 @@ class TransformEdgeConstrained(bpy.types.Operator):
             self.amount = amount
             return vec, space, current_scale
 
-        self.reset_mesh()
-
-        verts = [v for seq in self.data.values() for v in seq['verts']]
-
         if self.transform_mode == 'SCALE' or self.is_zero_scaling:
             vec, space, self.scale = get_scale()
 
             if self.individual_origins:
-                for seq in self.data.values():
-                    origin = seq['origin']
-                    verts = seq['verts']
-
-                    _, space, _ = get_scale(per_sequence_origin=origin)
-                    bmesh.ops.scale(self.bm, vec=vec, space=space, verts=verts)
-            else:
-                bmesh.ops.scale(self.bm, vec=vec, space=space, verts=verts)
-
-        elif self.transform_mode == 'ROTATE':
-            self.rotation = get_rotation()
-
-            if self.individual_origins:
-                for seq in self.data.values():
-                    origin = seq['origin']
-                    verts = seq['verts']
-
-                    bmesh.ops.rotate(self.bm, cent=origin, matrix=self.rotation.to_matrix(), verts=verts, space=self.mx)
-            else:
-                bmesh.ops.rotate(self.bm, cent=self.origin, matrix=self.rotation.to_matrix(), verts=verts, space=self.mx)
-
-        self.tdata = self.get_transformed_data()
-
-        self.constrain_verts_to_edges()
-
-        self.bm.normal_update()
-        bmesh.update_edit_mesh(self.active.data)
-
-    def constrain_verts_to_edges(self):
-        for sidx, selection in self.tdata.items():
-            for v in selection['verts']:
-                tvdata = self.tdata[sidx][v]
-
-                if not tvdata['edge_dir']:
-                    continue
-
-                if self.transform_mode == 'SCALE' or self.is_zero_scaling:
-                    if tvdata['scale_plane_intersection_co']:
-                        v.co = tvdata['scale_plane_intersection_co']
-
-                else:
-
-                    if self.constrain_mode == 'DIRECT':
-                        if tvdata['direct_co']:
-                            v.co = tvdata['direct_co']
-
-                    elif self.constrain_mode == 'PROXIMITY':
-                        if tvdata['proximity_co']:
-                            v.co = tvdata['proximity_co']
-
-                    elif self.constrain_mode == 'INTERSECTION':
-                        if tvdata['intersection_co']:
-                            v.co = tvdata['intersection_co']
-
-                    elif self.constrain_mode == 'PLANE_INTERSECTION':
-                        if tvdata['plane_intersection_co']:
-                            v.co = tvdata['plane_intersection_co']
-
-                    elif self.constrain_mode == 'PROJECTED_PLANE_INTERSECTION':
-                        if tvdata['projected_plane_intersection_co']:
-                            v.co = tvdata['projected_plane_intersection_co']
-
-                        elif tvdata['direct_co']:
-                            v.co = tvdata['direct_co']
-
-                        elif tvdata['proximity_co']:
-                            v.co = tvdata['proximity_co']
-
-                    elif self.constrain_mode == 'DIRECT_PLANE_INTERSECTION':
-                        if tvdata['direct_plane_intersection_co']:
-                            v.co = tvdata['direct_plane_intersection_co']
-
-                        elif tvdata['projected_plane_intersection_co']:
-                            v.co = tvdata['projected_plane_intersection_co']
-
-                        elif tvdata['direct_co']:
-                            v.co = tvdata['direct_co']
-
-                        elif tvdata['proximity_co']:
-                            v.co = tvdata['proximity_co']
-
-                    elif self.constrain_mode == 'MOUSEDIR_PLANE_INTERSECTION':
-                        if tvdata['mousedir_plane_intersection_co']:
-                            v.co = tvdata['mousedir_plane_intersection_co']
-
-    def get_transformed_data(self):
-        def check_if_flat():
-            if len(verts) >= 3:
-                plane_co = tdata[sidx][verts[1]]['init_co']
-
-                plane_no = tdata[sidx][verts[1]]['init_no']
-
-                off_plane_verts = [v for v in verts if v != verts[1]]
-
-                for v in off_plane_verts:
-                    d = distance_point_to_plane(tdata[sidx][v]['init_co'], plane_co, plane_no)
-
-                    if abs(round(d, 6)) > 0:
-                        return False
-            return True
-
-        def get_rotated_dir():
-            if tvdata['prev_vert'] and tvdata['next_vert']:
-                rvdir = ((tvdata['next_vert'].co - v.co).normalized() + (v.co - tvdata['prev_vert'].co).normalized()).normalized()
-            elif tvdata['next_vert']:
-                rvdir = (tvdata['next_vert'].co - v.co).normalized()
-            else:
-                rvdir = (v.co - tvdata['prev_vert'].co).normalized()
-
-            tvdata['dir'] = rvdir
-
-            return rvdir
-
-        def get_rotated_normal_and_cross():
-            rmx = self.mx.inverted_safe().to_quaternion() @ self.rotation @ self.mx.to_quaternion()
-            tvdata['no'] = rmx @ init_no
-            tvdata['cross'] = rvdir.cross(tvdata['no'])
-
-        def get_edge_dir():
-            def check_face_dir_alignment(edge_dir, slide_coords):
-                if self.face_align:
-
-                    if vdata['left_face_dir']:
-
-                        dirs = [('edge_dir', moved_dir.dot(edge_dir)), ('left_face_dir', moved_dir.dot(vdata['left_face_dir'])), ('right_face_dir', moved_dir.dot(vdata['right_face_dir']))]
-                        max_dir = max(dirs, key=lambda x: abs(x[1]))
-
-                        if max_dir[0] != 'edge_dir':
-
-                            edge_dir = vdata[max_dir[0]]
-                            slide_coords = vdata[max_dir[0].replace('dir', 'coords')]
-
-                return edge_dir, slide_coords
-
-            edge_dir = None
-            slide_coords = []
-
-            moved_dir = (v.co - vdata['co']).normalized()
-            dot = moved_dir.dot(cross)
-            side = 'left' if dot > 0 else 'right'
-
-            endvert = v == verts[0] or v == verts[-1]
-
-            if self.end_align and not cyclic and endvert and vdata[f'{side}_face_edge_dir']:
-                edge_dir = vdata[f'{side}_face_edge_dir']
-                slide_coords = vdata[f'{side}_face_edge_coords']
-
-            elif vdata[f'{side}_edge_dir']:
-                edge_dir = vdata[f'{side}_edge_dir']
-                slide_coords = vdata[f'{side}_edge_coords']
-
-                edge_dir, slide_coords = check_face_dir_alignment(edge_dir, slide_coords)
-
-            elif vdata[f'{side}_face_edge_dir']:
-                edge_dir = vdata[f'{side}_face_edge_dir']
-                slide_coords = vdata[f'{side}_face_edge_coords']
-
-                edge_dir, slide_coords = check_face_dir_alignment(edge_dir, slide_coords)
-
-            elif vdata[f'{side}_face_dir']:
-                edge_dir = vdata[f'{side}_face_dir']
-                slide_coords = vdata[f'{side}_face_coords']
-
-                edge_dir, slide_coords = check_face_dir_alignment(edge_dir, slide_coords)
-
-            tvdata['edge_dir'] = edge_dir
-
-            edges_differ = False
-            if vdata[f'{side}_edge'] and vdata[f'{side}_face_edge'] and vdata[f'{side}_edge'] != vdata[f'{side}_face_edge']:
-                edges_differ = True
-
-            if not cyclic and slide_coords and endvert and edges_differ:
-                self.slide_coords.extend(slide_coords)
-                self.draw_end_align = True
-
-            return edge_dir
-
-        def get_projected_co(debug=False):
-            if self.individual_origins:
-                i = intersect_line_plane(co, co + origin_dir_local, individual_origin_local, origin_dir_local)
-
-            else:
-                i = intersect_line_plane(co, co + origin_dir_local, origin_local, origin_dir_local)
-
-            if i:
-                tvdata['projected_co'] = i
-                tvdata['projected_dir'] = i - co
-
-            elif debug:
-                print("failed projected dir", v.index)
-
-        def get_direct_co():
-            if self.individual_origins:
-                i = intersect_line_line(individual_origin_local, co, init_co, init_co + edge_dir)
-
+                spaces = [get_scale(per_sequence_origin=seq['origin'])[1] for seq in self.data.values()]
             else:
-                i = intersect_line_line(origin_local, co, init_co, init_co + edge_dir)
+                spaces = [space]
 
-            if i:
-                tvdata['direct_co'] = i[1]
+            scale = Matrix.Diagonal(vec).to_4x4()
+            matrices = [space.inverted_safe() @ scale @ space for space in spaces]
 
-        def get_proximity_co():
-            i, _ = intersect_point_line(co, init_co, init_co + edge_dir)
-            tvdata['proximity_co'] = i
+            current_scale_local = self.mx.inverted_safe().to_quaternion() @ self.scale
 
-        def get_intersection_co():
-            i = intersect_line_line(co, co + rvdir, init_co, init_co + edge_dir)[1]
+            coords, self.slide_coords, draw_end_align = self.solver.solve(matrices, scale_dir=current_scale_local, end_align=self.end_align, face_align=self.face_align)
 
-            if i:
-                tvdata['intersection_co'] = i
-
-        def get_plane_intersection_co():
-            i = intersect_line_plane(init_co, init_co + edge_dir, co, tvdata['cross'])
-
-            if i:
-                tvdata['plane_intersection_co'] = i
-
-        def get_projected_plane_intersection_co(debug=False):
-            projected_cross = rvdir.cross(tvdata['projected_dir'])
-
-            i = intersect_line_plane(init_co, init_co + edge_dir, co, projected_cross)
-
-            if i:
-                tvdata['projected_plane_intersection_co'] = i
-
-            elif debug:
-                print("failed projected cross", v.index)
-
-        def get_direct_plane_intersection_co(debug=False):
-            if is_flat:
-                tvdata['direct_plane_intersection_co'] = tvdata['projected_plane_intersection_co']
-                return
+        else:
+            self.rotation = get_rotation()
 
             if self.individual_origins:
-                direct_dir = (co - individual_origin_local).normalized()
+                origins = [seq['origin'] for seq in self.data.values()]
             else:
-                direct_dir = (co - origin_local).normalized()
-
-            direct_cross = rvdir.cross(direct_dir)
-
-            i = intersect_line_plane(init_co, init_co + edge_dir, co, direct_cross)
+                origins = [self.origin]
 
-            if i:
-                tvdata['direct_plane_intersection_co'] = i
+            rotation = self.rotation.to_matrix().to_4x4()
+            matrices = [self.mx.inverted_safe() @ get_loc_matrix(origin) @ rotation @ get_loc_matrix(-origin) @ self.mx for origin in origins]
 
-            elif debug:
-                print("failed direct cross", v.index)
+            rotation_local = (self.mx.inverted_safe().to_quaternion() @ self.rotation @ self.mx.to_quaternion()).to_matrix()
 
-        def get_mousedir_plane_intersection_co(debug=False):
-            i = intersect_line_plane(init_co, init_co + edge_dir, co, init_mousedir_local)
+            origin_local = self.mx.inverted_safe() @ self.origin
+            origin_dir_local = self.mx.inverted_safe().to_quaternion() @ self.origin_dir
+            init_mousedir_local = self.mx.to_quaternion() @ (self.origin - self.init_intersection)
 
-            if i:
-                tvdata['mousedir_plane_intersection_co'] = i
+            coords, self.slide_coords, draw_end_align = self.solver.solve(matrices, constrain_mode=self.constrain_mode, rotation=rotation_local, origin=origin_local, origin_dir=origin_dir_local, mouse_dir=init_mousedir_local, individual_origins=self.individual_origins, end_align=self.end_align, face_align=self.face_align)
 
-            elif debug:
-                print("failed scale plane intersection", v.index)
+        if draw_end_align:
+            self.draw_end_align = True
 
-        def get_scale_plane_intersection_co(debug=False):
-            i = intersect_line_plane(init_co, init_co + edge_dir, co, current_scale_local)
+        for v, co in zip(self.solver.verts, coords.tolist()):
+            v.co = co
 
-            if i:
-                tvdata['scale_plane_intersection_co'] = i
-
-            elif debug:
-                print("failed scale plane intersection", v.index)
-
-        tdata = {}
-        self.slide_coords = []
-
-        origin_local = self.mx.inverted_safe() @ self.origin
-        origin_dir_local = self.mx.inverted_safe().to_quaternion() @ self.origin_dir
-
-        current_scale_local = self.mx.inverted_safe().to_quaternion() @ self.scale
-
-        init_mousedir_local = self.mx.to_quaternion() @ (self.origin - self.init_intersection)
-
-        for sidx, selection in self.data.items():
-            verts = selection['verts']
-            cyclic = selection['cyclic']
-            individual_origin_local = self.mx.inverted_safe() @ selection['origin']
-
-            tdata[sidx] = {'verts': verts, 'cyclic': cyclic}
-
-            for v in verts:
-                vdata = selection[v]
-
-                co = v.co.copy()
-                init_co = vdata['co']
-                init_no = vdata['no']
-
-                tdata[sidx][v] = {'co': co,
-                                  'init_co': init_co,
-                                  'dir': None,
-
-                                  'no': None,
-                                  'init_no': init_no,
-                                  'cross': None,
-
-                                  'prev_vert': vdata['prev_vert'],
-                                  'next_vert': vdata['next_vert'],
-
-                                  'edge_dir': None,
-
-                                  'projected_co': None,
-                                  'projected_dir': None,
-
-                                  'direct_co': None,
-                                  'proximity_co': None,
-                                  'intersection_co': None,
-                                  'plane_intersection_co': None,
-                                  'projected_plane_intersection_co': None,
-                                  'direct_plane_intersection_co': None,
-
-                                  'scale_plane_intersection_co': None,
-                                  'mousedir_plane_intersection_co': None,
-                                  }
-
-            is_flat = check_if_flat()
-
-            for v in verts:
-                vdata = self.data[sidx][v]
-                tvdata = tdata[sidx][v]
-
-                co = tvdata['co']
-                init_co = tvdata['init_co']
-                init_no = vdata['no']
-                cross = vdata['cross']
-
-                rvdir = get_rotated_dir()
-
-                get_rotated_normal_and_cross()
-
-                edge_dir = get_edge_dir()
-
-                if self.transform_mode == 'SCALE' or self.is_zero_scaling:
-
-                    get_scale_plane_intersection_co(debug=False)
-
-                else:
-
-                    get_projected_co(debug=False)
-
-                    get_direct_co()
-
-                    get_proximity_co()
-
-                    get_intersection_co()
-
-                    get_plane_intersection_co()
-
-                    get_projected_plane_intersection_co(debug=False)
-
-                    get_direct_plane_intersection_co(debug=False)
-
-                    get_mousedir_plane_intersection_co(debug=False)
-
-        return tdata
+        self.bm.normal_update()
+        bmesh.update_edit_mesh(self.active.data)
 
     def init_debug_coords(self):
         self.original_coords = []
@@ -1234,52 +1164,3 @@ class TransformEdgeConstrained(bpy.types.Operator):
         self.plane_intersection_coords = []
         self.projected_plane_intersection_coords = []
 
-    def debug_transformed_data(self, context, factor=0.1):
-        print()
-        printd(self.tdata, 'transformed dict')
-
-        self.init_debug_coords()
-
-        for sidx, selection in self.tdata.items():
-            for v in selection['verts']:
-                tvdata = self.tdata[sidx][v]
-
-                co = tvdata['co']
-                init_co = tvdata['init_co']
-
-                no = tvdata['no']
-                init_no = tvdata['init_no']
-
-                cross = tvdata['cross']
-
-                projected = tvdata['projected_co']
-                projected_dir = tvdata['projected_dir']
-
-                self.original_coords.append(init_co)
-                self.rotated_coords.append(co)
-
-                self.original_normal_coords.extend((co, co + init_no * factor))
-                self.rotated_normal_coords.extend((co, co + no * factor))
-                self.rotated_cross_coords.extend((co, co + cross * factor))
-
-                if tvdata['edge_dir']:
-                    self.rotated_edge_dir_coords.extend((init_co, init_co + tvdata['edge_dir']))
-
-                self.rotated_dir_coords.extend((co, co + tvdata['dir'] * factor))
-
-                if self.transform_mode == 'ROTATE' and not self.is_zero_scaling:
-                    self.projected_coords.append(projected)
-                    self.projected_dir_coords.extend((co, co + projected_dir))
-
-                    self.direct_coords.append(tvdata['direct_co'])
-
-                    self.proximity_coords.append(tvdata['proximity_co'])
-
-                    if tvdata['intersection_co']:
-                        self.intersection_coords.append(tvdata['intersection_co'])
-
-                    if tvdata['plane_intersection_co']:
-                        self.plane_intersection_coords.append(tvdata['plane_intersection_co'])
-
-                    if tvdata['projected_plane_intersection_co']:
-                        self.projected_plane_intersection_coords.append(tvdata['projected_plane_intersection_co'])
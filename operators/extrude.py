@@ -252,11 +252,17 @@ class PunchIt(bpy.types.Operator):
 
             if self.amount and event.type in {'LEFTMOUSE', 'SPACE'}:
 
+                self.init_mesh = self.active.data.copy()
+
                 self.create_extruded_geo(self.active, self.bm)
 
                 bpy.ops.mesh.intersect_boolean(use_self=self.use_self)
                 self.active.update_from_editmode()
 
+                self.cache_result()
+
+                self.TIMER = context.window_manager.event_timer_add(0.05, window=context.window)
+
                 self.finalizing = True
                 return {'RUNNING_MODAL'}
 
@@ -267,11 +273,6 @@ class PunchIt(bpy.types.Operator):
 
         else:
             if event.type in ['Q', 'W', 'E', 'R', 'S'] and event.value == 'PRESS':
-                self.reset_mesh(self.init_bm)
-
-                bm = bmesh.from_edit_mesh(self.active.data)
-                bm.normal_update()
-
                 factor = 100 if event.ctrl else 1
 
                 if event.type == 'W':
@@ -291,12 +292,12 @@ class PunchIt(bpy.types.Operator):
                 elif event.type == 'S':
                     self.use_self = not self.use_self
 
-                self.set_push_and_pull_amount(context)
-
-                self.create_extruded_geo(self.active, bm)
+                self.is_outdated = True
+                return {'RUNNING_MODAL'}
 
-                bpy.ops.mesh.intersect_boolean(use_self=self.use_self)
-                self.active.update_from_editmode()
+            elif event.type == 'TIMER':
+                if self.is_outdated:
+                    self.update_boolean(context)
 
                 return {'RUNNING_MODAL'}
 
@@ -304,12 +305,15 @@ class PunchIt(bpy.types.Operator):
                 return {'PASS_THROUGH'}
 
             elif event.type in {'LEFTMOUSE', 'SPACE'} and event.value == 'PRESS':
+                if self.is_outdated:
+                    self.update_boolean(context)
+
                 self.finish(context)
 
                 return {'FINISHED'}
 
             elif event.type in {'RIGHTMOUSE', 'ESC'} and event.value == 'PRESS':
-                self.reset_mesh(self.init_bm)
+                self.reset_mesh()
                 self.finish(context)
 
                 return {'CANCELLED'}
@@ -324,6 +328,17 @@ class PunchIt(bpy.types.Operator):
 
         self.S.finish()
 
+        if self.TIMER:
+            context.window_manager.event_timer_remove(self.TIMER)
+
+        if self.init_mesh:
+            bpy.data.meshes.remove(self.init_mesh)
+
+        for mesh in self.results.values():
+            bpy.data.meshes.remove(mesh)
+
+        self.results.clear()
+
     def invoke(self, context, event):
         debug = False
         debug = True
@@ -333,9 +348,10 @@ class PunchIt(bpy.types.Operator):
 
         self.mx = self.active.matrix_world
 
-        self.init_bm = bmesh.new()
-        self.init_bm.from_mesh(self.active.data)
-        self.init_bm.normal_update()
+        self.init_mesh = None
+        self.results = {}
+        self.TIMER = None
+        self.is_outdated = False
 
         self.bm = bmesh.from_edit_mesh(self.active.data)
         self.bm.normal_update()
@@ -530,10 +546,46 @@ class PunchIt(bpy.types.Operator):
 
             vdata['co'] = co
 
-    def reset_mesh(self, init_bm):
-        bpy.ops.object.mode_set(mode='OBJECT')
-        init_bm.to_mesh(self.active.data)
-        bpy.ops.object.mode_set(mode='EDIT')
+    def reset_mesh(self, mesh=None):
+        bm = bmesh.from_edit_mesh(self.active.data)
+
+        bm.clear()
+        bm.from_mesh(mesh if mesh else self.init_mesh)
+        bm.normal_update()
+
+        bmesh.update_edit_mesh(self.active.data)
+        return bm
+
+    def get_result_key(self):
+        return self.pushed, self.pulled, self.use_self
+
+    def cache_result(self):
+        if len(self.results) >= 8:
+            bpy.data.meshes.remove(self.results.pop(next(iter(self.results))))
+
+        mesh = bpy.data.meshes.new(f"{self.active.data.name}_punchit")
+        bmesh.from_edit_mesh(self.active.data).to_mesh(mesh)
+
+        self.results[self.get_result_key()] = mesh
+
+    def update_boolean(self, context):
+        self.is_outdated = False
+
+        self.set_push_and_pull_amount(context)
+
+        if (mesh := self.results.get(self.get_result_key())):
+            self.reset_mesh(mesh=mesh)
+
+        else:
+            bm = self.reset_mesh()
+
+            self.create_extruded_geo(self.active, bm)
+
+            bpy.ops.mesh.intersect_boolean(use_self=self.use_self)
+
+            self.cache_result()
+
+        self.active.update_from_editmode()
 
     def get_selection(self, bm, debug=False):
         is_manifold = all([e.is_manifold for e in bm.edges])
@@ -568,7 +620,7 @@ class PunchIt(bpy.types.Operator):
                                     e.select_set(False)
 
                 if not cyclic:
-                    path = get_shortest_path(bm, seq[0], seq[-1], topo=True, ignore_selected=True, select=True)
+                    path = get_shortest_path(bm, seq[0], seq[-1], topo=True, ignore_selected=True, select=True, obj=self.active)
 
                     for idx, v in enumerate(path):
                         if idx != len(path) - 1:
@@ -6,7 +6,7 @@ from mathutils import Vector, Matrix, Quaternion
 from mathutils.geometry import intersect_line_plane
 from .. utils.collection import get_collection_depth
 from .. utils.draw import draw_cross_3d, draw_fading_label, draw_init, draw_point, draw_vector, draw_label, get_text_dimensions, update_HUD_location, draw_circle, draw_mesh_wire
-from .. utils.group import get_group_base_name, group, process_group_poses, retrieve_group_pose, set_group_pose, ungroup, get_group_matrix, select_group_children, get_child_depth, clean_up_groups, fade_group_sizes, prettify_group_pose_names, get_pose_batches, get_batch_pose_name, get_group_hierarchy, get_remove_poses
+from .. utils.group import get_group_base_name, group, process_group_poses, retrieve_group_pose, set_group_pose, ungroup, get_group_matrix, select_group_children, get_child_depth, clean_up_groups, fade_group_sizes, prettify_group_pose_names, get_pose_batches, get_group_hierarchy, get_remove_poses, BatchPoseEngine
 from .. utils.math import dynamic_format, compare_quat
 from .. utils.modifier import get_mods_as_dict, add_mods_from_dict
 from .. utils.object import parent, unparent, compensate_children
@@ -1617,14 +1617,7 @@ class SetGroupPose(bpy.types.Operator):
             group_empties = get_group_hierarchy(active, up=False)
 
             if group_empties:
-
-                name = get_batch_pose_name(group_empties)
-
-                uuid = set_group_pose(active, name=name, batch=True)
-
-                for obj in group_empties:
-                    if obj != active:
-                        set_group_pose(obj, name=name, uuid=uuid, batch=True)
+                BatchPoseEngine(group_empties).set_batch_pose(active)
 
             else:
                 return {'CANCELLED'}
@@ -1686,29 +1679,19 @@ class UpdateGroupPose(bpy.types.Operator):
         uuid = pose.uuid
 
         if pose.batch and pose.batchlinked:
-            group_empties = get_group_hierarchy(active, up=self.update_up)
+            engine = BatchPoseEngine(get_group_hierarchy(active, up=self.update_up))
 
-            for empty in group_empties:
+            for empty, batch_pose in engine.get_targets(uuid, unlinked=self.update_unlinked):
                 if empty != active:
+                    batch_pose.mx = empty.matrix_local
 
-                    batch_poses = [p for p in empty.M4.group_pose_COL if p.batch and p.uuid == uuid]
-
-                    if batch_poses:
-                        batch_pose = batch_poses[0]
-
-                        if self.update_unlinked or batch_pose.batchlinked:
-                            batch_pose.mx = empty.matrix_local
-
-                            if batch_pose.axis:
-                                batch_pose.axis = ''
+                    if batch_pose.axis:
+                        batch_pose.axis = ''
 
-                            if batch_pose.uuid == '00000000-0000-0000-0000-000000000000':
-                                for p in empty.M4.group_pose_COL:
-                                    if p.axis:
-                                        p.axis = ''
-
-                            elif batch_pose.axis:
-                                batch_pose.axis = ''
+                    if batch_pose.uuid == '00000000-0000-0000-0000-000000000000':
+                        for p in empty.M4.group_pose_COL:
+                            if p.axis:
+                                p.axis = ''
         
         process_group_poses(active, debug=False)
 
@@ -1762,17 +1745,8 @@ class RetrieveGroupPose(bpy.types.Operator):
         pose = poseCOL[self.index]
 
         if pose.batch and pose.batchlinked:
-
-            uuid = pose.uuid
-
-            group_empties = get_group_hierarchy(active, up=self.retrieve_up)
-
-            for empty in group_empties:
-
-                for p in empty.M4.group_pose_COL:
-                    if p.uuid == uuid and p.batch and (self.retrieve_unlinked or p.batchlinked):
-                        retrieve_group_pose(empty, index=p.index)
-                        break
+            engine = BatchPoseEngine(get_group_hierarchy(active, up=self.retrieve_up))
+            engine.apply(engine.get_targets(pose.uuid, unlinked=self.retrieve_unlinked))
 
         else:
             retrieve_group_pose(active, index=self.index)
@@ -1782,6 +1756,60 @@ class RetrieveGroupPose(bpy.types.Operator):
 
         return {'FINISHED'}
 
+class PlayGroupPoses(bpy.types.Operator):
+    bl_idname = "m4a1.play_group_poses"
+    bl_label = "M4A1: Play Group Poses"
+    bl_description = "Play through the Group's Poses, including linked Batch Poses down the Hierarchy\nLMB: Keep current Pose\nRMB/ESC: Cancel"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    steps: IntProperty(name="Steps", description="Interpolation Steps between Poses", default=24, min=1)
+
+    @classmethod
+    def poll(cls, context):
+        if context.mode == 'OBJECT':
+            active = context.active_object
+            return active and active.type == 'EMPTY' and active.M4.is_group_empty and len(active.M4.group_pose_COL) > 1
+
+    def invoke(self, context, event):
+        self.active = context.active_object
+
+        self.engine = BatchPoseEngine(get_group_hierarchy(self.active, up=False))
+        self.initial = [(e, e.matrix_local.copy()) for e in self.engine.empties]
+
+        if not self.engine.build_sequence(self.active, steps=self.steps):
+            return {'CANCELLED'}
+
+        self.frame = 0
+
+        self.TIMER = context.window_manager.event_timer_add(1 / 30, window=context.window)
+        context.window_manager.modal_handler_add(self)
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'TIMER':
+            self.engine.apply_frame(self.frame)
+            self.frame += 1
+
+            if context.area:
+                context.area.tag_redraw()
+
+        elif event.type in ['LEFTMOUSE', 'RET', 'SPACE'] and event.value == 'PRESS':
+            self.finish(context)
+            return {'FINISHED'}
+
+        elif event.type in ['RIGHTMOUSE', 'ESC'] and event.value == 'PRESS':
+            self.finish(context)
+
+            for e, mx in self.initial:
+                e.matrix_local = mx
+
+            return {'CANCELLED'}
+
+        return {'PASS_THROUGH'}
+
+    def finish(self, context):
+        context.window_manager.event_timer_remove(self.TIMER)
+
 class SortGroupPose(bpy.types.Operator):
     bl_idname = "m4a1.sort_group_pose"
     bl_label = "M4A1: Sort Group Pose"
@@ -4,51 +4,124 @@ import bpy
 from mathutils import Matrix, Vector
 from math import inf
 
-import bmesh
+import numpy as np
 
 
-def get_select_block(obj):
+def get_vert_arrays(obj):
     me = obj.data
+
     if me.is_editmode:
-        bm = bmesh.from_edit_mesh(me)
-    else:
-        bm = bmesh.new()
-        bm.from_mesh(me)
+        obj.update_from_editmode()
+
+    count = len(me.vertices)
+
+    coords = np.empty(count * 3, dtype=np.float32)
+    me.vertices.foreach_get('co', coords)
+
+    select = np.empty(count, dtype=bool)
+    me.vertices.foreach_get('select', select)
+
+    return coords.reshape(-1, 3), select
+
+
+def get_vert_labels(edges_u, edges_v, count):
+    labels = np.arange(count)
+
+    while True:
+        lu = labels[edges_u]
+        lv = labels[edges_v]
+
+        if np.array_equal(lu, lv):
+            return labels
+
+        low = np.minimum(lu, lv)
+        np.minimum.at(labels, lu, low)
+        np.minimum.at(labels, lv, low)
+
+        while True:
+            jumped = labels[labels]
+
+            if np.array_equal(jumped, labels):
+                break
+
+            labels = jumped
+
+
+def get_select_block_labels(obj):
+    # 返回 (块的键, 顶点块标签), 不在选择块内的顶点标签为 -1
+    me = obj.data
+
+    if me.is_editmode:
+        obj.update_from_editmode()
+
+    vert_count = len(me.vertices)
+    poly_count = len(me.polygons)
+
+    poly_select = np.empty(poly_count, dtype=bool)
+    me.polygons.foreach_get('select', poly_select)
+
+    if np.count_nonzero(poly_select) <= 4:
+        return [0], np.zeros(vert_count, dtype=np.int64)
+
+    loop_start = np.empty(poly_count, dtype=np.int32)
+    me.polygons.foreach_get('loop_start', loop_start)
+
+    loop_total = np.empty(poly_count, dtype=np.int32)
+    me.polygons.foreach_get('loop_total', loop_total)
+
+    loop_verts = np.empty(len(me.loops), dtype=np.int32)
+    me.loops.foreach_get('vertex_index', loop_verts)
+
+    # 选中面的每个顶点都连接到该面的第一个顶点
+    loop_polys = np.repeat(np.arange(poly_count), loop_total)
+    loop_select = poly_select[loop_polys]
+
+    edges_u = loop_verts[loop_select]
+    edges_v = loop_verts[loop_start][loop_polys][loop_select]
 
-    bm.verts.ensure_lookup_table()
-    bm.faces.ensure_lookup_table()
+    labels = get_vert_labels(edges_u, edges_v, vert_count)
 
-    group_dict = {}  # {选择块:{顶点集合}}
-    count = 0
-    select_verts = {verts for verts in bm.verts if verts.select}
-    select_faces = {face for face in bm.faces if face.select}
+    # 以块内最小的面索引作为键
+    select_polys = np.flatnonzero(poly_select)
+    poly_labels = labels[loop_verts[loop_start[select_polys]]]
 
-    if len(select_faces) <= 4:
-        return {0: {v.index for v in bm.verts}}
+    block_labels, first = np.unique(poly_labels, return_index=True)
+    keys = select_polys[first].tolist()
 
-    while len(select_faces) != 0:
-        pop_f = select_faces.pop()
+    vert_labels = np.full(vert_count, -1, dtype=np.int64)
+    vert_labels[edges_u] = np.searchsorted(block_labels, labels[edges_u])
 
-        group_dict[pop_f] = [pop_f]
-        group_list = group_dict[pop_f]
-        f = bm.faces[pop_f.index]
-        temp_search = [f]
+    return keys, vert_labels
 
-        while temp_search:
-            f = temp_search.pop()
-            select_faces.discard(f)
 
-            for vert in f.verts:
-                if vert in select_verts:
-                    select_verts.remove(vert)
-                    # count+=1
-                    for link_face in vert.link_faces:
-                        if link_face in select_faces and link_face.select:
-                            # count+=1
-                            group_list.append(link_face)
-                            select_faces.discard(link_face)
-                            temp_search.append(link_face)
-    return {group.index: {v.index for f in group_dict[group] for v in f.verts} for group in group_dict}
+def get_block_verts(keys, vert_labels):
+    order = np.argsort(vert_labels, kind='stable')
+    starts = np.searchsorted(vert_labels[order], np.arange(len(keys) + 1))
+
+    return {key: set(order[starts[i]:starts[i + 1]].tolist()) for i, key in enumerate(keys)}
+
+
+def get_select_block(obj):
+    return get_block_verts(*get_select_block_labels(obj))
+
+
+def get_block_boxes(points, vert_labels, block_count):
+    mask = vert_labels >= 0
+    labels = vert_labels[mask]
+
+    order = np.argsort(labels, kind='stable')
+    points = points[mask][order]
+    starts = np.searchsorted(labels[order], np.arange(block_count))
+
+    mins = np.minimum.reduceat(points, starts, axis=0)
+    maxs = np.maximum.reduceat(points, starts, axis=0)
+
+    return [[[float(mins[b][i]), float(maxs[b][i])] for i in range(3)] for b in range(block_count)]
+
+
+def transform_coords(coords, mat):
+    mat = np.array(mat, dtype=np.float64)
+    return coords @ mat[:3, :3].T + mat[:3, 3]
 
 
 def parent_set(child: bpy.types.Object, parent: bpy.types.Object, reverse=False):
@@ -178,15 +251,21 @@ class Lattice_Operator(bpy.types.Operator):
         self.objects = {}
 
     def min_max_calc(self, vertices, mat, box, gtv=None):
-        if not gtv:
-            def gtv(v): return v
-        for v in vertices:
-            point = mat @ gtv(v)
-            for i in range(3):
-                if box[i][0] > point[i]:
-                    box[i][0] = point[i]
-                if box[i][1] < point[i]:
-                    box[i][1] = point[i]
+        if isinstance(vertices, np.ndarray):
+            coords = vertices
+        else:
+            if not gtv:
+                def gtv(v): return v
+            coords = np.array([gtv(v)[:] for v in vertices], dtype=np.float64).reshape(-1, 3)
+
+        if len(coords):
+            points = transform_coords(coords, mat) if mat is not None else coords
+
+            for i, (low, high) in enumerate(zip(points.min(axis=0).tolist(), points.max(axis=0).tolist())):
+                if box[i][0] > low:
+                    box[i][0] = low
+                if box[i][1] < high:
+                    box[i][1] = high
         return box
 
     def box_get_common(self, o: bpy.types.Object, box, mat: Matrix):
@@ -202,64 +281,24 @@ class Lattice_Operator(bpy.types.Operator):
             #         if box[i][1] < bpoint[i]:
             #             box[i][1] = bpoint[i]
         elif self.axis == "Global":
-            # m.dot(nli.T).T
-            # import numpy as np
-            # npm = np.array(mat.to_3x3())
-            # nli = [None for _ in range(len(o.data.vertices) * 3)]
-            # o.data.vertices.foreach_get("co", nli)
-            # nli = np.array(nli).reshape(-1, 3)
-            # vertices = npm.dot(nli.T).T + mat.translation
-            # box[0][0], box[1][0], box[2][0] = vertices.min(axis=0)
-            # box[0][1], box[1][1], box[2][1] = vertices.max(axis=0)
-            # vertices.min(axis=1)
-            self.min_max_calc(o.data.vertices, mat, box, lambda v: v.co)
-            # for bpoint in o.data.vertices:
-            #     bpoint = mat @ bpoint.co
-            #     for i in range(3):
-            #         if box[i][0] > bpoint[i]:
-            #             box[i][0] = bpoint[i]
-            #         if box[i][1] < bpoint[i]:
-            #             box[i][1] = bpoint[i]
+            coords, _ = get_vert_arrays(o)
+            self.min_max_calc(coords, mat, box)
         else:
             mat = bpy.context.scene.cursor.rotation_euler.to_matrix().to_4x4().inverted() @ mat
-            self.min_max_calc(o.data.vertices, mat, box, lambda v: v.co)
-            # for bpoint in o.data.vertices:
-            #     bpoint = mat @ bpoint.co
-            #     for i in range(3):
-            #         if box[i][0] > bpoint[i]:
-            #             box[i][0] = bpoint[i]
-            #         if box[i][1] < bpoint[i]:
-            #             box[i][1] = bpoint[i]
+            coords, _ = get_vert_arrays(o)
+            self.min_max_calc(coords, mat, box)
 
     def box_get_bmesh(self, o: bpy.types.Object, box, mat: Matrix):
-        import bmesh
-        verts = []
-
-        def _calc(vertices, box, ):
-            for v in vertices:
-                point = v
-                for i in range(3):
-                    if box[i][0] > point[i]:
-                        box[i][0] = point[i]
-                    if box[i][1] < point[i]:
-                        box[i][1] = point[i]
-            return box
-
         for obj in o:
-            bm = bmesh.from_edit_mesh(obj.data)
-            bm.verts.ensure_lookup_table()
-            A = [v for v in bm.verts if v.select]
-            if len(A) <= 5:
-                A = [v for v in bm.verts]
+            coords, select = get_vert_arrays(obj)
+            if np.count_nonzero(select) > 5:
+                coords = coords[select]
             mat = obj.matrix_world
             if self.axis == "Local":
                 mat = Matrix.Translation(mat.to_translation()) @ Matrix.Diagonal(mat.to_scale()).to_4x4()
             elif self.axis == "Cursor":
                 mat = bpy.context.scene.cursor.rotation_euler.to_matrix().to_4x4().inverted() @ mat
-            for b in A:
-                verts.append(mat @ b.co)
-
-        _calc(verts, box)
+            self.min_max_calc(coords, mat, box)
 
     def box_get(self, obj: bpy.types.Object, *, whole=False, get_block=False, get_whole_block=False):
         if whole:
@@ -302,47 +341,28 @@ class Lattice_Operator(bpy.types.Operator):
             if 'bound_box' not in self.objects[obj]:
                 self.objects[obj]['bound_box'] = {}
             if obj.type == 'MESH':  # and obj.mode != 'OBJECT':#计算网格
-                import bmesh
-                # bm = bmesh.from_edit_mesh(o.data)
-                data = obj.data
-                if data.is_editmode:
-                    # Gain direct access to the mesh
-                    bm = bmesh.from_edit_mesh(data)
-                else:
-                    bm = bmesh.new()
-                    bm.from_mesh(data)
+                coords, select = get_vert_arrays(obj)
+                points = transform_coords(coords, mat)
 
-                self.objects[obj]['bound_box']['bound_box'] = self.min_max_calc(vertices=[v for v in bm.verts], mat=mat,
-                                                                                box=[[inf, -inf] for _ in range(3)],
-                                                                                gtv=lambda v: v.co)
+                self.objects[obj]['bound_box']['bound_box'] = self.min_max_calc(points, None,
+                                                                                [[inf, -inf] for _ in range(3)])
 
                 if 'block' not in self.objects[obj]:
                     self.objects[obj]['block'] = {}
 
                 if bpy.context.mode == "EDIT_MESH" and get_block:
-                    v_block = get_select_block(obj)
-
-                    self.objects[obj]['block'] = v_block
-
-                    if 'block' not in self.objects[obj]['bound_box']:
-                        self.objects[obj]['bound_box']['block'] = {}
+                    keys, vert_labels = get_select_block_labels(obj)
+                    boxes = get_block_boxes(points, vert_labels, len(keys))
 
-                    for v_ in v_block:
-                        verts = [v for v in bm.verts if v.index in v_block[v_]]
-                        self.objects[obj]['bound_box']['block'][str(v_)] = self.min_max_calc(verts, mat,
-                                                                                             [[inf, -inf] for _ in
-                                                                                              range(3)], lambda v: v.co)
+                    self.objects[obj]['block'] = get_block_verts(keys, vert_labels)
+                    self.objects[obj]['bound_box']['block'] = {str(key): boxes[i] for i, key in enumerate(keys)}
 
                 if get_whole_block:
-                    if 'whole_block' not in self.objects[obj]['bound_box']:
-                        self.objects[obj]['bound_box']['whole_block'] = {}
-                    A = [v for v in bm.verts if v.select]
-                    if len(A) <= 5:
-                        A = [v for v in bm.verts]
-                    self.objects[obj]['bound_box']['whole_block'] = self.min_max_calc(A, mat,
-                                                                                      [[inf, -inf] for _ in range(3)],
-                                                                                      lambda v: v.co)
-                    self.objects[obj]['block']['whole_block'] = {i.index for i in A}
+                    if np.count_nonzero(select) <= 5:
+                        select = np.ones(len(coords), dtype=bool)
+                    self.objects[obj]['bound_box']['whole_block'] = self.min_max_calc(points[select], None,
+                                                                                      [[inf, -inf] for _ in range(3)])
+                    self.objects[obj]['block']['whole_block'] = set(np.flatnonzero(select).tolist())
 
             else:  #
                 self.objects[obj]['bound_box']['bound_box'] = self.min_max_calc(obj.bound_box, mat,
@@ -1,5 +1,9 @@
 import bpy
 from bpy.app.translations import pgettext as _
+from mathutils.bvhtree import BVHTree
+from mathutils.kdtree import KDTree
+from zlib import crc32
+import numpy as np
 
 class Vg_clear_unused(bpy.types.Operator):
     """Delete unused vertex groups (deformation bones, modifiers), excluding those used by other objects."""
@@ -31,9 +35,15 @@ class Vg_clear_unused(bpy.types.Operator):
                 if b.use_deform:
                     used_vg.append(b.name)
         # 检查顶点组
-        for vg in obj.vertex_groups:
-            if vg.name not in used_vg:
-                obj.vertex_groups.remove(vg)
+        unused_vg = [vg.name for vg in obj.vertex_groups if vg.name not in used_vg]
+
+        if unused_vg and obj.type == 'MESH':
+            print_vgroup_stats(obj, unused_vg, get_vgroup_stats(obj))
+
+        for vg_name in unused_vg:
+            obj.vertex_groups.remove(obj.vertex_groups[vg_name])
+
+        self.report({"INFO"}, _("Removed %d vertex groups") % len(unused_vg))
         return {'FINISHED'}
 
 
@@ -49,32 +59,31 @@ class Vg_remove_zero(bpy.types.Operator):
         return bpy.context.object is not None
 
     def execute(self, context):
-        '''遍历所有顶点组，大于0的跳过'''
-        obj = bpy.context.object
-        unused_vg = []
+        '''一次遍历统计每个顶点组的最大权重，为0的批量删除'''
+        objects = [obj for obj in context.selected_objects if obj.type == 'MESH']
+
+        if context.object.type == 'MESH' and context.object not in objects:
+            objects.append(context.object)
+
+        removed = 0
+
+        for obj in objects:
+            if not obj.vertex_groups:
+                continue
+
+            stats = get_vgroup_stats(obj)
+            maxs = stats[1]
+            unused_vg = [vg.name for vg in obj.vertex_groups if maxs[vg.index] == 0]
+
+            if unused_vg:
+                print_vgroup_stats(obj, unused_vg, stats)
 
-        # 确保物体是一个网格
-        if obj.type == 'MESH':
-            # 遍历所有顶点组
-            for v_group in obj.vertex_groups:
-                used = False  # 假设顶点组未被使用
-
-                # 遍历所有顶点检查是否属于当前顶点组
-                for vertex in obj.data.vertices:
-                    for group in vertex.groups:
-                        if group.group == v_group.index and group.weight != 0:
-                            used = True  # 顶点分配给顶点组
-                            break
-
-                    if used:
-                        break  # 退出顶点循环
-
-                # 输出顶点组及其使用状态
-                if not used:
-                    unused_vg.append(v_group.name)
             for vg_name in unused_vg:
                 obj.vertex_groups.remove(obj.vertex_groups[vg_name])
 
+            removed += len(unused_vg)
+
+        self.report({"INFO"}, _("Removed %d vertex groups") % removed)
         return {'FINISHED'}
 
 
@@ -171,6 +180,267 @@ def check_for_matching_pairs(string_list, sides):
     return False
 
 
+def get_vgroup_influences(obj):
+    '''一次遍历所有顶点的权重, 返回 (顶点索引, 顶点组索引, 权重) 数组'''
+    mesh = obj.data
+
+    if mesh.is_editmode:
+        obj.update_from_editmode()
+
+    influences = [(v.index, g.group, g.weight) for v in mesh.vertices for g in v.groups]
+    influences = np.array(influences, dtype=np.float64).reshape(-1, 3)
+
+    return influences[:, 0].astype(np.int64), influences[:, 1].astype(np.int64), influences[:, 2]
+
+
+def get_vgroup_stats(obj, influences=None):
+    '''返回每个顶点组的 (顶点数, 最大权重, 平均权重) 数组, 以顶点组索引排列'''
+    count = len(obj.vertex_groups)
+    verts, groups, weights = influences or get_vgroup_influences(obj)
+
+    nonzero = weights != 0
+
+    counts = np.bincount(groups[nonzero], minlength=count)
+    sums = np.bincount(groups[nonzero], weights=weights[nonzero], minlength=count)
+
+    maxs = np.zeros(count, dtype=np.float64)
+    np.maximum.at(maxs, groups, np.abs(weights))
+
+    means = np.divide(sums, counts, out=np.zeros(count, dtype=np.float64), where=counts > 0)
+
+    return counts[:count], maxs, means[:count]
+
+
+def print_vgroup_stats(obj, names, stats):
+    counts, maxs, means = stats
+
+    for name in names:
+        idx = obj.vertex_groups[name].index
+        print(f" {obj.name}: {name} - verts: {counts[idx]}, max: {maxs[idx]:.3f}, mean: {means[idx]:.3f}")
+
+
+mirror_maps = {}
+
+
+def get_barycentric_factors(points, tri_coords):
+    '''批量计算点在三角面内的重心坐标'''
+    a, b, c = tri_coords[:, 0], tri_coords[:, 1], tri_coords[:, 2]
+    v0, v1, v2 = b - a, c - a, points - a
+
+    d00 = (v0 * v0).sum(axis=1)
+    d01 = (v0 * v1).sum(axis=1)
+    d11 = (v1 * v1).sum(axis=1)
+    d20 = (v2 * v0).sum(axis=1)
+    d21 = (v2 * v1).sum(axis=1)
+
+    denom = d00 * d11 - d01 * d01
+    degenerate = np.abs(denom) < 1e-12
+    denom[degenerate] = 1
+
+    v = (d11 * d20 - d01 * d21) / denom
+    w = (d00 * d21 - d01 * d20) / denom
+
+    factors = np.clip(np.stack((1 - v - w, v, w), axis=1), 0, 1)
+    factors[degenerate] = (1, 0, 0)
+
+    return factors / factors.sum(axis=1, keepdims=True)
+
+
+def get_topology_key(mesh):
+    edges = np.empty(len(mesh.edges) * 2, dtype=np.int32)
+    mesh.edges.foreach_get('vertices', edges)
+
+    loops = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', loops)
+
+    return mesh.as_pointer(), len(mesh.vertices), crc32(edges.tobytes()), crc32(loops.tobytes())
+
+
+def get_mirror_coords(obj):
+    '''返回用于镜像的顶点坐标, 有激活形态键时由各形态键的数据数组计算混合后的坐标'''
+    mesh = obj.data
+    count = len(mesh.vertices)
+
+    blocks = {}
+
+    def get_block_coords(block):
+        if block.name not in blocks:
+            blocks[block.name] = np.empty(count * 3, dtype=np.float32)
+            block.data.foreach_get('co', blocks[block.name])
+
+        return blocks[block.name].reshape(-1, 3)
+
+    coords = np.empty(count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', coords)
+    coords = coords.reshape(-1, 3)
+
+    keys = mesh.shape_keys
+    key = obj.active_shape_key
+
+    if key is None or not keys.use_relative or not (key.value or obj.show_only_shape_key):
+        return coords
+
+    if obj.show_only_shape_key:
+        return get_block_coords(key).copy()
+
+    reference = keys.reference_key
+    coords = get_block_coords(reference).astype(np.float64)
+
+    for block in keys.key_blocks:
+        if block == reference or block.mute or not block.value:
+            continue
+
+        delta = (get_block_coords(block) - get_block_coords(block.relative_key)) * block.value
+
+        if block.vertex_group and block.vertex_group in obj.vertex_groups:
+            index = obj.vertex_groups[block.vertex_group].index
+            delta *= get_vgroup_weights(obj, {index})[index][:, None]
+
+        coords += delta
+
+    return coords.astype(np.float32)
+
+
+def get_exact_matches(coords, points):
+    '''将点量化后与顶点坐标批量匹配, 返回每个点对应的顶点索引, 没有匹配时为-1'''
+    extent = np.ptp(coords, axis=0).max() if len(coords) else 0
+    eps = max(extent * 1e-6, 1e-9)
+
+    keys = np.round(np.concatenate((coords, points)) / eps).astype(np.int64)
+    _, inverse = np.unique(keys, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+
+    count = len(coords)
+
+    lookup = np.full(inverse.max() + 1, -1, dtype=np.int64)
+    lookup[inverse[:count][::-1]] = np.arange(count)[::-1]
+
+    return lookup[inverse[count:]]
+
+
+def get_mirror_map(mesh, method='NEAREST', coords=None):
+    '''返回 (镜像顶点索引, 插值系数, 顶点x坐标), 按拓扑缓存, 坐标变化时重新计算'''
+    count = len(mesh.vertices)
+
+    if coords is None:
+        coords = np.empty(count * 3, dtype=np.float32)
+        mesh.vertices.foreach_get('co', coords)
+        coords = coords.reshape(-1, 3)
+
+    key = (get_topology_key(mesh), method)
+    checksum = crc32(coords.tobytes())
+
+    if key in mirror_maps and mirror_maps[key][0] == checksum:
+        return mirror_maps[key][1]
+
+    mirrored = coords * (-1, 1, 1)
+    matches = get_exact_matches(coords, mirrored)
+
+    tris = None
+
+    if method == 'POLYINTERP_NEAREST':
+        mesh.calc_loop_triangles()
+
+        tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get('vertices', tris)
+        tris = tris.reshape(-1, 3)
+
+    if tris is not None and len(tris):
+        vert_tris = np.full(count, -1, dtype=np.int64)
+        vert_tris[tris.ravel()] = np.repeat(np.arange(len(tris)), 3)
+
+        faces = np.where(matches >= 0, vert_tris[np.maximum(matches, 0)], -1)
+        locations = coords[np.maximum(matches, 0)].astype(np.float64)
+
+        remaining = np.flatnonzero(faces < 0)
+
+        if len(remaining):
+            bvh = BVHTree.FromPolygons(coords.tolist(), tris.tolist())
+
+            for idx, co in zip(remaining.tolist(), mirrored[remaining].tolist()):
+                location, normal, faces[idx], distance = bvh.find_nearest(co)
+                locations[idx] = location
+
+        indices = tris[faces]
+        factors = get_barycentric_factors(locations, coords[indices].astype(np.float64))
+
+    else:
+        indices = matches
+        remaining = np.flatnonzero(indices < 0)
+
+        if len(remaining):
+            kd = KDTree(count)
+
+            for idx, co in enumerate(coords.tolist()):
+                kd.insert(co, idx)
+
+            kd.balance()
+
+            indices[remaining] = [kd.find(co)[1] for co in mirrored[remaining].tolist()]
+
+        indices = indices.reshape(-1, 1)
+        factors = np.ones((count, 1), dtype=np.float64)
+
+    if key not in mirror_maps and len(mirror_maps) >= 4:
+        del mirror_maps[next(iter(mirror_maps))]
+
+    mirror_maps[key] = checksum, (indices, factors, coords[:, 0].copy())
+    return mirror_maps[key][1]
+
+
+def get_vgroup_weights(obj, group_indices, influences=None):
+    '''一次遍历读取顶点组权重, 返回 {顶点组索引: 权重数组}'''
+    count = len(obj.data.vertices)
+    verts, groups, weights = influences or get_vgroup_influences(obj)
+
+    result = {}
+
+    for group_index in group_indices:
+        mask = groups == group_index
+
+        result[group_index] = np.zeros(count, dtype=np.float64)
+        result[group_index][verts[mask]] = weights[mask]
+
+    return result
+
+
+def set_vgroup_weights(vg, weights, old_weights=None):
+    '''按权重值分批写入顶点组, 权重为0的顶点从顶点组中移除'''
+    if old_weights is not None:
+        members = np.flatnonzero(old_weights > 0).tolist()
+
+        if members:
+            vg.remove(members)
+
+    indices = np.flatnonzero(weights > 0)
+
+    if not len(indices):
+        return
+
+    values, inverse = np.unique(weights[indices].astype(np.float32), return_inverse=True)
+
+    order = np.argsort(inverse, kind='stable')
+    starts = np.searchsorted(inverse[order], np.arange(len(values) + 1))
+
+    for idx, value in enumerate(values.tolist()):
+        vg.add(indices[order[starts[idx]:starts[idx + 1]]].tolist(), value, 'REPLACE')
+
+
+def mirror_vgroup_weights(weights, mirror_map):
+    indices, factors = mirror_map[:2]
+    return (weights[indices] * factors).sum(axis=1)
+
+
+def symmetrize_vgroup_weights(weights, mirror_map, left_right):
+    '''-x: 使用+x侧的权重对称到-x侧, +x: 使用-x侧的权重对称到+x侧'''
+    x = mirror_map[2]
+    target = x < 0 if left_right == '-x' else x > 0
+
+    result = weights.copy()
+    result[target] = mirror_vgroup_weights(weights, mirror_map)[target]
+    return result
+
+
 class Vg_mirror_weight(bpy.types.Operator):
     """Mirror vertex groups weights"""
 
@@ -204,7 +474,7 @@ class Vg_mirror_weight(bpy.types.Operator):
         objs = bpy.context.selected_objects
         rig = next((obj for obj in objs if obj.type == 'ARMATURE'), None)
         if not rig:
-            return {'CANCELLED'}
+            return []
 
         # 获取选择顶点组
         select_vg = []
@@ -236,89 +506,6 @@ class Vg_mirror_weight(bpy.types.Operator):
                     v_groups.append(vg.name)
         return v_groups
 
-    def create_mirrored(self, model_a, name_weight, name_trans):
-        '''创建权重模型，权重转移模型，
-        返回原模型，
-        权重模型，
-        传输模型，
-        激活顶点组名'''
-        # 获取当前激活的模型A
-
-        # 记录模型A当前激活顶点组a_g的名称
-        active_vg_name = model_a.vertex_groups.active.name
-
-        # 创建模型B和模型C为模型A的副本
-        model_b = model_a.copy()
-        model_b.data = model_a.data.copy()
-        model_b.name = name_weight
-        model_b.data.name = name_weight
-        bpy.context.collection.objects.link(model_b)
-
-        model_c = model_a.copy()
-        model_c.data = model_a.data.copy()
-        model_c.name = name_trans
-        model_c.data.name = name_trans
-
-        bpy.context.collection.objects.link(model_c)
-
-        bpy.context.view_layer.objects.active = model_b
-        return model_b, model_c, active_vg_name
-
-    def symmetriy_ops(self, ms, model_b):
-        '''对称中间骨权重'''
-        # 激活模型B
-        # 添加并应用镜像修改器
-        mirror_mod = model_b.modifiers.new(name="Mirror", type='MIRROR')
-        mirror_mod.use_axis[0] = True
-        mirror_mod.use_bisect_axis[0] = True
-        if ms.left_right == '-x':
-            mirror_mod.use_bisect_flip_axis[0] = False
-        else:
-            mirror_mod.use_bisect_flip_axis[0] = True
-
-        for window in bpy.context.window_manager.windows:
-            screen = window.screen
-            for area in screen.areas:
-                if area.type == 'VIEW_3D':
-                    with bpy.context.temp_override(window=window, area=area, active_object=model_b):
-                        # bpy.ops.screen.screen_full_area()
-                        if model_b.active_shape_key is not None:
-                            if model_b.active_shape_key.value or model_b.show_only_shape_key:
-                                bpy.ops.object.shape_key_remove(all=True, apply_mix=True)
-                        model_b.shape_key_clear()
-
-                        bpy.ops.object.modifier_apply(modifier='Mirror')
-                    break
-
-        # 添加并应用切分修改器
-
-    def transfer_vg(self, origin, source, result):
-        '''转移权重，应用修改器'''
-        bpy.context.view_layer.objects.active = result
-        result.select_set(True)
-
-        # 为模型C添加DataTransfer修改器，传递模型B的顶点组
-        bpy.context.view_layer.objects.active = result
-        result.select_set(True)
-        data_transfer_mod = result.modifiers.new(name="DataTransferC", type='DATA_TRANSFER')
-        data_transfer_mod.object = source
-        data_transfer_mod.use_vert_data = True
-        data_transfer_mod.data_types_verts = {'VGROUP_WEIGHTS'}
-        if origin.mirror_settings.mirror_method == 'POLYINTERP_NEAREST':
-            data_transfer_mod.vert_mapping = 'POLYINTERP_NEAREST'
-        else:
-            data_transfer_mod.vert_mapping = 'NEAREST'
-        # 应用DataTransfer修改器到模型C
-        for window in bpy.context.window_manager.windows:
-            screen = window.screen
-            for area in screen.areas:
-                if area.type == 'VIEW_3D':
-                    with bpy.context.temp_override(window=window, area=area, active_object=source):
-                        # bpy.ops.screen.screen_full_area()
-                        bpy.ops.object.datalayout_transfer(modifier="DataTransferC")
-                        bpy.ops.object.modifier_apply(modifier="DataTransferC")
-                    break
-
     def execute(self, context):
         temp_mode = bpy.context.object.mode
 
@@ -327,107 +514,72 @@ class Vg_mirror_weight(bpy.types.Operator):
         model_a = bpy.context.view_layer.objects.active
         model_a.select_set(True)
         ms = model_a.mirror_settings
-        '''按选择骨骼镜像时，处理方式不同'''
-        # 处理选择的骨骼顶点组 权重
+
+        active_vg_name = model_a.vertex_groups.active.name
+
+        # (源顶点组, 目标顶点组, 是否对称)
+        tasks = []
+
+        # 按选择镜像, 中间的顶点组对称, 左右的顶点组镜像
         if ms.is_selected:
             v_groups = self.mirror_based_on_selection()
             if check_for_matching_pairs(v_groups, sides):
                 self.report({"ERROR"}, "You cannot select both left and right bones simultaneously!")
                 bpy.ops.object.mode_set(mode=temp_mode)
                 return {'CANCELLED'}
-            # 对称权重
-            model_b_sym, model_c_sym, active_vg_name = self.create_mirrored(model_a, 'model_b_sym', 'model_c_sym')
-            self.symmetriy_ops(ms, model_b_sym)
-            self.transfer_vg(model_a, model_b_sym, model_c_sym)
 
-            # 镜像权重
-            model_b_mir, model_c_mir, active_vg_name = self.create_mirrored(model_a, 'model_b_mir', 'model_c_mir')
-            model_b_mir.scale.x *= -1
-            bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-            self.transfer_vg(model_a, model_b_mir, model_c_mir)
+            for name in v_groups:
+                if name in model_a.vertex_groups:
+                    if determine_and_convert(name, 'center')[0]:
+                        tasks.append((name, name, True))
+                    else:
+                        tasks.append((name, determine_and_convert(name)[2], False))
 
+            mirrored = determine_and_convert(active_vg_name)[2]
 
-        # 处理单个顶点组
-        else:
-            model_b, model_c, active_vg_name = self.create_mirrored(model_a, 'model_b', 'model_c')
-            if ms.is_center:
-                self.symmetriy_ops(ms, model_b)
-            else:
-                # 在X轴上缩放模型B为-1，实现镜像
-                model_b.scale.x *= -1
-                bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
-            self.transfer_vg(model_a, model_b, model_c)
-        # 确保变更生效
-        # bpy.context.view_layer.update()
+        # 按中间对称
+        elif ms.is_multiple and ms.is_center:
+            tasks = [(name, name, True) for name in self.mirror_based_on_center()]
+            mirrored = determine_and_convert(active_vg_name)[2]
+
+        # 按左右镜像
+        elif ms.is_multiple:
+            tasks = [(name, determine_and_convert(name)[2], False) for name in self.mirror_based_on_LR(ms)]
+            mirrored = determine_and_convert(active_vg_name)[2]
 
         # 单个顶点组
-        if not ms.is_multiple:
-            # 清理模型C的顶点组，只留下a_g
-            clean_vertex_groups(model_c, [active_vg_name])
-
-            # 更改镜像后的顶点组名称
-            if ms.is_center:
-                mirrored = model_c.vertex_groups.active.name
-            else:
-                mirrored = determine_and_convert(model_c.vertex_groups.active.name)[2]
-            model_c.vertex_groups.active.name = mirrored
-            # 为模型A添加DataTransfer修改器，传递模型C的a_g顶点组
-            self.transfer_vg(model_a, model_c, model_a)
-
-        # 多个顶点组
-        else:
+        elif ms.is_center:
+            tasks = [(active_vg_name, active_vg_name, True)]
+            mirrored = active_vg_name
 
-            # 按中间镜像
-            if ms.is_center and not ms.is_selected:
-                v_groups = self.mirror_based_on_center()
-                for vg in model_c.vertex_groups[:]:
-                    if vg.name not in v_groups:
-                        model_c.vertex_groups.remove(vg)
-
-                self.transfer_vg(model_a, model_c, model_a)
-            # 按左右镜像
-            elif not ms.is_center and not ms.is_selected:
-                v_groups = self.mirror_based_on_LR(ms)
-
-                for vg in model_c.vertex_groups[:]:
-                    if vg.name not in v_groups:
-                        model_c.vertex_groups.remove(vg)
-                for vg in model_c.vertex_groups[:]:
-                    vg.name = determine_and_convert(vg.name)[2]
-                self.transfer_vg(model_a, model_c, model_a)
-            # 按选择镜像
-            elif ms.is_selected:
-                v_groups = self.mirror_based_on_selection()
-
-                # 留下中间的顶点组
-                for vg in model_c_sym.vertex_groups[:]:
-                    # print(vg.name)
-                    if not determine_and_convert(vg.name, 'center')[0]:
-                        # print(f'shanchu{vg.name}')
-                        model_c_sym.vertex_groups.remove(vg)
-                clean_vertex_groups(model_c_sym, v_groups)
-                # 留下对应的左右边顶点组
-                for vg in model_c_mir.vertex_groups[:]:
-                    if determine_and_convert(vg.name, 'center')[0]:
-                        model_c_mir.vertex_groups.remove(vg)
-
-                clean_vertex_groups(model_c_mir, v_groups)
-                for vg in model_c_mir.vertex_groups[:]:
-                    vg.name = determine_and_convert(vg.name)[2]
-                self.transfer_vg(model_a, model_c_sym, model_a)
-                self.transfer_vg(model_a, model_c_mir, model_a)
-
-            # 激活顶点组
+        else:
             mirrored = determine_and_convert(active_vg_name)[2]
-        try:
-            bpy.data.meshes.remove(model_b.data)
-            bpy.data.meshes.remove(model_c.data)
-
-        except:
-            bpy.data.meshes.remove(model_b_mir.data)
-            bpy.data.meshes.remove(model_b_sym.data)
-            bpy.data.meshes.remove(model_c_mir.data)
-            bpy.data.meshes.remove(model_c_sym.data)
+            tasks = [(active_vg_name, mirrored, False)]
+
+        if tasks:
+            vgroups = model_a.vertex_groups
+
+            for source, target, symmetrize in tasks:
+                if target not in vgroups:
+                    vgroups.new(name=target)
+
+            mirror_map = get_mirror_map(model_a.data, ms.mirror_method, coords=get_mirror_coords(model_a))
+            weights = get_vgroup_weights(model_a, {vgroups[name].index for task in tasks for name in task[:2]})
+
+            # 先计算所有结果再写入, 避免源和目标重叠时互相影响
+            results = []
+
+            for source, target, symmetrize in tasks:
+                source_weights = weights[vgroups[source].index]
+
+                if symmetrize:
+                    results.append((target, symmetrize_vgroup_weights(source_weights, mirror_map, ms.left_right)))
+                else:
+                    results.append((target, mirror_vgroup_weights(source_weights, mirror_map)))
+
+            for target, target_weights in results:
+                vg = vgroups[target]
+                set_vgroup_weights(vg, target_weights, old_weights=weights[vg.index])
 
         model_a.vertex_groups.active_index = model_a.vertex_groups.find(mirrored)
         bpy.context.view_layer.objects.active = model_a
@@ -5,6 +5,7 @@ import bmesh
 from mathutils import Vector
 from mathutils.geometry import intersect_point_line, intersect_line_line, intersect_line_plane
 from .. utils.graph import get_shortest_path
+from .. utils.bmesh import VertSnapshot
 from .. utils.ui import popup_message, init_status, finish_status
 from .. utils.draw import draw_lines, draw_point, draw_tris
 from .. utils.snap import Snap
@@ -218,19 +219,13 @@ class SmartVert(bpy.types.Operator):
         return {'RUNNING_MODAL'}
 
     def cancel_modal(self, context):
-        for v, data in self.verts.items():
-            v.co = data['co']
-
-        if self.can_flatten:
-            for v, vdict in self.flatten_dict['other_verts'].items():
-                v.co = vdict['co']
-
-        self.bm.normal_update()
-
         if context.mode == 'EDIT_MESH':
+            self.snapshot.restore()
+
+            self.bm.normal_update()
             bmesh.update_edit_mesh(self.active.data)
         else:
-            self.bm.to_mesh(self.active.data)
+            self.snapshot.restore_mesh(self.active.data)
 
         self.finish(context)
 
@@ -376,6 +371,8 @@ class SmartVert(bpy.types.Operator):
                                     self.flatten_dict['other_verts'][v] = {'co': v.co.copy(),
                                                                            'line': line}
 
+            self.snapshot = VertSnapshot(self.bm, verts=[*self.verts, *self.flatten_dict.get('other_verts', {})])
+
             self.target_avg = self.mx @ average_locations([data['target'].co for _, data in self.verts.items()])
             self.origin = self.mx @ average_locations([v.co for v, _ in self.verts.items()])
 
@@ -445,19 +442,19 @@ class SmartVert(bpy.types.Operator):
             return history
         return None
 
-    def get_paths(self, bm, history, topo):
+    def get_paths(self, active, bm, history, topo):
         pair1 = history[0:2]
         pair2 = history[2:4]
         pair2.reverse()
 
-        path1 = get_shortest_path(bm, *pair1, topo=topo, select=True)
-        path2 = get_shortest_path(bm, *pair2, topo=topo, select=True)
+        path1 = get_shortest_path(bm, *pair1, topo=topo, select=True, obj=active)
+        path2 = get_shortest_path(bm, *pair2, topo=topo, select=True, obj=active)
 
         is_any_in_both = any(v in path2 for v in path1)
 
         if is_any_in_both:
-            path1 = get_shortest_path(bm, *pair1, topo=not topo, select=True)
-            path2 = get_shortest_path(bm, *pair2, topo=not topo, select=True)
+            path1 = get_shortest_path(bm, *pair1, topo=not topo, select=True, obj=active)
+            path2 = get_shortest_path(bm, *pair2, topo=not topo, select=True, obj=active)
 
             self.pathtype = step_enum(self.pathtype, smartvert_path_type_items, step=1, loop=True)
 
@@ -524,7 +521,7 @@ class SmartVert(bpy.types.Operator):
                     history = self.validate_history(active, bm)
 
                     if history:
-                        path1, path2 = self.get_paths(bm, history, topo)
+                        path1, path2 = self.get_paths(active, bm, history, topo)
                         self.merge_paths(active, bm, path1, path2)
                         return True
 
@@ -533,7 +530,7 @@ class SmartVert(bpy.types.Operator):
                 history = self.validate_history(active, bm)
 
                 if history:
-                    path1, path2 = self.get_paths(bm, history, topo)
+                    path1, path2 = self.get_paths(active, bm, history, topo)
 
                     self.connect(active, bm, path1, path2)
                     return True
@@ -658,8 +655,7 @@ class SmartVert(bpy.types.Operator):
                 self.flatten_verts()
 
             else:
-                for v, vdict in self.flatten_dict['other_verts'].items():
-                    v.co = vdict['co']
+                self.snapshot.restore(verts=self.flatten_dict['other_verts'])
 
         self.bm.normal_update()
 
@@ -753,8 +749,7 @@ class SmartVert(bpy.types.Operator):
                 self.flatten_verts()
 
             else:
-                for v, vdict in self.flatten_dict['other_verts'].items():
-                    v.co = vdict['co']
+                self.snapshot.restore(verts=self.flatten_dict['other_verts'])
 
         self.bm.normal_update()
 
@@ -7,6 +7,7 @@ from . import bl_info
 from . utils.ui import get_icon, draw_keymap_items, get_keymap_item
 from . utils.registration import activate, get_path, get_name, get_addon
 from . utils.draw import draw_split_row
+from . utils.developer import profiler
 from . utils.simple_deform_helper import GizmoUtils
 from . utils.system import get_bl_info_from_file, remove_folder, get_update_files
 from . items import preferences_tabs, matcap_background_type_items
@@ -111,6 +112,12 @@ class MACHIN4toolsPreferences(bpy.types.AddonPreferences, GizmoUtils):
 
     registration_debug: BoolProperty(name="Addon Terminal Registration Output", default=True)
 
+    def update_profiling(self, context):
+        profiler.enabled = self.profiling
+
+    profiling: BoolProperty(name="Profiling", description="Record Timings of Handlers and Modal Operators", default=False, update=update_profiling)
+    show_developer_panel: BoolProperty(name="Show Developer Panel", default=False)
+
     def update_switchmatcap1(self, context):
         if self.avoid_update:
             self.avoid_update = False
@@ -550,6 +557,8 @@ class MACHIN4toolsPreferences(bpy.types.AddonPreferences, GizmoUtils):
 
     show_sidebar_panel: BoolProperty(name="Show Sidebar Panel", description="Show M4A1tools Panel in 3D View's Sidebar", default=True)
 
+    geometry_cache_budget: IntProperty(name="Geometry Cache Budget (MB)", description="Memory budget for the bmeshes and BVH trees shared by ray casting, snapping and the material picker", default=256, min=0)
+
     modal_hud_scale: FloatProperty(name="HUD Scale", description="Scale of HUD elements", default=1, min=0.1)
     modal_hud_timeout: FloatProperty(name="HUD timeout", description="Global Timeout Modulation (not exposed in M4A1tools)", default=1, min=0.1)
     HUD_fade_clean_up: FloatProperty(name="Clean Up HUD Fade Time (seconds)", default=1, min=0.1)
@@ -766,6 +775,8 @@ class MACHIN4toolsPreferences(bpy.types.AddonPreferences, GizmoUtils):
 
         column = bb.column()
         draw_split_row(self, column, prop='registration_debug', label='Print Addon Registration Output in System Console')
+        draw_split_row(self, column, prop='geometry_cache_budget', label='Memory Budget of the Geometry Cache in MB', factor=0.2)
+        draw_split_row(self, column, prop='show_developer_panel', label='Show Developer Panel with Handler and Modal Operator Timings in the Sidebar')
 
         if any([getattr(bpy.types, f'M4A1_{name}', False) for name in has_sidebar]):
             bb = b.box()
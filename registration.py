@@ -18,7 +18,11 @@ classes = {'CORE': [('ui.UILists', [('GroupPosesUIList', '')]),
                                              ('UseFoundUpdate', 'use_m4a1tools_update'),
                                              ('ReScanUpdates', 'rescan_m4a1tools_updates')]),
 
-                    ('ui.panels', [('PanelM4A1tools', 'm4a1_tools')]),
+                    ('ui.operators.developer', [('ResetProfiler', 'reset_profiler'),
+                                                ('DumpProfiler', 'dump_profiler')]),
+
+                    ('ui.panels', [('PanelM4A1tools', 'm4a1_tools'),
+                                   ('PanelDeveloper', 'developer')]),
                     ('ui.menus', [('MenuM4A1toolsObjectContextMenu', 'm4a1tools_object_context_menu'),
                                   ('MenuM4A1toolsMeshContextMenu', 'm4a1tools_mesh_context_menu'),
                                   ('MenuGroupObjectContextMenu', 'group_object_context_menu')]),
@@ -106,6 +110,7 @@ classes = {'CORE': [('ui.UILists', [('GroupPosesUIList', '')]),
                                           ('UpdateGroupPose', 'update_group_pose'),
                                           ('RemoveGroupPose', 'remove_group_pose'),
                                           ('RetrieveGroupPose', 'retrieve_group_pose'),
+                                          ('PlayGroupPoses', 'play_group_poses'),
                                           ('SortGroupPose', 'sort_group_pose')]),
                      ('operators.draw.group', [('DrawGroupRestPose', 'draw_group_rest_pose')])],
 
@@ -0,0 +1,37 @@
+import bpy
+import os
+import time
+from ... utils.developer import profiler
+from ... utils.registration import get_path
+from ... utils.system import makedir
+
+class ResetProfiler(bpy.types.Operator):
+    bl_idname = "m4a1.reset_profiler"
+    bl_label = "M4A1: Reset Profiler"
+    bl_description = "Clear all recorded Handler and Modal Operator Timings"
+    bl_options = {'REGISTER'}
+
+    def execute(self, context):
+        profiler.reset()
+
+        if context.area:
+            context.area.tag_redraw()
+
+        return {'FINISHED'}
+
+class DumpProfiler(bpy.types.Operator):
+    bl_idname = "m4a1.dump_profiler"
+    bl_label = "M4A1: Dump Profiler"
+    bl_description = "Write recorded Handler and Modal Operator Timings to a JSON File in the M4A1tools logs Folder"
+    bl_options = {'REGISTER'}
+
+    @classmethod
+    def poll(cls, context):
+        return profiler.timings
+
+    def execute(self, context):
+        logpath = makedir(os.path.join(get_path(), "logs"))
+        path = profiler.dump(os.path.join(logpath, f"profile_{time.strftime('%Y%m%d_%H%M%S')}.json"))
+
+        self.report({'INFO'}, f"Dumped timings to {path}")
+        return {'FINISHED'}
@@ -3,8 +3,10 @@ from bpy.ops import ed
 from bpy.props import IntProperty, BoolProperty, EnumProperty, FloatProperty
 import bmesh
 from math import radians
+import numpy as np
 from ... utils.bmesh import ensure_custom_data_layers
 from ... utils.draw import draw_fading_label
+from ... utils.mesh import clear_edge_attributes
 from ... utils.modifier import add_auto_smooth, get_auto_smooth, remove_mod, sort_mod
 from ... utils.registration import get_addon 
 from ... utils.system import printd
@@ -294,73 +296,148 @@ class Shade(bpy.types.Operator):
         mesh_objects = [obj for obj in objects if obj.type == 'MESH']
 
         for obj in mesh_objects:
-
             if bpy.app.version < (4, 1, 0) and not obj.data.use_auto_smooth:
                 obj.data.use_auto_smooth = True
                 obj.data.auto_smooth_angle = angle
 
-            if context.mode == 'OBJECT':
-                bm = bmesh.new()
-                bm.from_mesh(obj.data)
-                vglayer = bm.verts.layers.deform.verify()
-            elif context.mode == 'EDIT_MESH':
-                bm = bmesh.from_edit_mesh(obj.data)
-                vglayer = bm.verts.layers.deform.verify()
-                for f in bm.faces:
-                    f.smooth = True
+        if context.mode == 'OBJECT':
+            meshes = {}
 
-            bm.normal_update()
+            for obj in mesh_objects:
+                meshes.setdefault(obj.data, []).append(obj)
 
-            edge_bevelled_edges = self.get_hypercursor_edge_bevelled_edges(obj, bm, vglayer) if hypercursor else []
+            for mesh, objs in meshes.items():
+                self.set_mesh_sharp_edges(mesh, objs, angle, hypercursor)
 
-            if edge_bevelled_edges:
+        elif context.mode == 'EDIT_MESH':
+            for obj in mesh_objects:
+                self.set_bmesh_sharp_edges(obj, angle, hypercursor)
 
-                if not self.has_edge_bevels:
-                    self.has_edge_bevels = True
+        if context.space_data.overlay.show_edge_sharp:
+            context.space_data.overlay.show_edge_sharp = True
 
-                if not self.avoid_sharpen_edge_bevels:
-                    edge_bevelled_edges = []
+    def set_mesh_sharp_edges(self, mesh, objects, angle, hypercursor):
+        edge_count = len(mesh.edges)
+        poly_count = len(mesh.polygons)
 
-            sharp_edges = [e for e in bm.edges if e.index not in edge_bevelled_edges and len(e.link_faces) == 2 and e.calc_face_angle() > angle]
+        normals = np.empty(poly_count * 3, dtype=np.float32)
+        mesh.polygons.foreach_get('normal', normals)
+        normals = normals.reshape(-1, 3)
 
-            if self.sharpen_additively:
-                for e in sharp_edges:
-                    e.smooth = False
+        loop_totals = np.empty(poly_count, dtype=np.int32)
+        mesh.polygons.foreach_get('loop_total', loop_totals)
 
-            else:
-                for e in bm.edges:
-                    e.smooth = e not in sharp_edges
+        corner_edges = np.empty(len(mesh.loops), dtype=np.int32)
+        mesh.loops.foreach_get('edge_index', corner_edges)
 
-            if context.mode == 'OBJECT':
-                bm.to_mesh(obj.data)
-                bm.free()
+        corner_faces = np.repeat(np.arange(poly_count), loop_totals)
 
-            elif context.mode == 'EDIT_MESH':
-                bmesh.update_edit_mesh(obj.data)
+        face_counts = np.bincount(corner_edges, minlength=edge_count)
+        order = np.argsort(corner_edges, kind='stable')
+        starts = np.cumsum(face_counts) - face_counts
 
-        if context.space_data.overlay.show_edge_sharp:
-            context.space_data.overlay.show_edge_sharp = True
+        manifold = np.flatnonzero(face_counts == 2)
+
+        faces1 = corner_faces[order[starts[manifold]]]
+        faces2 = corner_faces[order[starts[manifold] + 1]]
+
+        face_angles = np.arccos(np.clip(np.einsum('ij,ij->i', normals[faces1], normals[faces2]), -1, 1))
+
+        sharp = np.zeros(edge_count, dtype=bool)
+        sharp[manifold[face_angles > angle]] = True
+
+        if hypercursor:
+            edges = np.empty(edge_count * 2, dtype=np.int32)
+            mesh.edges.foreach_get('vertices', edges)
+
+            bevelled = self.get_hypercursor_edge_bevel_mask(mesh, objects, edges.reshape(-1, 2))
+
+            if bevelled.any():
+                self.has_edge_bevels = True
+
+                if self.avoid_sharpen_edge_bevels:
+                    sharp &= ~bevelled
+
+        if self.sharpen_additively:
+            existing = np.empty(edge_count, dtype=bool)
+            mesh.edges.foreach_get('use_edge_sharp', existing)
+
+            sharp |= existing
+
+        mesh.edges.foreach_set('use_edge_sharp', sharp)
+        mesh.update()
+
+    def set_bmesh_sharp_edges(self, obj, angle, hypercursor):
+        bm = bmesh.from_edit_mesh(obj.data)
+        vglayer = bm.verts.layers.deform.verify()
+
+        for f in bm.faces:
+            f.smooth = True
+
+        bm.normal_update()
+
+        edge_bevelled_edges = self.get_hypercursor_edge_bevelled_edges(obj, bm, vglayer) if hypercursor else set()
+
+        if edge_bevelled_edges:
+            self.has_edge_bevels = True
+
+            if not self.avoid_sharpen_edge_bevels:
+                edge_bevelled_edges = set()
+
+        sharp_edges = {e for e in bm.edges if e.index not in edge_bevelled_edges and len(e.link_faces) == 2 and e.calc_face_angle() > angle}
+
+        if self.sharpen_additively:
+            for e in sharp_edges:
+                e.smooth = False
+
+        else:
+            for e in bm.edges:
+                e.smooth = e not in sharp_edges
+
+        bmesh.update_edit_mesh(obj.data)
+
+    def get_hypercursor_edge_bevel_mask(self, mesh, objects, edges):
+        vgroups = {vg.index for obj in objects for vg in obj.vertex_groups if 'Edge Bevel' in vg.name}
+
+        bevelled = np.zeros(len(edges), dtype=bool)
+
+        if vgroups:
+            weights = [(g.group, v.index) for v in mesh.vertices for g in v.groups if g.group in vgroups and g.weight == 1]
+
+            if weights:
+                masks = np.zeros((max(vgroups) + 1, len(mesh.vertices)), dtype=bool)
+                masks[tuple(np.array(weights, dtype=np.int32).T)] = True
+
+                for idx in vgroups:
+                    bevelled |= masks[idx][edges[:, 0]] & masks[idx][edges[:, 1]]
+
+        return bevelled
 
     def get_hypercursor_edge_bevelled_edges(self, obj, bm, vglayer, debug=False):
         vgroups = {vg.index: {'name': vg.name,
-                              'verts': [],
+                              'verts': set(),
                               'edges': []} for vg in obj.vertex_groups if 'Edge Bevel' in vg.name}
 
-        verts = [v for v in bm.verts]
+        if not vgroups:
+            return set()
 
-        for v in verts:
+        bm.verts.index_update()
+        bm.edges.index_update()
+
+        for v in bm.verts:
 
             for vgindex, weight in v[vglayer].items():
                 if vgindex in vgroups and weight == 1:
-                    vgroups[vgindex]['verts'].append(v.index)
+                    vgroups[vgindex]['verts'].add(v.index)
 
-        edge_bevelled_edges = []
+        edge_bevelled_edges = set()
 
         for e in bm.edges:
+            indices = [v.index for v in e.verts]
 
-            for vgindex, vgdata in vgroups.items():
-                if all(v.index in vgdata['verts'] for v in e.verts):
-                    edge_bevelled_edges.append(e.index)
+            for vgdata in vgroups.values():
+                if all(idx in vgdata['verts'] for idx in indices):
+                    edge_bevelled_edges.add(e.index)
 
                     vgdata['edges'].append(e.index)
 
@@ -372,21 +449,36 @@ class Shade(bpy.types.Operator):
 
     def clear_edge_props(self, context, objects):
         mesh_objects = [obj for obj in objects if obj.type == 'MESH']
-        
+
+        self.cleared_meshes = 0
+        self.cleared_counts = {'sharps': 0, 'bweights': 0, 'creases': 0, 'seams': 0}
+
+        if context.mode == 'OBJECT':
+            meshes = {}
+
+            for obj in mesh_objects:
+                has_subd = any(mod.type == 'SUBSURF' and mod.use_creases for mod in obj.modifiers)
+                meshes[obj.data] = meshes.get(obj.data, True) and has_subd and self.avoid_clearing_subd_creases
+
+            for mesh, avoid_creases in meshes.items():
+                cleared = clear_edge_attributes(mesh, sharps=self.clear_sharps, bweights=self.clear_bweights, creases=self.clear_creases and not avoid_creases, seams=self.clear_seams)
+
+                if any(cleared.values()):
+                    self.cleared_meshes += 1
+
+                for key, count in cleared.items():
+                    self.cleared_counts[key] += count
+
+            return
+
         for obj in mesh_objects:
             has_subd = any(mod.type == 'SUBSURF' and mod.use_creases for mod in obj.modifiers)
 
-            if context.mode == 'OBJECT':
-                bm = bmesh.new()
-                bm.from_mesh(obj.data)
-                bm.normal_update()
-
-            else:
-                bm = bmesh.from_edit_mesh(obj.data)
-                bm.normal_update()
+            bm = bmesh.from_edit_mesh(obj.data)
+            bm.normal_update()
 
-                for f in bm.faces:
-                    f.smooth = False
+            for f in bm.faces:
+                f.smooth = False
 
             _, bw, cr = ensure_custom_data_layers(bm)
 
@@ -403,12 +495,7 @@ class Shade(bpy.types.Operator):
                 if self.clear_seams:
                     e.seam = False
 
-            if context.mode == 'OBJECT':
-                bm.to_mesh(obj.data)
-                bm.clear()
-
-            else:
-                bmesh.update_edit_mesh(obj.data)
+            bmesh.update_edit_mesh(obj.data)
 
     def draw_fading_hud(self, context, selected, children, booleans, auto_smooth_count, auto_smooth_instances):
         if context.mode == 'OBJECT':
@@ -453,18 +540,19 @@ class Shade(bpy.types.Operator):
 
             elif self.shade_type == 'FLAT' and self.clear:
                 cleared = []
+                counts = self.cleared_counts
 
                 if self.clear_sharps:
-                    cleared.append('Sharps')
+                    cleared.append(f"{counts['sharps']} Sharps")
 
                 if self.clear_bweights:
-                    cleared.append('BWeights')
+                    cleared.append(f"{counts['bweights']} BWeights")
 
                 if self.clear_creases:
-                    cleared.append('Creases')
+                    cleared.append(f"{counts['creases']} Creases")
 
                 if self.clear_seams:
-                    cleared.append('Seams')
+                    cleared.append(f"{counts['seams']} Seams")
 
                 if cleared:
                     if len(cleared) > 1:
@@ -473,9 +561,9 @@ class Shade(bpy.types.Operator):
                     else:
                         cleared_str = cleared[0]
 
-                    text.append(_("Cleared {} Edges").format(cleared_str))
+                    text.append(_("Cleared {} on {} Meshes").format(cleared_str, self.cleared_meshes))
                     color.append(orange)
-                    color.append(1)
+                    alpha.append(1)
 
             draw_fading_label(context, text, color=color, alpha=alpha, move_y=40, time=3)
 
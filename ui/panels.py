@@ -1,5 +1,6 @@
 import bpy
 from .. utils.registration import get_prefs
+from .. utils.developer import profiler
 from .. utils.group import get_group_base_name, get_group_polls
 from .. utils.ui import get_icon
 from .. import bl_info
@@ -462,6 +463,10 @@ class PanelM4A1tools(bpy.types.Panel):
 
                 s.operator('m4a1.update_group_pose', text='Update', icon='FILE_REFRESH')
 
+                row = b.row(align=True)
+                row.enabled = len(empty.M4.group_pose_COL) > 1
+                row.operator('m4a1.play_group_poses', text='Play Poses', icon='PLAY')
+
         b = box.box()
         b.label(text='Settings')
 
@@ -551,3 +556,54 @@ class PanelM4A1tools(bpy.types.Panel):
 
         column.operator("m4a1.create_assembly_asset", text='Create Assembly Asset', icon='ASSET_MANAGER')
         column.operator("m4a1.assemble_instance_collection", text='Assemble Instance Collection', icon='NETWORK_DRIVE')
+
+class PanelDeveloper(bpy.types.Panel):
+    bl_idname = "M4A1_PT_developer"
+    bl_label = "M4A1 Developer"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "M4A1"
+    bl_order = 30
+    bl_options = {'DEFAULT_CLOSED'}
+
+    @classmethod
+    def poll(cls, context):
+        return get_prefs().show_developer_panel
+
+    def draw(self, context):
+        layout = self.layout
+
+        p = get_prefs()
+
+        row = layout.row(align=True)
+        row.scale_y = 1.25
+        row.prop(p, 'profiling', text='Profiling', toggle=True)
+        row.operator('m4a1.reset_profiler', text='', icon='LOOP_BACK')
+        row.operator('m4a1.dump_profiler', text='', icon='EXPORT')
+
+        stats = profiler.get_stats()
+
+        column = layout.column(align=True)
+
+        if stats:
+            row = column.split(factor=0.4, align=True)
+            row.label(text='Name')
+
+            r = row.row(align=True)
+
+            for label in ['Calls', 'p50 ms', 'p99 ms', 'Total ms']:
+                r.label(text=label)
+
+            for name, stat in list(stats.items())[:15]:
+                row = column.split(factor=0.4, align=True)
+                row.label(text=name)
+
+                r = row.row(align=True)
+                r.label(text=str(stat['count']))
+                r.label(text=f"{stat['p50_ms']:.2f}")
+                r.label(text=f"{stat['p99_ms']:.2f}")
+                r.label(text=f"{stat['total_ms']:.1f}")
+
+        else:
+            column.active = False
+            column.label(text=" No Timings recorded")
@@ -1,7 +1,10 @@
 import bpy
 
-def delay_execution(func, delay=0, persistent=False):
+def delay_execution(func, delay=0, persistent=False, coalesce=False):
     if bpy.app.timers.is_registered(func):
+        if coalesce:
+            return
+
         bpy.app.timers.unregister(func)
 
     bpy.app.timers.register(func, first_interval=delay, persistent=persistent)
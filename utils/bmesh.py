@@ -1,4 +1,5 @@
 import bpy
+import numpy as np
 
 def ensure_custom_data_layers(bm, vertex_groups=True, bevel_weights=True, crease=True):
 
@@ -36,3 +37,90 @@ def get_tri_coords_from_face(loop_triangles, f, mx=None):
         return [mx @ l.vert.co for lt in loop_triangles if lt[0].face == f for l in lt]
     else:
         return [l.vert.co for lt in loop_triangles if lt[0].face == f for l in lt]
+
+class VertSnapshot:
+    debug = False
+
+    def __init__(self, bm, verts=None, debug=False):
+        if debug:
+            self.debug = debug
+
+        self.bm = bm
+        self.capture(verts)
+
+    def log(self, *args, **kwargs):
+        if self.debug:
+            print(*args, **kwargs)
+
+    def capture(self, verts=None):
+        self.bm.verts.index_update()
+
+        self.verts = list(dict.fromkeys(verts)) if verts is not None else list(self.bm.verts)
+        self.positions = {v: idx for idx, v in enumerate(self.verts)}
+
+        self.indices = np.fromiter((v.index for v in self.verts), dtype=np.int32, count=len(self.verts))
+        self.coords = np.array([v.co[:] for v in self.verts], dtype=np.float32).reshape(-1, 3)
+
+        self.dirty = set()
+
+        self.log(f"captured {len(self.verts)} vert coords")
+
+    def get_co(self, v):
+        return self.coords[self.positions[v]]
+
+    def mark(self, verts):
+        positions = self.positions
+        self.dirty.update(positions[v] for v in verts if v in positions)
+
+    def get_positions(self, verts=None, dirty_only=False):
+        if verts is not None:
+            positions = self.positions
+            return sorted(positions[v] for v in verts if v in positions)
+
+        elif dirty_only:
+            return sorted(self.dirty)
+
+        return None
+
+    def restore(self, verts=None, dirty_only=False):
+        positions = self.get_positions(verts, dirty_only)
+
+        if positions is None:
+            for v, co in zip(self.verts, self.coords.tolist()):
+                v.co = co
+
+            self.dirty.clear()
+
+        else:
+            all_verts = self.verts
+
+            for idx, co in zip(positions, self.coords[positions].tolist()):
+                all_verts[idx].co = co
+
+            self.dirty.difference_update(positions)
+
+        self.log(f"restored {len(self.verts) if positions is None else len(positions)} vert coords")
+
+    def restore_mesh(self, mesh, verts=None, dirty_only=False):
+        positions = self.get_positions(verts, dirty_only)
+
+        vert_count = len(mesh.vertices)
+        indices = self.indices if positions is None else self.indices[positions]
+        coords = self.coords if positions is None else self.coords[positions]
+
+        if positions is None and len(indices) == vert_count and np.array_equal(indices, np.arange(vert_count)):
+            mesh.vertices.foreach_set('co', coords.ravel())
+
+        else:
+            buffer = np.empty((vert_count, 3), dtype=np.float32)
+            mesh.vertices.foreach_get('co', buffer.ravel())
+
+            buffer[indices] = coords
+            mesh.vertices.foreach_set('co', buffer.ravel())
+
+        mesh.update()
+
+        if positions is None:
+            self.dirty.clear()
+        else:
+            self.dirty.difference_update(positions)
@@ -2,6 +2,9 @@ import os
 import pkgutil
 import importlib
 import time
+import json
+from functools import wraps
+import numpy as np
 
 chronicle = []
 
@@ -51,3 +54,99 @@ def output_traceback(self):
 
     tb = traceback.format_exc() + "\nPLEASE REPORT THIS ERROR to mesh@machin3.io"
     self.report({'ERROR'}, tb)
+
+class Profiler:
+    def __init__(self, size=512):
+        self.enabled = False
+        self.size = size
+
+        self.timings = {}
+
+    def record(self, name, ns):
+        entry = self.timings.get(name)
+
+        if entry is None:
+            entry = self.timings[name] = [0, 0, 0, np.zeros(self.size, dtype=np.int64)]
+
+        count = entry[0]
+
+        entry[3][count % self.size] = ns
+        entry[0] = count + 1
+        entry[1] += ns
+
+        if ns > entry[2]:
+            entry[2] = ns
+
+    def wrap(self, func, name=None):
+        name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
+
+            start = time.perf_counter_ns()
+
+            try:
+                return func(*args, **kwargs)
+
+            finally:
+                self.record(name, time.perf_counter_ns() - start)
+
+        return wrapper
+
+    def wrap_modal(self, modal, name):
+        @wraps(modal)
+        def wrapper(op, context, event):
+            if not self.enabled:
+                return modal(op, context, event)
+
+            start = time.perf_counter_ns()
+
+            try:
+                return modal(op, context, event)
+
+            finally:
+                self.record(f"{name} {event.type}", time.perf_counter_ns() - start)
+
+        wrapper.is_profiled = True
+        return wrapper
+
+    def get_stats(self, histogram=False):
+        stats = {}
+
+        for name, (count, total, peak, ring) in self.timings.items():
+            samples = ring[:min(count, self.size)]
+            p50, p90, p99 = np.percentile(samples, [50, 90, 99]) / 1e6
+
+            stats[name] = {'count': count,
+                           'total_ms': total / 1e6,
+                           'mean_ms': total / count / 1e6,
+                           'max_ms': peak / 1e6,
+                           'p50_ms': float(p50),
+                           'p90_ms': float(p90),
+                           'p99_ms': float(p99)}
+
+            if histogram:
+                buckets = np.log2(np.maximum(samples / 1000, 1)).astype(np.int64)
+                stats[name]['histogram_us_log2'] = np.bincount(buckets).tolist()
+
+        return dict(sorted(stats.items(), key=lambda item: item[1]['total_ms'], reverse=True))
+
+    def reset(self):
+        self.timings.clear()
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            json.dump({'time': time.strftime('%Y-%m-%d %H:%M:%S'),
+                       'ring_size': self.size,
+                       'timings': self.get_stats(histogram=True)}, f, indent=2)
+
+        return path
+
+profiler = Profiler()
+
+def profile(name=None):
+    def decorator(func):
+        return profiler.wrap(func, name=name)
+    return decorator
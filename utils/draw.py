@@ -2,14 +2,16 @@ import bpy
 from mathutils import Vector, Matrix, Quaternion
 from math import sin, cos, pi
 from typing import Tuple
+import weakref
+import numpy as np
 import gpu
 from gpu_extras.batch import batch_for_shader
 import blf
 from . wm import get_last_operators
 from . registration import get_prefs, get_addon
-from . ui import get_zoom_factor
+from . ui import get_zoom_factors
 from . tools import get_active_tool
-from .. colors import red, green, blue, black, white, orange, normal, yellow
+from .. colors import red, green, blue, black, white, normal
 from bpy.app.translations import pgettext as _
 def get_builtin_shader_name(name, prefix='3D'):
     if bpy.app.version >= (4, 0, 0):
@@ -17,9 +19,102 @@ def get_builtin_shader_name(name, prefix='3D'):
     else:
         return f"{prefix}_{name}"
 
+shaders = {}
+
+def get_shader(name):
+    if name not in shaders:
+        shaders[name] = gpu.shader.from_builtin(name)
+
+    return shaders[name]
+
+class BatchCache:
+    def log(self, *args, **kwargs):
+        if self.debug:
+            print(*args, **kwargs)
+
+    debug = False
+
+    def __init__(self, size=4096, debug=False):
+        self.debug = debug
+        self.size = size
+
+        self.batches = {}
+        self.keyed = {}
+
+    def get(self, shader, type, content, indices=None, key=None):
+        coords = content['pos']
+
+        if key is not None:
+            return self._get_keyed(shader, type, content, indices, key)
+
+        # anonymous batches are only cached for arrays, and only for as long as they live, arrays that are changed in place need an explicit key
+        if not isinstance(coords, np.ndarray) or not (indices is None or isinstance(indices, np.ndarray)):
+            return batch_for_shader(shader, type, content, indices=indices)
+
+        key = (type, id(shader), id(coords), id(indices))
+
+        batch = self.batches.get(key)
+
+        if batch:
+            return batch
+
+        if len(self.batches) >= self.size:
+            del self.batches[next(iter(self.batches))]
+
+        self.log("Creating batch", type, len(coords))
+
+        batch = batch_for_shader(shader, type, content, indices=indices)
+        self.batches[key] = batch
+
+        weakref.finalize(coords, self.batches.pop, key, None)
+
+        if indices is not None:
+            weakref.finalize(indices, self.batches.pop, key, None)
+
+        return batch
+
+    def _get_keyed(self, shader, type, content, indices, key):
+        entry = self.keyed.get(key)
+
+        if entry and entry['type'] == type and entry['shader'] == id(shader):
+            return entry['batch']
+
+        if len(self.keyed) >= self.size:
+            del self.keyed[next(iter(self.keyed))]
+
+        self.log("Creating keyed batch", type, key)
+
+        batch = batch_for_shader(shader, type, content, indices=indices)
+        self.keyed[key] = {'batch': batch, 'type': type, 'shader': id(shader)}
+
+        return batch
+
+    def invalidate(self, key=None):
+        if key is None:
+            self.log("Invalidating all keyed batches")
+            self.keyed.clear()
+
+        elif key in self.keyed:
+            del self.keyed[key]
+
+    def clear(self):
+        self.batches.clear()
+        self.keyed.clear()
+
+batch_cache = BatchCache()
+
+def draw_batch(batch, shader, mx=None):
+    if mx is None or mx == Matrix():
+        batch.draw(shader)
+
+    else:
+        with gpu.matrix.push_pop():
+            gpu.matrix.multiply_matrix(mx)
+            batch.draw(shader)
+
 def draw_point(co, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, modal=True, screen=False):
     def draw():
-        shader = gpu.shader.from_builtin(get_builtin_shader_name('UNIFORM_COLOR'))
+        shader = get_shader(get_builtin_shader_name('UNIFORM_COLOR'))
         shader.bind()
         shader.uniform_float("color", (*color, alpha))
 
@@ -27,8 +122,8 @@ def draw_point(co, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, mod
         gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
         gpu.state.point_size_set(size)
 
-        batch = batch_for_shader(shader, 'POINTS', {"pos": [mx @ co]})
-        batch.draw(shader)
+        batch = batch_for_shader(shader, 'POINTS', {"pos": [co]})
+        draw_batch(batch, shader, mx)
 
     if modal:
         draw()
@@ -41,7 +136,7 @@ def draw_point(co, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, mod
 
 def draw_points(coords, indices=None, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, modal=True, screen=False):
     def draw():
-        shader = gpu.shader.from_builtin(get_builtin_shader_name('UNIFORM_COLOR'))
+        shader = get_shader(get_builtin_shader_name('UNIFORM_COLOR'))
         shader.bind()
         shader.uniform_float("color", (*color, alpha))
 
@@ -49,19 +144,12 @@ def draw_points(coords, indices=None, mx=Matrix(), color=(1, 1, 1), size=6, alph
         gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
         gpu.state.point_size_set(size)
 
-        if indices:
-            if mx != Matrix():
-                batch = batch_for_shader(shader, 'POINTS', {"pos": [mx @ co for co in coords]}, indices=indices)
-            else:
-                batch = batch_for_shader(shader, 'POINTS', {"pos": coords}, indices=indices)
-
+        if indices is not None and len(indices):
+            batch = batch_cache.get(shader, 'POINTS', {"pos": coords}, indices=indices)
         else:
-            if mx != Matrix():
-                batch = batch_for_shader(shader, 'POINTS', {"pos": [mx @ co for co in coords]})
-            else:
-                batch = batch_for_shader(shader, 'POINTS', {"pos": coords})
+            batch = batch_cache.get(shader, 'POINTS', {"pos": coords})
 
-        batch.draw(shader)
+        draw_batch(batch, shader, mx)
 
     if modal:
         draw()
@@ -82,14 +170,14 @@ def draw_line(coords, indices=None, mx=Matrix(), color=(1, 1, 1), alpha=1, width
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA')
 
-        shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
+        shader = get_shader('POLYLINE_UNIFORM_COLOR')
         shader.uniform_float("color", (*color, alpha))
         shader.uniform_float("lineWidth", width)
         shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
         shader.bind()
 
-        batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
-        batch.draw(shader)
+        batch = batch_cache.get(shader, 'LINES', {"pos": coords}, indices=indices)
+        draw_batch(batch, shader, mx)
 
     if modal:
         draw()
@@ -100,24 +188,24 @@ def draw_line(coords, indices=None, mx=Matrix(), color=(1, 1, 1), alpha=1, width
     else:
         bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
 
-def draw_lines(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True, screen=False):
+def draw_lines(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True, screen=False, key=None):
     def draw():
         nonlocal indices
 
-        if not indices:
+        if indices is None or not len(indices):
             indices = [(i, i + 1) for i in range(0, len(coords), 2)]
 
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA')
 
-        shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
+        shader = get_shader('POLYLINE_UNIFORM_COLOR')
         shader.uniform_float("color", (*color, alpha))
         shader.uniform_float("lineWidth", width)
         shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
         shader.bind()
 
-        batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
-        batch.draw(shader)
+        batch = batch_cache.get(shader, 'LINES', {"pos": coords}, indices=indices, key=key)
+        draw_batch(batch, shader, mx)
 
     if modal:
         draw()
@@ -133,20 +221,20 @@ def draw_vector(vector, origin=Vector((0, 0, 0)), mx=Matrix(), color=(1, 1, 1),
         if normal:
             coords = [mx @ origin, mx @ origin + get_world_space_normal(vector, mx)]
         else:
-            coords = [mx @ origin, mx @ origin + mx.to_3x3() @ vector]
+            coords = [origin, origin + vector]
 
         colors = ((*color, alpha), (*color, alpha / 10 if fade else alpha))
 
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA')
 
-        shader = gpu.shader.from_builtin('POLYLINE_SMOOTH_COLOR')
+        shader = get_shader('POLYLINE_SMOOTH_COLOR')
         shader.uniform_float("lineWidth", width)
         shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
         shader.bind()
 
         batch = batch_for_shader(shader, 'LINES', {"pos": coords, "color": colors})
-        batch.draw(shader)
+        draw_batch(batch, shader, None if normal else mx)
 
     if modal:
         draw()
@@ -163,12 +251,12 @@ def draw_vectors(vectors, origins, mx=Matrix(), color=(1, 1, 1), width=1, alpha=
         colors = []
 
         for v, o in zip(vectors, origins):
-            coords.append(mx @ o)
-
             if normal:
+                coords.append(mx @ o)
                 coords.append(mx @ o + get_world_space_normal(v, mx))
             else:
-                coords.append(mx @ o + mx.to_3x3() @ v)
+                coords.append(o)
+                coords.append(o + v)
 
             colors.extend([(*color, alpha), (*color, alpha / 10 if fade else alpha)])
 
@@ -177,13 +265,13 @@ def draw_vectors(vectors, origins, mx=Matrix(), color=(1, 1, 1), width=1, alpha=
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA')
 
-        shader = gpu.shader.from_builtin('POLYLINE_SMOOTH_COLOR')
+        shader = get_shader('POLYLINE_SMOOTH_COLOR')
         shader.uniform_float("lineWidth", width)
         shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
         shader.bind()
 
         batch = batch_for_shader(shader, 'LINES', {"pos": coords, "color": colors})
-        batch.draw(shader)
+        draw_batch(batch, shader, None if normal else mx)
 
     if modal:
         draw()
@@ -220,22 +308,20 @@ def draw_circle(loc=Vector(), rot=Quaternion(), radius=100, segments='AUTO', wid
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA')
 
-        shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
+        shader = get_shader('POLYLINE_UNIFORM_COLOR')
         shader.uniform_float("color", (*color, alpha))
         shader.uniform_float("lineWidth", width)
         shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
         shader.bind()
 
         if len(loc) == 2:
-            mx = Matrix()
-            mx.col[3] = loc.resized(4)
-            batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
+            mx = Matrix.Translation(loc.resized(3))
 
         else:
             mx = Matrix.LocRotScale(loc, rot, Vector.Fill(3, 1))
-            batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
 
-        batch.draw(shader)
+        batch = batch_for_shader(shader, 'LINES', {"pos": coords}, indices=indices)
+        draw_batch(batch, shader, mx)
 
     if modal:
         draw()
@@ -261,14 +347,14 @@ def draw_cross_3d(co, mx=Matrix(), color=(1, 1, 1), width=1, length=1, alpha=1,
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA')
 
-        shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
+        shader = get_shader('POLYLINE_UNIFORM_COLOR')
         shader.uniform_float("color", (*color, alpha))
         shader.uniform_float("lineWidth", width)
         shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
         shader.bind()
 
-        batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
-        batch.draw(shader)
+        batch = batch_cache.get(shader, 'LINES', {"pos": coords}, indices=indices)
+        draw_batch(batch, shader, mx)
 
     if modal:
         draw()
@@ -279,20 +365,15 @@ def draw_cross_3d(co, mx=Matrix(), color=(1, 1, 1), width=1, length=1, alpha=1,
 def draw_tris(coords, indices=None, mx=Matrix(), color=(1, 1, 1), alpha=1, xray=True, modal=True):
     def draw():
 
-        shader = gpu.shader.from_builtin(get_builtin_shader_name('UNIFORM_COLOR'))
+        shader = get_shader(get_builtin_shader_name('UNIFORM_COLOR'))
         shader.bind()
         shader.uniform_float("color", (*color, alpha))
 
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
 
-        if mx != Matrix():
-            batch = batch_for_shader(shader, 'TRIS', {"pos": [mx @ co for co in coords]}, indices=indices)
-
-        else:
-            batch = batch_for_shader(shader, 'TRIS', {"pos": coords}, indices=indices)
-
-        batch.draw(shader)
+        batch = batch_cache.get(shader, 'TRIS', {"pos": coords}, indices=indices)
+        draw_batch(batch, shader, mx)
 
     if modal:
         draw()
@@ -300,7 +381,7 @@ def draw_tris(coords, indices=None, mx=Matrix(), color=(1, 1, 1), alpha=1, xray=
     else:
         bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
 
-def draw_mesh_wire(batch, color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True):
+def draw_mesh_wire(batch, mx=None, color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True, key=None):
     def draw():
         nonlocal batch
         coords, indices = batch
@@ -308,17 +389,14 @@ def draw_mesh_wire(batch, color=(1, 1, 1), width=1, alpha=1, xray=True, modal=Tr
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA')
 
-        shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
+        shader = get_shader('POLYLINE_UNIFORM_COLOR')
         shader.uniform_float("color", (*color, alpha))
         shader.uniform_float("lineWidth", width)
         shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
         shader.bind()
 
-        b = batch_for_shader(shader, 'LINES', {"pos": coords}, indices=indices)
-        b.draw(shader)
-
-        del shader
-        del b
+        b = batch_cache.get(shader, 'LINES', {"pos": coords}, indices=indices, key=key)
+        draw_batch(b, shader, mx)
 
     if modal:
         draw()
@@ -358,14 +436,14 @@ def draw_bbox(bbox, mx=Matrix(), color=(1, 1, 1), corners=0, width=1, alpha=1, x
         gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
         gpu.state.blend_set('ALPHA')
 
-        shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
+        shader = get_shader('POLYLINE_UNIFORM_COLOR')
         shader.uniform_float("color", (*color, alpha))
         shader.uniform_float("lineWidth", width)
         shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
         shader.bind()
 
-        batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
-        batch.draw(shader)
+        batch = batch_cache.get(shader, 'LINES', {"pos": coords}, indices=indices)
+        draw_batch(batch, shader, mx)
 
     if modal:
         draw()
@@ -377,6 +455,20 @@ def draw_init(self, event):
     self.font_id = 1
     self.offset = 0
 
+text_dimensions = {}
+
+def get_blf_dimensions(font, text, size):
+    key = (text, font, size)
+
+    if key not in text_dimensions:
+        if len(text_dimensions) >= 4096:
+            text_dimensions.clear()
+
+        blf.size(font, size)
+        text_dimensions[key] = blf.dimensions(font, text)
+
+    return text_dimensions[key]
+
 def get_text_dimensions(context, text='', size=12):
     scale = context.preferences.system.ui_scale * get_prefs().modal_hud_scale
 
@@ -384,7 +476,7 @@ def get_text_dimensions(context, text='', size=12):
     fontsize = int(size * scale)
 
     blf.size(font, fontsize)
-    return blf.dimensions(font, text)
+    return get_blf_dimensions(font, text, fontsize)
 
 def update_HUD_location(self, event, offsetx=20, offsety=20):
     self.HUD_x = event.mouse_x - self.region_offset_x + offsetx
@@ -406,8 +498,9 @@ def draw_label(context, title='', coords=None, offset=0, center=True, size=12, c
     blf.size(font, fontsize)
     blf.color(font, *color, alpha)
 
+    dims = get_blf_dimensions(font, title, fontsize)
+
     if center:
-        dims = blf.dimensions(font, title)
         blf.position(font, width - (dims[0] / 2), height - (offset * scale), 1)
 
     else:
@@ -415,7 +508,7 @@ def draw_label(context, title='', coords=None, offset=0, center=True, size=12, c
 
     blf.draw(font, title)
 
-    return blf.dimensions(font, title)
+    return dims
 
 def draw_fading_label(context, text='', x=None, y=100, gap=18, center=True, size=12, color=(1, 1, 1), alpha=1, move_y=0, time=5, delay=1, cancel=''):
     scale = context.preferences.system.ui_scale * get_prefs().modal_hud_scale
@@ -461,13 +554,61 @@ def draw_split_row(self, layout, prop='prop', text='', label='Label', factor=0.2
 
 hypercursor = None
 
-def draw_axes_HUD(context, objects):
-    global hypercursor
-    
-    if hypercursor is None:
-        hypercursor = get_addon('HyperCursor')[0]
+class AxesHUD:
+    def log(self, *args, **kwargs):
+        if self.debug:
+            print(*args, **kwargs)
+
+    debug = False
+
+    def __init__(self, debug=False):
+        self.debug = debug
+
+        self.objects = None
+        self.matrices = np.empty((0, 4, 4))
+        self.is_dirty = True
+
+    def invalidate(self):
+        self.is_dirty = True
+
+    def sync(self, objects):
+        if objects is not self.objects:
+            self.objects = objects
+            self.is_dirty = True
+
+        if self.is_dirty:
+            matrices = []
+
+            for obj in objects:
+                if obj != 'CURSOR':
+                    try:
+                        matrices.append(obj.matrix_world)
+
+                    except ReferenceError:
+                        pass
+
+            self.log(f"Gathering {len(matrices)} axes matrices")
+
+            self.matrices = np.array(matrices, dtype=np.float64).reshape(-1, 4, 4)
+            self.is_dirty = False
+
+    def get_coords(self, matrices, factors, segments):
+        origins = matrices[:, :3, 3]
+
+        axes = matrices[:, :3, :3].transpose(0, 2, 1)
+        lengths = np.linalg.norm(axes, axis=2, keepdims=True)
+        axes = np.divide(axes, lengths, out=np.zeros_like(axes), where=lengths > 0)
+
+        coords = []
+
+        for start, end in segments:
+            coords.append(origins[:, None, None] + axes[:, :, None] * (factors[:, None, None, None] * np.array((start, end))[None, None, :, None]))
+
+        return np.concatenate(coords, axis=1).reshape(-1, 3)
+
+    def draw(self, context, objects):
+        self.sync(objects)
 
-    if context.space_data.overlay.show_overlays:
         m3 = context.scene.M4
 
         size = m3.draw_axes_size
@@ -479,57 +620,50 @@ def draw_axes_HUD(context, objects):
         show_cursor = context.space_data.overlay.show_cursor
         show_hyper_cursor = hypercursor and get_active_tool(context).idname in ['m4a1.tool_hyper_cursor', 'm4a1.tool_hyper_cursor_simple'] and context.scene.HC.show_gizmos
 
-        axes = [(Vector((1, 0, 0)), red), (Vector((0, 1, 0)), green), (Vector((0, 0, 1)), blue)]
-
-        for axis, color in axes:
-            coords = []
-
-            for obj in objects:
+        coords = []
 
-                if obj == 'CURSOR':
+        if len(self.matrices):
+            factors = get_zoom_factors(context, self.matrices[:, :3, 3], scale=300) if screenspace else np.ones(len(self.matrices))
+            coords.append(self.get_coords(self.matrices, factors * size * scale, [(0.1, 1)]))
 
-                    if not show_hyper_cursor:
-                        mx = context.scene.cursor.matrix
-                        rot = mx.to_quaternion()
-                        origin = mx.to_translation()
+        if 'CURSOR' in objects and not show_hyper_cursor:
+            matrices = np.array([context.scene.cursor.matrix], dtype=np.float64)
+            factors = get_zoom_factors(context, matrices[:, :3, 3], scale=300) if screenspace else np.ones(1)
 
-                        factor = get_zoom_factor(context, origin, scale=300, ignore_obj_scale=True) if screenspace else 1
+            if show_cursor and screenspace:
+                coords.append(self.get_coords(matrices, factors * 0.1 * scale, [(0.8, 1.2)]))
 
-                        if show_cursor and screenspace:
-                            coords.append(origin + (rot @ axis).normalized() * 0.1 * scale * factor * 0.8)
-                            coords.append(origin + (rot @ axis).normalized() * 0.1 * scale * factor * 1.2)
+            else:
+                coords.append(self.get_coords(matrices, factors * size * scale, [(0.9, 1), (0.1, 0.7)]))
 
-                        else:
-                            coords.append(origin + (rot @ axis).normalized() * size * scale * factor * 0.9)
-                            coords.append(origin + (rot @ axis).normalized() * size * scale * factor)
+        if coords:
+            coords = np.float32(np.concatenate(coords))
 
-                            coords.append(origin + (rot @ axis).normalized() * size * scale * factor * 0.1)
-                            coords.append(origin + (rot @ axis).normalized() * size * scale * factor * 0.7)
+            # each block of 2 coords is one segment, cycling through the x, y and z axes
+            axis_colors = np.array([(*red, alpha), (*green, alpha), (*blue, alpha)], dtype=np.float32)
+            colors = np.repeat(np.tile(axis_colors, (len(coords) // 6, 1)), 2, axis=0)
 
-                elif str(obj) != '<bpy_struct, Object invalid>':
-                    mx = obj.matrix_world
-                    rot = mx.to_quaternion()
-                    origin = mx.to_translation()
+            gpu.state.depth_test_set('NONE')
+            gpu.state.blend_set('ALPHA')
 
-                    factor = get_zoom_factor(context, origin, scale=300, ignore_obj_scale=True) if screenspace else 1
+            shader = get_shader('POLYLINE_SMOOTH_COLOR')
+            shader.uniform_float("lineWidth", 2)
+            shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
+            shader.bind()
 
-                    coords.append(origin + (rot @ axis).normalized() * size * scale * factor * 0.1)
-                    coords.append(origin + (rot @ axis).normalized() * size * scale * factor)
+            batch = batch_for_shader(shader, 'LINES', {"pos": coords, "color": colors})
+            batch.draw(shader)
 
-            if coords:
-                indices = [(i, i + 1) for i in range(0, len(coords), 2)]
+axes_hud = AxesHUD()
 
-                gpu.state.depth_test_set('NONE')
-                gpu.state.blend_set('ALPHA')
+def draw_axes_HUD(context, objects):
+    global hypercursor
 
-                shader = gpu.shader.from_builtin('POLYLINE_UNIFORM_COLOR')
-                shader.uniform_float("color", (*color, alpha))
-                shader.uniform_float("lineWidth", 2)
-                shader.uniform_float("viewportSize", gpu.state.scissor_get()[2:])
-                shader.bind()
+    if hypercursor is None:
+        hypercursor = get_addon('HyperCursor')[0]
 
-                batch = batch_for_shader(shader, 'LINES', {"pos": coords}, indices=indices)
-                batch.draw(shader)
+    if context.space_data.overlay.show_overlays:
+        axes_hud.draw(context, objects)
 
 def draw_focus_HUD(context, color=(1, 1, 1), alpha=1, width=2):
     if context.space_data.overlay.show_overlays:
@@ -547,7 +681,7 @@ def draw_focus_HUD(context, color=(1, 1, 1), alpha=1, width=2):
             coords = [(width, width), (region.width - width, width), (region.width - width, region.height - width), (width, region.height - width)]
             indices =[(0, 1), (1, 2), (2, 3), (3, 0)]
 
-            shader = gpu.shader.from_builtin(get_builtin_shader_name('UNIFORM_COLOR', '2D'))
+            shader = get_shader(get_builtin_shader_name('UNIFORM_COLOR', '2D'))
             shader.bind()
             shader.uniform_float("color", (*color, alpha / 4))
 
@@ -616,6 +750,56 @@ def draw_surface_slide_HUD(context, color=(1, 1, 1), alpha=1, width=2):
 
         blf.draw(font, text)
 
+screencast_layout = {'key': None, 'entries': [], 'addon_offset_x': 0}
+
+def get_screen_cast_layout(context, p, scale):
+    wm_operators = context.window_manager.operators
+
+    key = (len(wm_operators), wm_operators[-1].as_pointer() if wm_operators else None, p.screencast_operator_count, p.screencast_fontsize, scale, p.screencast_show_addon, p.screencast_show_idname, p.screencast_highlight_m4a1)
+
+    if key == screencast_layout['key']:
+        return screencast_layout
+
+    operators = get_last_operators(context, debug=False)[-p.screencast_operator_count:]
+
+    font = 0
+    emphasize = 1.25
+
+    entries = []
+
+    y = 0
+    prev_size = None
+
+    for idx, (addon, label, idname, prop) in enumerate(reversed(operators)):
+        size = round(p.screencast_fontsize * scale * (emphasize if idx == 0 else 1))
+        vgap = round(size / 2)
+
+        text = f"{label}: {prop}" if prop else label
+
+        if idx:
+            y += get_blf_dimensions(font, text, prev_size)[1] + vgap
+
+        entries.append({'text': text,
+                        'idname': idname,
+                        'addon': addon,
+                        'size': size,
+                        'y': y,
+                        'color': green if idname.startswith('m4a1.') and p.screencast_highlight_m4a1 else white,
+                        'alpha': (len(operators) - idx) / len(operators),
+                        'text_width': get_blf_dimensions(font, text, size)[0],
+                        'addon_width': get_blf_dimensions(font, addon, size)[0] if addon else 0})
+
+        if idx == 0:
+            y += get_blf_dimensions(font, text, size)[1]
+
+        prev_size = size
+
+    screencast_layout['key'] = key
+    screencast_layout['entries'] = entries
+    screencast_layout['addon_offset_x'] = get_blf_dimensions(font, 'MM', round(p.screencast_fontsize * scale * emphasize))[0] if p.screencast_show_addon else 0
+
+    return screencast_layout
+
 def draw_screen_cast_HUD(context):
     bprefs = context.preferences
 
@@ -623,11 +807,12 @@ def draw_screen_cast_HUD(context):
     header_alpha = bprefs.themes['Default'].view_3d.space.header[3]
 
     p = get_prefs()
-    operators = get_last_operators(context, debug=False)[-p.screencast_operator_count:]
 
     font = 0
     scale = context.preferences.system.ui_scale * get_prefs().modal_hud_scale
 
+    layout = get_screen_cast_layout(context, p, scale)
+
     tools = [r for r in context.area.regions if r.type == 'TOOLS']
     offset_x = tools[0].width if tools else 0
 
@@ -649,23 +834,13 @@ def draw_screen_cast_HUD(context):
         if bottom_tool_header:
             offset_y += bottom_tool_header[0].height
 
-    emphasize = 1.25
-
-    if p.screencast_show_addon:
-        blf.size(font, round(p.screencast_fontsize * scale * emphasize))
-        addon_offset_x = blf.dimensions(font, 'MM')[0]
-    else:
-        addon_offset_x = 0
-
-    y = 0
+    addon_offset_x = layout['addon_offset_x']
     hgap = 10
 
-    for idx, (addon, label, idname, prop) in enumerate(reversed(operators)):
-        size = round(p.screencast_fontsize * scale * (emphasize if idx == 0 else 1))
-        vgap = round(size / 2)
-
-        color = green if idname.startswith('m4a1.') and p.screencast_highlight_m4a1 else white
-        alpha = (len(operators) - idx) / len(operators)
+    for idx, entry in enumerate(layout['entries']):
+        size = entry['size']
+        color = entry['color']
+        alpha = entry['alpha']
 
         if idx == 0:
             blf.enable(font, blf.SHADOW)
@@ -673,52 +848,40 @@ def draw_screen_cast_HUD(context):
             blf.shadow_offset(font, 3, -3)
             blf.shadow(font, 5, *black, 1.0)
 
-        text = f"{label}: {prop}" if prop else label
-
         x = offset_x + addon_offset_x
-        y = offset_y if idx == 0 else y + (blf.dimensions(font, text)[1] + vgap)
+        y = offset_y + entry['y']
 
         blf.size(font, size)
         blf.color(font, *color, alpha)
         blf.position(font, x, y, 0)
 
-        blf.draw(font, text)
+        blf.draw(font, entry['text'])
 
         if p.screencast_show_idname:
-            x += blf.dimensions(font, text)[0] + hgap
+            x += entry['text_width'] + hgap
 
             blf.size(font, size - 2)
             blf.color(font, *color, alpha * 0.3)
             blf.position(font, x, y, 0)
 
-            blf.draw(font, f"{idname}")
+            blf.draw(font, f"{entry['idname']}")
 
             blf.size(font, size)
 
         if idx == 0:
             blf.disable(font, blf.SHADOW)
 
-        if addon and p.screencast_show_addon:
-            blf.size(font, size)
-
-            x = offset_x + addon_offset_x - blf.dimensions(font, addon)[0] - (hgap / 2)
+        if entry['addon'] and p.screencast_show_addon:
+            x = offset_x + addon_offset_x - entry['addon_width'] - (hgap / 2)
 
             blf.color(font, *white, alpha * 0.3)
             blf.position(font, x, y, 0)
 
-            blf.draw(font, addon)
-
-        if idx == 0:
-            y += blf.dimensions(font, text)[1]
-
-def draw_group_poses_VIEW3D(pose, batches, alpha):
-    color = orange if pose.batch and pose.batchlinked else green if pose.name == 'Inception' else yellow if pose.name == 'LegacyPose' else blue
+            blf.draw(font, entry['addon'])
 
-    for batch in batches:
+def draw_group_poses_VIEW3D(preview):
+    if preview.coords is not None:
+        draw_mesh_wire((preview.coords, preview.indices), mx=preview.mx, color=preview.color, alpha=preview.alpha, key=preview.mesh_key)
 
-        if isinstance(batch[0], Matrix):
-            mx, length = batch
-            draw_cross_3d(Vector(), mx=mx, length=length, color=normal)
-
-        else:
-            draw_mesh_wire(batch, color=color, alpha=alpha)
+    if preview.empty_coords is not None:
+        draw_lines(preview.empty_coords, indices=preview.empty_indices, mx=preview.mx, color=normal, key=preview.empty_key)
@@ -1,75 +1,237 @@
-import sys
+from heapq import heappush, heappop
+from math import inf, dist
+import numpy as np
 
-def build_mesh_graph(verts, edges, topo=True):
-    mg = {}
-    for v in verts:
-        mg[v] = []
+graphs = {}
+mesh_graphs = {}
 
-    for e in edges:
-        distance = 1 if topo else e.calc_length()
+class MeshGraph:
+    def __init__(self, vert_count, edges):
+        self.vert_count = vert_count
+        self.edge_count = len(edges)
 
-        mg[e.verts[0]].append((e.verts[1], distance))
-        mg[e.verts[1]].append((e.verts[0], distance))
+        src = np.concatenate((edges[:, 0], edges[:, 1]))
+        dst = np.concatenate((edges[:, 1], edges[:, 0]))
 
-    return mg
+        self.order = np.argsort(src, kind='stable')
 
-def get_shortest_path(bm, vstart, vend, topo=False, ignore_selected=False, select=False):
-    def dijkstra(mg, vstart, vend, topo=True):
-        d = dict.fromkeys(mg.keys(), sys.maxsize)
+        self.src = src[self.order]
+        self.dst = dst[self.order]
 
-        predecessor = dict.fromkeys(mg.keys())
+        offsets = np.zeros(vert_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=vert_count), out=offsets[1:])
 
-        d[vstart] = 0
+        self.offsets = offsets.tolist()
+        self.neighbors = self.dst.tolist()
 
-        unknownverts = [(0, vstart)]
+    def get_weights(self, coords):
+        return np.linalg.norm(coords[self.src] - coords[self.dst], axis=1).tolist()
 
-        while unknownverts:
+def get_mesh_arrays(bm):
+    bm.verts.index_update()
 
-            dist, vcurrent = unknownverts[0]
+    coords = np.array([v.co for v in bm.verts], dtype=np.float32).reshape(-1, 3)
+    edges = np.array([v.index for e in bm.edges for v in e.verts], dtype=np.int32).reshape(-1, 2)
 
-            others = mg[vcurrent]
+    return coords, edges
 
-            if ignore_selected and vcurrent == vstart and vend in [v for v, _ in others]:
-                others = [(v, d) for v, d in others if v != vend]
+def get_mesh_data(bm, obj=None):
+    if not obj or obj.type != 'MESH':
+        coords, edges = get_mesh_arrays(bm)
+        return {'coords': coords, 'graph': get_mesh_graph(len(coords), edges), 'weights': None, 'coords_list': None}
 
-            for vother, distance in others:
+    key = obj.data.as_pointer()
+    counts = (len(bm.verts), len(bm.edges), len(bm.faces))
 
-                if ignore_selected and vother not in [vstart, vend] and vother.select:
-                    continue
+    entry = mesh_graphs.get(key)
 
-                if d[vother] > d[vcurrent] + distance:
-                    d[vother] = d[vcurrent] + distance
+    if entry and entry['counts'] == counts and not entry['outdated']:
+        return entry
 
-                    unknownverts.append((d[vother], vother))
-                    predecessor[vother] = vcurrent
+    coords, edges = get_mesh_arrays(bm)
 
-            unknownverts.pop(0)
+    if entry and np.array_equal(entry['edges'], edges):
+        graph = entry['graph']
 
-            if topo and vcurrent == vend:
-                break
+    else:
+        graph = MeshGraph(len(coords), edges)
 
-        path = []
-        endvert = vend
+    if len(mesh_graphs) >= 4 and key not in mesh_graphs:
+        del mesh_graphs[next(iter(mesh_graphs))]
 
-        while endvert is not None:
-            path.append(endvert)
-            endvert = predecessor[endvert]
+    mesh_graphs[key] = entry = {'counts': counts,
+                                'outdated': False,
+                                'coords': coords,
+                                'edges': edges,
+                                'graph': graph,
+                                'weights': None,
+                                'coords_list': None}
 
-        return reversed(path)
+    return entry
 
-    def f7(seq):
-        seen = set()
-        seen_add = seen.add
-        return [x for x in seq if not (x in seen or seen_add(x))]
+def invalidate_mesh_graphs(mesh=None):
+    if mesh is None:
+        mesh_graphs.clear()
 
-    verts = [v for v in bm.verts]
-    edges = [e for e in bm.edges]
+    elif entry := mesh_graphs.get(mesh.as_pointer()):
+        entry['outdated'] = True
 
-    mg = build_mesh_graph(verts, edges, topo)
+def get_mesh_graph(vert_count, edges):
+    key = (vert_count, len(edges), hash(edges.tobytes()))
 
-    path = dijkstra(mg, vstart, vend, topo)
+    if key not in graphs:
+        if len(graphs) >= 4:
+            del graphs[next(iter(graphs))]
 
-    path = f7(path)
+        graphs[key] = MeshGraph(vert_count, edges)
+
+    return graphs[key]
+
+def get_path_dijkstra(graph, start, end, weights=None, blocked=None, blocked_edge=None, heuristic=None):
+    offsets = graph.offsets
+    neighbors = graph.neighbors
+
+    distances = {start: 0}
+    predecessor = {start: None}
+    done = set()
+
+    heap = [(heuristic(start) if heuristic else 0, 0, start)]
+
+    while heap:
+        _, dist, current = heappop(heap)
+
+        if current in done:
+            continue
+
+        if current == end:
+            break
+
+        done.add(current)
+
+        for i in range(offsets[current], offsets[current + 1]):
+            other = neighbors[i]
+
+            if other in done or (blocked and other in blocked) or (blocked_edge and (current, other) in blocked_edge):
+                continue
+
+            d = dist + (weights[i] if weights else 1)
+
+            if d < distances.get(other, inf):
+                distances[other] = d
+                predecessor[other] = current
+
+                heappush(heap, (d + heuristic(other) if heuristic else d, d, other))
+
+    if end not in predecessor:
+        return [end]
+
+    path = []
+    current = end
+
+    while current is not None:
+        path.append(current)
+        current = predecessor[current]
+
+    return path[::-1]
+
+def get_path_bidirectional(graph, start, end, weights=None, blocked=None, blocked_edge=None):
+    if start == end:
+        return [start]
+
+    offsets = graph.offsets
+    neighbors = graph.neighbors
+
+    distances = [{start: 0}, {end: 0}]
+    predecessors = [{start: None}, {end: None}]
+    done = [set(), set()]
+    heaps = [[(0, start)], [(0, end)]]
+
+    best = inf
+    meet = None
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        dist, current = heappop(heaps[side])
+
+        if current in done[side]:
+            continue
+
+        done[side].add(current)
+
+        for i in range(offsets[current], offsets[current + 1]):
+            other = neighbors[i]
+
+            if (blocked and other in blocked) or (blocked_edge and (current, other) in blocked_edge):
+                continue
+
+            d = dist + (weights[i] if weights else 1)
+
+            if d < distances[side].get(other, inf):
+                distances[side][other] = d
+                predecessors[side][other] = current
+
+                heappush(heaps[side], (d, other))
+
+            if other in distances[1 - side] and d + distances[1 - side][other] < best:
+                best = d + distances[1 - side][other]
+                meet = other
+
+    if meet is None:
+        return [end]
+
+    path = []
+    current = meet
+
+    while current is not None:
+        path.append(current)
+        current = predecessors[0][current]
+
+    path.reverse()
+
+    current = predecessors[1][meet]
+
+    while current is not None:
+        path.append(current)
+        current = predecessors[1][current]
+
+    return path
+
+def get_shortest_path(bm, vstart, vend, topo=False, ignore_selected=False, select=False, obj=None):
+    data = get_mesh_data(bm, obj=obj)
+    graph = data['graph']
+
+    bm.verts.index_update()
+    bm.verts.ensure_lookup_table()
+
+    start = vstart.index
+    end = vend.index
+
+    blocked = None
+    blocked_edge = None
+
+    if ignore_selected:
+        blocked = {v.index for v in bm.verts if v.select} - {start, end}
+        blocked_edge = {(start, end), (end, start)}
+
+    if topo:
+        indices = get_path_bidirectional(graph, start, end, blocked=blocked, blocked_edge=blocked_edge)
+
+    else:
+        if data['weights'] is None:
+            data['weights'] = graph.get_weights(data['coords'])
+
+        if data['coords_list'] is None:
+            data['coords_list'] = data['coords'].tolist()
+
+        coords = data['coords_list']
+        end_co = coords[end]
+
+        indices = get_path_dijkstra(graph, start, end, weights=data['weights'], blocked=blocked, blocked_edge=blocked_edge, heuristic=lambda idx: dist(coords[idx], end_co))
+
+    path = [bm.verts[idx] for idx in indices]
 
     if select:
         for v in path:
@@ -3,10 +3,12 @@ import re
 from math import degrees
 from mathutils import Vector, Quaternion, Matrix
 from uuid import uuid4
-from . object import parent, unparent
+from . object import parent, unparent, visible_index
 from . math import average_locations, get_loc_matrix, get_rot_matrix
 from . mesh import get_coords
 from . import registration as r
+from .. colors import blue, green, orange, yellow
+import numpy as np
 from bpy.app.translations import pgettext as _
 def group(context, sel, location='AVERAGE', rotation='WORLD'):
     col = get_group_collection(context, sel)
@@ -32,6 +34,8 @@ def group(context, sel, location='AVERAGE', rotation='WORLD'):
 
     set_group_pose(empty, name=_('Inception'))
 
+    group_index.invalidate()
+
     return empty
 
 def ungroup(empty):
@@ -41,6 +45,8 @@ def ungroup(empty):
 
     bpy.data.objects.remove(empty, do_unlink=True)
 
+    group_index.invalidate()
+
 def clean_up_groups(context):
     top_empties = []
 
@@ -71,27 +77,49 @@ def clean_up_groups(context):
             obj.M4.is_group_object = True
             print(f"INFO: {obj.name} is now a group object, because it was manually parented to {obj.parent.name}")
 
+    group_index.invalidate()
+
     for empty in top_empties:
         propagate_pose_preview_alpha(empty)
 
     return top_empties
 
 def get_group_polls(context):
-    active_group = active if (active := context.active_object) and active.M4.is_group_empty and active.select_get() else None
-    active_child = active if (active := context.active_object) and active.parent and active.M4.is_group_object and active.select_get() else None
+    active = context.active_object
+
+    active_group = active if active and active.M4.is_group_empty and active.select_get() else None
+    active_child = active if active and active.parent and active.M4.is_group_object and active.select_get() else None
+
+    target = active_group if active_group else active_child.parent if active_child else None
+
+    group_empties = visible_index.has_group_empties(context)
+    groupable = ungroupable = addable = removable = selectable = duplicatable = groupifyable = False
+
+    for obj in context.selected_objects:
+        parent_obj = obj.parent
+        is_group = obj.M4.is_group_empty
+
+        if not parent_obj or parent_obj.M4.is_group_empty:
+            groupable = True
 
-    group_empties = bool([obj for obj in context.visible_objects if obj.M4.is_group_empty])
-    groupable = bool([obj for obj in context.selected_objects if (obj.parent and obj.parent.M4.is_group_empty) or not obj.parent])
-    ungroupable = bool([obj for obj in context.selected_objects if obj.M4.is_group_empty]) if group_empties else False
+        if is_group:
+            ungroupable = selectable = duplicatable = True
 
-    addable = bool([obj for obj in context.selected_objects if obj != (active_group if active_group else active_child.parent) and obj not in (active_group.children if active_group else active_child.parent.children) and (not obj.parent or (obj.parent and obj.parent.M4.is_group_empty and not obj.parent.select_get()))]) if active_group or active_child else False
+        if obj.M4.is_group_object:
+            removable = selectable = True
 
-    removable = bool([obj for obj in context.selected_objects if obj.M4.is_group_object])
-    selectable = bool([obj for obj in context.selected_objects if obj.M4.is_group_empty or obj.M4.is_group_object])
-    duplicatable = bool([obj for obj in context.selected_objects if obj.M4.is_group_empty])
-    groupifyable = bool([obj for obj in context.selected_objects if obj.type == 'EMPTY' and not obj.M4.is_group_empty and obj.children])
+        if obj.type == 'EMPTY' and not is_group and obj.children:
+            groupifyable = True
 
-    batchposable = bool([obj for obj in active_group.children_recursive if obj.type == 'EMPTY' and obj.M4.is_group_empty]) if active_group else False
+        if target and not addable and obj != target and parent_obj != target and (not parent_obj or (parent_obj.M4.is_group_empty and not parent_obj.select_get())):
+            addable = True
+
+        if groupable and ungroupable and removable and groupifyable and (addable or not target):
+            break
+
+    ungroupable = ungroupable and group_empties
+
+    batchposable = bool(group_index.get_child_groups(active_group, scene=context.scene)) if active_group else False
 
     return bool(active_group), bool(active_child), group_empties, groupable, ungroupable, addable, removable, selectable, duplicatable, groupifyable, batchposable
 
@@ -170,11 +198,10 @@ def get_group_hierarchy(empty, up=False, layered=False):
                 empties[depth].append(e)
                 get_group_child_empties_recursively(e, empties, depth=depth)
 
-    top_empty = empty
+    top_empty = get_group_root_empty(empty) if up else empty
 
-    if up:
-        while top_empty.parent and top_empty.type == 'EMPTY' and top_empty.M4.is_group_empty:
-            top_empty = top_empty.parent
+    if group_index.contains(top_empty):
+        return [top_empty] + group_index.get_descendant_groups(top_empty, layered=layered)
 
     if layered:
         layered_empties = [top_empty]
@@ -197,7 +224,7 @@ def get_child_depth(self, children, depth=0, init=False):
 
 def fade_group_sizes(context, size=None, groups=[], init=False):
     if init:
-        groups = [obj for obj in context.scene.objects if obj.M4.is_group_empty and not obj.parent]
+        groups = [obj for obj in group_index.get_top_groups(scene=context.scene) if not obj.parent]
 
     for group in groups:
         if size:
@@ -206,18 +233,13 @@ def fade_group_sizes(context, size=None, groups=[], init=False):
             group.empty_display_size = factor * size
             group.M4.group_size = group.empty_display_size
 
-        sub_groups = [c for c in group.children if c.M4.is_group_empty]
+        sub_groups = [c for c in group_index.get_child_groups(group, scene=context.scene) if c.parent == group]
 
         if sub_groups:
             fade_group_sizes(context, size=group.M4.group_size, groups=sub_groups, init=False)
 
 def get_group_root_empty(empty):
-    top_empty = empty
-
-    while top_empty.parent and top_empty.type == 'EMPTY' and top_empty.M4.is_group_empty:
-        top_empty = top_empty.parent
-
-    return top_empty
+    return group_index.get_root(empty)
 
 def get_group_default_name():
     p = r.get_prefs()
@@ -443,8 +465,6 @@ def process_group_poses(empty, debug=False):
 
     group_empties = get_group_hierarchy(empty, up=True)
 
-    group_poses = {}
-
     if debug:
         print(" empties (initial):")
 
@@ -469,11 +489,7 @@ def process_group_poses(empty, debug=False):
 
                 pose.uuid = '11111111-1111-1111-1111-111111111111'
 
-            if pose.uuid in group_poses:
-                group_poses[pose.uuid].append(pose)
-
-            else:
-                group_poses[pose.uuid] = [pose]
+    group_poses = BatchPoseEngine(group_empties).groups
 
     ex_inception_uuid = None
     ex_legacy_uuid = None
@@ -563,54 +579,61 @@ def propagate_pose_preview_alpha(empty, up=False):
                 e.M4.avoid_update = True
                 e.M4.group_pose_alpha = empty.M4.group_pose_alpha
 
-def get_pose_batches(context, empty, pose, batches, children=None, dg=None, preview_batch_poses=False):
-    if dg is None:
-        dg = context.evaluated_depsgraph_get()
+def get_pose_child_matrix(empty, obj, pose, preview_batch_poses=False):
+    is_batch_pose = pose.batch and pose.batchlinked
 
-    if children is None:
-        children = [obj for obj in empty.children_recursive if obj.name in context.view_layer.objects and obj.visible_get()]
+    locals = [obj.matrix_local]
 
-    is_batch_pose = pose.batch and pose.batchlinked
+    ob = obj
 
-    for obj in children:
+    while ob.parent != empty:
+        ob = ob.parent
 
-        locals = [obj.matrix_local]
+        appended_batch_pose_mx_already = False
 
-        ob = obj
+        if preview_batch_poses and is_batch_pose and ob.type == 'EMPTY' and ob.M4.is_group_empty:
 
-        while ob.parent != empty:
-            ob = ob.parent
+            for p in ob.M4.group_pose_COL:
 
-            appended_batch_pose_mx_already = False
+                if p.batch and p.uuid == pose.uuid:
 
-            if preview_batch_poses and is_batch_pose and ob.type == 'EMPTY' and ob.M4.is_group_empty:
+                    if p.batchlinked:
 
-                for p in ob.M4.group_pose_COL:
+                        loc, _, sca = ob.matrix_local.decompose()
+                        locals.append(Matrix.LocRotScale(loc, p.mx.to_quaternion(), sca))
 
-                    if p.batch and p.uuid == pose.uuid:
+                        appended_batch_pose_mx_already = True
 
-                        if p.batchlinked:
+                    break
 
-                            loc, _, sca = ob.matrix_local.decompose()
-                            locals.append(Matrix.LocRotScale(loc, p.mx.to_quaternion(), sca))
+        if not appended_batch_pose_mx_already:
+            locals.append(ob.matrix_local)
 
-                            appended_batch_pose_mx_already = True
+    cumulative_local_mx = Matrix()
 
-                        break
+    for local in reversed(locals):
+        cumulative_local_mx @= local
 
-            if not appended_batch_pose_mx_already:
-                locals.append(ob.matrix_local)
+    return cumulative_local_mx
 
-        cumulative_local_mx = Matrix()
+def get_posed_group_matrix(empty, pose):
+    loc, _, sca = empty.matrix_local.decompose()
 
-        for local in reversed(locals):
-            cumulative_local_mx @= local
+    empty_local_posed_mx = Matrix.LocRotScale(loc, pose.mx.to_quaternion(), sca)
 
-        loc, _, sca = empty.matrix_local.decompose()
+    return empty.parent.matrix_world @ empty_local_posed_mx if empty.parent else empty_local_posed_mx
 
-        empty_local_posed_mx = Matrix.LocRotScale(loc, pose.mx.to_quaternion(), sca)
-        
-        mx = empty.parent.matrix_world @ empty_local_posed_mx @ cumulative_local_mx if empty.parent else empty_local_posed_mx @ cumulative_local_mx
+def get_pose_batches(context, empty, pose, batches, children=None, dg=None, preview_batch_poses=False):
+    if dg is None:
+        dg = context.evaluated_depsgraph_get()
+
+    if children is None:
+        children = [obj for obj in empty.children_recursive if obj.name in context.view_layer.objects and obj.visible_get()]
+
+    posed_mx = get_posed_group_matrix(empty, pose)
+
+    for obj in children:
+        mx = posed_mx @ get_pose_child_matrix(empty, obj, pose, preview_batch_poses=preview_batch_poses)
 
         if obj.type in ['MESH', 'CURVE', 'SURFACE', 'META', 'FONT']:
 
@@ -625,3 +648,562 @@ def get_pose_batches(context, empty, pose, batches, children=None, dg=None, prev
         elif obj.type == 'EMPTY':
             length = obj.M4.group_size if obj.M4.is_group_empty else obj.empty_display_size
             batches.append((mx, length))
+
+class PosePreview:
+    def log(self, *args, **kwargs):
+        if self.debug:
+            print(*args, **kwargs)
+
+    debug = False
+
+    mesh_types = ['MESH', 'CURVE', 'SURFACE', 'META', 'FONT']
+
+    cross_coords = np.array([(-1, 0, 0), (1, 0, 0), (0, -1, 0), (0, 1, 0), (0, 0, -1), (0, 0, 1)], dtype=np.float32)
+    cross_indices = np.array([(0, 1), (2, 3), (4, 5)], dtype=np.int32)
+
+    def __init__(self, debug=False):
+        self.debug = debug
+
+        self.mesh_key = ('POSE_PREVIEW', id(self), 'MESH')
+        self.empty_key = ('POSE_PREVIEW', id(self), 'EMPTY')
+
+        self.coords = None
+        self.empty_coords = None
+
+        self.clear()
+
+    def clear(self):
+        if self.coords is not None or self.empty_coords is not None:
+            self.invalidate_batches()
+
+        self.empty = None
+        self.pose = None
+        self.preview_batch_poses = False
+
+        self.mx = Matrix()
+        self.color = blue
+        self.alpha = 1
+
+        self.slices = {}
+        self.dirty = set()
+        self.moved = set()
+
+        self.coords = None
+        self.indices = None
+
+        self.empty_coords = None
+        self.empty_indices = None
+
+    def invalidate_batches(self, type=None):
+        from . draw import batch_cache
+
+        if type in [None, 'MESH']:
+            batch_cache.invalidate(self.mesh_key)
+
+        if type in [None, 'EMPTY']:
+            batch_cache.invalidate(self.empty_key)
+
+    def get_children(self):
+        return {obj.as_pointer(): obj for obj in self.empty.children_recursive}
+
+    def build(self, context, empty, pose, dg=None, preview_batch_poses=False):
+        if dg is None:
+            dg = context.evaluated_depsgraph_get()
+
+        self.log(f"Building pose preview for {empty.name}'s pose {pose.name}")
+
+        self.empty = empty
+        self.pose = pose
+        self.preview_batch_poses = preview_batch_poses
+
+        self.mx = get_posed_group_matrix(empty, pose)
+        self.set_style(empty, pose)
+
+        self.slices = {}
+        self.dirty = set()
+        self.moved = set()
+
+        children = [obj for obj in empty.children_recursive if obj.name in context.view_layer.objects and obj.visible_get()]
+
+        for obj in children:
+            if obj.type in self.mesh_types + ['EMPTY']:
+                self.slices[obj.as_pointer()] = self._get_slice(obj, dg)
+
+        self._concatenate()
+
+    def set_style(self, empty, pose):
+        self.color = orange if pose.batch and pose.batchlinked else green if pose.name == 'Inception' else yellow if pose.name == 'LegacyPose' else blue
+        self.alpha = empty.M4.group_pose_alpha
+
+    def invalidate(self, obj, geometry=True):
+        pointer = obj.as_pointer()
+
+        if pointer in self.slices:
+            if geometry:
+                self.dirty.add(pointer)
+
+            else:
+                self.moved.add(pointer)
+
+    def update(self, context, pose=None, dg=None):
+        if pose:
+            self.pose = pose
+
+        self.mx = get_posed_group_matrix(self.empty, self.pose)
+
+        children = self.get_children() if self.dirty or self.moved else {}
+
+        self._update_moved(children)
+
+        if not self.dirty:
+            return
+
+        if dg is None:
+            dg = context.evaluated_depsgraph_get()
+
+        self.log(f"Updating {len(self.dirty)} pose preview slices")
+
+        concatenate = False
+
+        for pointer in self.dirty:
+            obj = children.get(pointer)
+            old = self.slices[pointer]
+
+            if not obj or obj.type not in self.mesh_types + ['EMPTY']:
+                del self.slices[pointer]
+                concatenate = True
+                continue
+
+            new = self._get_slice(obj, dg)
+            self.slices[pointer] = new
+
+            if concatenate or new['type'] != old['type'] or len(new['coords']) != len(old['coords']) or not np.array_equal(new['indices'], old['indices']):
+                concatenate = True
+                continue
+
+            new['offset'] = old['offset']
+            self._write_slice(new)
+
+        self.dirty.clear()
+
+        if concatenate:
+            self._concatenate()
+
+    def _update_moved(self, children):
+        moved = self.moved - self.dirty
+        self.moved.clear()
+
+        for pointer in moved:
+            obj = children.get(pointer)
+            s = self.slices[pointer]
+
+            if not obj:
+                self.dirty.add(pointer)
+                continue
+
+            mx = get_pose_child_matrix(self.empty, obj, self.pose, preview_batch_poses=self.preview_batch_poses)
+
+            # moving the group empty moves all children, but leaves their matrices relative to it unchanged
+            if mx == s['mx']:
+                continue
+
+            deltamx = np.array(mx @ s['mx'].inverted_safe(), dtype=np.float32)
+
+            s['coords'] = np.float32(s['coords'] @ deltamx[:3, :3].T + deltamx[:3, 3])
+            s['mx'] = mx
+
+            self._write_slice(s)
+
+    def _write_slice(self, s):
+        coords = self.coords if s['type'] == 'MESH' else self.empty_coords
+        coords[s['offset']:s['offset'] + len(s['coords'])] = s['coords']
+
+        self.invalidate_batches(s['type'])
+
+    def _get_slice(self, obj, dg):
+        child_mx = get_pose_child_matrix(self.empty, obj, self.pose, preview_batch_poses=self.preview_batch_poses)
+        mx = np.array(child_mx, dtype=np.float32)
+
+        if obj.type == 'EMPTY':
+            length = obj.M4.group_size if obj.M4.is_group_empty else obj.empty_display_size
+            coords = self.cross_coords * length
+            indices = self.cross_indices
+            type = 'EMPTY'
+
+        else:
+            obj_eval = dg.objects.get(obj.name)
+            mesh_eval = obj_eval.to_mesh()
+
+            coords, indices = get_coords(mesh_eval, indices=True)
+
+            obj_eval.to_mesh_clear()
+            type = 'MESH'
+
+        coords = np.float32(coords @ mx[:3, :3].T + mx[:3, 3])
+
+        return {'type': type, 'coords': coords, 'indices': indices, 'offset': 0, 'mx': child_mx}
+
+    def _concatenate(self):
+        for type in ['MESH', 'EMPTY']:
+            slices = [s for s in self.slices.values() if s['type'] == type]
+
+            offset = 0
+            indices = []
+
+            for s in slices:
+                s['offset'] = offset
+                indices.append(s['indices'] + offset)
+                offset += len(s['coords'])
+
+            coords = np.concatenate([s['coords'] for s in slices]) if slices else None
+            indices = np.concatenate(indices).astype(np.int32) if slices else None
+
+            if type == 'MESH':
+                self.coords, self.indices = coords, indices
+            else:
+                self.empty_coords, self.empty_indices = coords, indices
+
+        self.invalidate_batches()
+
+        self.log(f"Concatenated {len(self.slices)} pose preview slices")
+
+pose_preview = PosePreview()
+
+def is_group_empty(obj):
+    return obj.type == 'EMPTY' and obj.M4.is_group_empty
+
+class GroupTreeIndex:
+    def log(self, *args, **kwargs):
+        if self.debug:
+            print(*args, **kwargs)
+
+    debug = False
+
+    def __init__(self, debug=False):
+        self.debug = debug
+
+        self.scene = None
+        self.is_dirty = True
+
+        self.parents = {}
+        self.children = {}
+        self.depths = {}
+        self.roots = {}
+
+    def invalidate(self):
+        self.log("Invalidating group tree index")
+
+        self.is_dirty = True
+
+    def sync(self, context, objects=()):
+        if self.is_dirty:
+            return
+
+        scene = getattr(context, 'scene', None)
+
+        if not scene or self.scene != scene.as_pointer():
+            self.invalidate()
+            return
+
+        for obj in objects:
+            self._refresh_object(obj)
+
+    def rebuild(self, scene):
+        self.log(f"Rebuilding group tree index for scene {scene.name}")
+
+        self.scene = scene.as_pointer()
+        self.is_dirty = False
+
+        self.parents.clear()
+        self.children.clear()
+        self.depths.clear()
+        self.roots.clear()
+
+        for obj in scene.objects:
+            if is_group_empty(obj):
+                parent = self._get_parent_group(obj)
+
+                self.parents[obj] = parent
+                self.children.setdefault(parent, []).append(obj)
+
+        for empty in self.children.get(None, []):
+            self._set_depth(empty, 0)
+
+    def ensure(self, scene=None):
+        if scene is None:
+            scene = bpy.context.scene
+
+        if self.is_dirty or self.scene != scene.as_pointer():
+            self.rebuild(scene)
+
+    def contains(self, empty, scene=None):
+        self.ensure(scene)
+        return empty in self.parents
+
+    def get_parent_group(self, empty, scene=None):
+        self.ensure(scene)
+        return self.parents.get(empty)
+
+    def get_child_groups(self, empty, scene=None):
+        self.ensure(scene)
+        return list(self.children.get(empty, []))
+
+    def get_top_groups(self, scene=None):
+        return self.get_child_groups(None, scene=scene)
+
+    def get_root(self, empty, scene=None):
+        self.ensure(scene)
+
+        if empty not in self.roots:
+            root = empty
+
+            while root.parent and is_group_empty(root):
+                root = root.parent
+
+                if root in self.roots:
+                    root = self.roots[root]
+                    break
+
+            self.roots[empty] = root
+
+        return self.roots[empty]
+
+    def get_depth(self, empty, scene=None):
+        self.ensure(scene)
+        return self.depths.get(empty, 0)
+
+    def get_descendant_groups(self, empty, layered=False, scene=None):
+        self.ensure(scene)
+
+        descendants = []
+
+        if layered:
+            layer = [c for c in self.children.get(empty, []) if c.parent == empty]
+
+            while layer:
+                descendants.extend(layer)
+                layer = [c for e in layer for c in self.children.get(e, []) if c.parent == e]
+
+        else:
+            stack = list(reversed(self.children.get(empty, [])))
+
+            while stack:
+                e = stack.pop()
+                descendants.append(e)
+                stack.extend(reversed(self.children.get(e, [])))
+
+        return descendants
+
+    def _get_parent_group(self, obj):
+        parent = obj.parent
+
+        while parent and not is_group_empty(parent):
+            parent = parent.parent
+
+        return parent
+
+    def _set_depth(self, empty, depth):
+        stack = [(empty, depth)]
+
+        while stack:
+            e, d = stack.pop()
+            self.depths[e] = d
+
+            stack.extend((c, d + 1) for c in self.children.get(e, []))
+
+    def _detach(self, obj):
+        parent = self.parents.pop(obj)
+        siblings = self.children.get(parent)
+
+        if siblings and obj in siblings:
+            siblings.remove(obj)
+
+        self.depths.pop(obj, None)
+
+    def _refresh_object(self, obj):
+        try:
+            is_group = is_group_empty(obj)
+            parent = self._get_parent_group(obj) if is_group else None
+
+        except ReferenceError:
+            self.invalidate()
+            return
+
+        if is_group or obj in self.parents:
+            self.roots.clear()
+
+        if obj in self.parents:
+            if is_group and self.parents[obj] == parent:
+                return
+
+            self.log(f"Re-indexing group {obj.name}")
+            self._detach(obj)
+
+        elif not is_group:
+            return
+
+        if is_group:
+            self.parents[obj] = parent
+            self.children.setdefault(parent, []).append(obj)
+
+            self._set_depth(obj, self.depths.get(parent, -1) + 1 if parent else 0)
+
+        else:
+            for c in self.children.pop(obj, []):
+                del self.parents[c]
+                self._refresh_object(c)
+
+group_index = GroupTreeIndex()
+
+def get_pose_matrices(locals, poses):
+    rot = poses[:, :3, :3] / np.maximum(np.linalg.norm(poses[:, :3, :3], axis=1), 1e-12)[:, None, :]
+    rot[np.linalg.det(rot) < 0] *= -1
+
+    sca = np.linalg.norm(locals[:, :3, :3], axis=1)
+    sca[np.linalg.det(locals[:, :3, :3]) < 0] *= -1
+
+    return compose_pose_matrices(locals[:, :3, 3], rot, sca)
+
+def compose_pose_matrices(loc, rot, sca):
+    mx = np.zeros(rot.shape[:-2] + (4, 4))
+
+    mx[..., :3, :3] = rot * sca[..., None, :]
+    mx[..., :3, 3] = loc
+    mx[..., 3, 3] = 1
+
+    return mx
+
+def get_quaternion_matrices(quats):
+    w, x, y, z = np.moveaxis(quats, -1, 0)
+
+    return np.stack((1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y),
+                     2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x),
+                     2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)), axis=-1).reshape(quats.shape[:-1] + (3, 3))
+
+def slerp_quaternions(q1, q2, factors):
+    dot = np.sum(q1 * q2, axis=-1)
+
+    q2 = np.where(dot[:, None] < 0, -q2, q2)
+    dot = np.clip(np.abs(dot), 0, 1)
+
+    angle = np.arccos(dot)[None, :]
+    t = np.asarray(factors, dtype=np.float64)[:, None]
+
+    sin = np.sin(angle)
+    is_linear = sin < 1e-6
+
+    w1 = np.where(is_linear, 1 - t, np.sin((1 - t) * angle) / np.where(is_linear, 1, sin))
+    w2 = np.where(is_linear, t, np.sin(t * angle) / np.where(is_linear, 1, sin))
+
+    quats = w1[..., None] * q1[None] + w2[..., None] * q2[None]
+
+    return quats / np.linalg.norm(quats, axis=-1, keepdims=True)
+
+class BatchPoseEngine:
+    def log(self, *args, **kwargs):
+        if self.debug:
+            print(*args, **kwargs)
+
+    debug = False
+
+    def __init__(self, empties, debug=False):
+        self.debug = debug
+
+        self.empties = list(empties)
+        self.frames = None
+
+        self.index()
+
+    def index(self):
+        self.groups = {}
+        self.poses = {}
+
+        for e in self.empties:
+            for pose in e.M4.group_pose_COL:
+                self.groups.setdefault(pose.uuid, []).append(pose)
+
+                if pose.batch:
+                    self.poses.setdefault(pose.uuid, {}).setdefault(e, pose)
+
+        self.log(f"Indexed {len(self.groups)} pose uuids, {len(self.poses)} of them batched, across {len(self.empties)} group empties")
+
+    def get_targets(self, uuid, unlinked=False):
+        return [(e, pose) for e, pose in self.poses.get(uuid, {}).items() if unlinked or pose.batchlinked]
+
+    def set_batch_pose(self, active):
+        name = get_batch_pose_name(self.empties)
+
+        uuid = set_group_pose(active, name=name, batch=True)
+
+        for e in self.empties:
+            if e != active:
+                set_group_pose(e, name=name, uuid=uuid, batch=True)
+
+        self.index()
+
+        return uuid
+
+    def get_locals(self, empties):
+        return np.array([e.matrix_local for e in empties], dtype=np.float64).reshape(-1, 4, 4)
+
+    def apply(self, targets):
+        if not targets:
+            return 0
+
+        empties = [e for e, _ in targets]
+
+        locals = self.get_locals(empties)
+        poses = np.array([pose.mx for _, pose in targets], dtype=np.float64).reshape(-1, 4, 4)
+
+        matrices = get_pose_matrices(locals, poses)
+        changed = ~np.all(np.isclose(locals, matrices, atol=1e-6), axis=(1, 2))
+
+        for idx in np.flatnonzero(changed):
+            empties[idx].matrix_local = Matrix(matrices[idx].tolist())
+
+        self.log(f"Applied {np.count_nonzero(changed)} of {len(targets)} poses")
+
+        return int(np.count_nonzero(changed))
+
+    def build_sequence(self, active, steps=1, cyclic=True):
+        locals = self.get_locals(self.empties)
+        current = [tuple(e.matrix_local.to_quaternion()) for e in self.empties]
+
+        keys = []
+
+        for pose in active.M4.group_pose_COL:
+            targets = dict(self.get_targets(pose.uuid)) if pose.batch and pose.batchlinked else {active: pose}
+
+            keys.append([tuple(targets[e].mx.to_quaternion()) if e in targets else current[idx] for idx, e in enumerate(self.empties)])
+
+        keys = np.array(keys, dtype=np.float64)
+
+        if not len(keys):
+            self.frames = None
+            return 0
+
+        count = len(keys) if cyclic else len(keys) - 1
+        factors = np.arange(max(steps, 1)) / max(steps, 1)
+
+        quats = [slerp_quaternions(keys[idx], keys[(idx + 1) % len(keys)], factors) for idx in range(count)]
+
+        if not cyclic:
+            quats.append(keys[-1:])
+
+        quats = np.concatenate(quats) if quats else keys
+
+        sca = np.linalg.norm(locals[:, :3, :3], axis=1)
+        sca[np.linalg.det(locals[:, :3, :3]) < 0] *= -1
+
+        self.frames = compose_pose_matrices(locals[:, :3, 3], get_quaternion_matrices(quats), sca)
+
+        self.log(f"Built pose sequence of {len(self.frames)} frames from {len(keys)} poses")
+
+        return len(self.frames)
+
+    def apply_frame(self, frame):
+        if self.frames is None:
+            return
+
+        for e, mx in zip(self.empties, self.frames[frame % len(self.frames)].tolist()):
+            e.matrix_local = Matrix(mx)
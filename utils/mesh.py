@@ -179,8 +179,196 @@ def flip_normals(mesh):
     bm.to_mesh(mesh)
     bm.free()
 
+def clear_edge_attributes(mesh, sharps=True, bweights=True, creases=True, seams=True):
+    '''直接在网格数据上将锐边、倒角权重、折痕和缝合边数组清零, 返回每种属性实际被清除的边数'''
+    count = len(mesh.edges)
+    cleared = {}
+
+    for key, prop, enabled in [('sharps', 'use_edge_sharp', sharps), ('seams', 'use_seam', seams)]:
+        if enabled:
+            values = np.empty(count, dtype=bool)
+            mesh.edges.foreach_get(prop, values)
+
+            cleared[key] = int(np.count_nonzero(values))
+
+            if cleared[key]:
+                mesh.edges.foreach_set(prop, np.zeros(count, dtype=bool))
+
+    for key, name, enabled in [('bweights', 'bevel_weight_edge', bweights), ('creases', 'crease_edge', creases)]:
+        if enabled:
+            attr = mesh.attributes.get(name)
+            cleared[key] = 0
+
+            if attr and attr.domain == 'EDGE' and attr.data_type == 'FLOAT':
+                values = np.empty(count, dtype=np.float32)
+                attr.data.foreach_get('value', values)
+
+                cleared[key] = int(np.count_nonzero(values))
+
+                if cleared[key]:
+                    attr.data.foreach_set('value', np.zeros(count, dtype=np.float32))
+
+    if any(cleared.values()):
+        mesh.update()
+
+    return cleared
+
+join_attribute_types = {'FLOAT': ('value', 1, np.float32),
+                        'INT': ('value', 1, np.int32),
+                        'INT8': ('value', 1, np.int32),
+                        'BOOLEAN': ('value', 1, bool),
+                        'FLOAT2': ('vector', 2, np.float32),
+                        'INT32_2D': ('value', 2, np.int32),
+                        'FLOAT_VECTOR': ('vector', 3, np.float32),
+                        'FLOAT_COLOR': ('color', 4, np.float32),
+                        'BYTE_COLOR': ('color', 4, np.float32),
+                        'QUATERNION': ('value', 4, np.float32)}
+
+join_skip_attributes = {'position', '.edge_verts', '.corner_vert', '.corner_edge', 'Machin3FaceSelect'}
+
+def get_join_arrays(mesh, mx=None):
+    vert_count, edge_count, loop_count, poly_count = len(mesh.vertices), len(mesh.edges), len(mesh.loops), len(mesh.polygons)
+
+    coords = np.empty(vert_count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', coords)
+    coords = coords.reshape(-1, 3)
+
+    if mx is not None:
+        coords = (coords @ mx[:3, :3].T + mx[:3, 3]).astype(np.float32)
+
+    edges = np.empty(edge_count * 2, dtype=np.int32)
+    mesh.edges.foreach_get('vertices', edges)
+
+    seams = np.empty(edge_count, dtype=bool)
+    mesh.edges.foreach_get('use_seam', seams)
+
+    corner_verts = np.empty(loop_count, dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', corner_verts)
+
+    corner_edges = np.empty(loop_count, dtype=np.int32)
+    mesh.loops.foreach_get('edge_index', corner_edges)
+
+    loop_starts = np.empty(poly_count, dtype=np.int32)
+    mesh.polygons.foreach_get('loop_start', loop_starts)
+
+    return {'counts': {'POINT': vert_count, 'EDGE': edge_count, 'CORNER': loop_count, 'FACE': poly_count},
+            'coords': coords,
+            'edges': edges,
+            'seams': seams,
+            'corner_verts': corner_verts,
+            'corner_edges': corner_edges,
+            'loop_starts': loop_starts}
+
+def get_join_attribute(mesh, name, domain, data_type, count):
+    prop, width, dtype = join_attribute_types[data_type]
+    attr = mesh.attributes.get(name)
+
+    values = np.zeros(count * width, dtype=dtype)
+
+    if attr and attr.domain == domain and attr.data_type == data_type:
+        attr.data.foreach_get(prop, values)
+
+    return values
+
 def join(target, objects, select=[]):
-    '''将多个对象的网格数据合并到一个目标对象中的功能，并且可以指定某些面在合并后是否被选中'''
+    '''将多个对象的网格数据批量合并到目标对象中, 用 foreach_get/foreach_set 一次性写入顶点、边、循环和面, 面标记写入 Machin3FaceSelect 属性'''
+    if not objects:
+        return
+
+    if bpy.app.version < (4, 1, 0):
+        if any([obj.data.use_auto_smooth for obj in objects]):
+            target.data.use_auto_smooth = True
+
+    mesh = target.data
+    sources = [obj.data for obj in objects]
+
+    if len(set(sources)) != len(sources) or any(m.shape_keys or m.has_custom_normals for m in [mesh] + sources) or any(obj.vertex_groups for obj in [target] + objects):
+        return join_bmesh(target, objects, select=select)
+
+    mxi = np.array(target.matrix_world.inverted_safe())
+
+    arrays = [get_join_arrays(mesh)] + [get_join_arrays(m, mx=mxi @ np.array(obj.matrix_world)) for obj, m in zip(objects, sources)]
+
+    domains = ['POINT', 'EDGE', 'CORNER', 'FACE']
+    offsets = {domain: np.cumsum([0] + [a['counts'][domain] for a in arrays]) for domain in domains}
+    totals = {domain: int(offsets[domain][-1]) for domain in domains}
+
+    attributes = {}
+
+    for m in [mesh] + sources:
+        for attr in m.attributes:
+            if attr.name not in join_skip_attributes and attr.name not in attributes and attr.data_type in join_attribute_types:
+                attributes[attr.name] = (attr.domain, attr.data_type)
+
+    values = {name: np.concatenate([get_join_attribute(m, name, domain, data_type, a['counts'][domain]) for m, a in zip([mesh] + sources, arrays)]) for name, (domain, data_type) in attributes.items()}
+
+    tags = [get_join_attribute(mesh, 'Machin3FaceSelect', 'FACE', 'INT', arrays[0]['counts']['FACE'])] + [np.full(a['counts']['FACE'], idx + 1, dtype=np.int32) for idx, a in enumerate(arrays[1:])]
+    tags = np.concatenate(tags)
+
+    coords = np.concatenate([a['coords'] for a in arrays])
+    edges = np.concatenate([a['edges'] + offsets['POINT'][idx] for idx, a in enumerate(arrays)])
+    seams = np.concatenate([a['seams'] for a in arrays])
+    corner_verts = np.concatenate([a['corner_verts'] + offsets['POINT'][idx] for idx, a in enumerate(arrays)])
+    corner_edges = np.concatenate([a['corner_edges'] + offsets['EDGE'][idx] for idx, a in enumerate(arrays)])
+    loop_starts = np.concatenate([a['loop_starts'] + offsets['CORNER'][idx] for idx, a in enumerate(arrays)])
+
+    mesh.vertices.add(totals['POINT'] - len(mesh.vertices))
+    mesh.edges.add(totals['EDGE'] - len(mesh.edges))
+    mesh.loops.add(totals['CORNER'] - len(mesh.loops))
+    mesh.polygons.add(totals['FACE'] - len(mesh.polygons))
+
+    mesh.vertices.foreach_set('co', coords.ravel())
+    mesh.edges.foreach_set('vertices', edges)
+    mesh.loops.foreach_set('vertex_index', corner_verts)
+    mesh.loops.foreach_set('edge_index', corner_edges)
+    mesh.polygons.foreach_set('loop_start', loop_starts)
+
+    for name, (domain, data_type) in attributes.items():
+        if name not in mesh.attributes:
+            try:
+                mesh.attributes.new(name, data_type, domain)
+
+            except RuntimeError:
+                continue
+
+        attr = mesh.attributes[name]
+
+        if attr.domain == domain and attr.data_type == data_type:
+            attr.data.foreach_set(join_attribute_types[data_type][0], values[name])
+
+    mesh.edges.foreach_set('use_seam', seams)
+
+    if 'Machin3FaceSelect' not in mesh.attributes:
+        mesh.attributes.new('Machin3FaceSelect', 'INT', 'FACE')
+
+    mesh.attributes['Machin3FaceSelect'].data.foreach_set('value', tags)
+
+    if select:
+        face_select = np.empty(totals['FACE'], dtype=bool)
+        mesh.polygons.foreach_get('select', face_select)
+
+        tagged = np.isin(tags, select)
+        corners = np.repeat(tagged, np.diff(np.append(loop_starts, totals['CORNER'])))
+
+        vert_select = np.empty(totals['POINT'], dtype=bool)
+        mesh.vertices.foreach_get('select', vert_select)
+        vert_select[corner_verts[corners]] = True
+
+        edge_select = np.empty(totals['EDGE'], dtype=bool)
+        mesh.edges.foreach_get('select', edge_select)
+        edge_select[corner_edges[corners]] = True
+
+        mesh.vertices.foreach_set('select', vert_select)
+        mesh.edges.foreach_set('select', edge_select)
+        mesh.polygons.foreach_set('select', face_select | tagged)
+
+    mesh.update()
+
+    for m in sources:
+        bpy.data.meshes.remove(m, do_unlink=True)
+
+def join_bmesh(target, objects, select=[]):
+    '''将多个对象的网格数据合并到一个目标对象中的功能，并且可以指定某些面在合并后是否被选中, 逐个对象经由 bmesh 合并, 保留形态键和自定义法线'''
     mxi = target.matrix_world.inverted_safe()
 
     bm = bmesh.new()
@@ -193,10 +381,6 @@ def join(target, objects, select=[]):
     if not select_layer:
         select_layer = bm.faces.layers.int.new('Machin3FaceSelect')
 
-    if bpy.app.version < (4, 1, 0):
-        if any([obj.data.use_auto_smooth for obj in objects]):
-            target.data.use_auto_smooth = True
-
     for idx, obj in enumerate(objects):
         mesh = obj.data
         mx = obj.matrix_world
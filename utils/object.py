@@ -194,3 +194,135 @@ def get_parent(obj, recursive=False, debug=False):
 
 def is_valid_object(obj):
     return obj and not ' invalid>' in str(obj)
+
+class VisibleObjectIndex:
+    def log(self, *args, **kwargs):
+        if self.debug:
+            print(*args, **kwargs)
+
+    debug = False
+
+    def __init__(self, debug=False):
+        self.debug = debug
+
+        self.view_layer = None
+        self.is_dirty = True
+
+        self.visible = set()
+        self.hidden = set()
+
+        self.group_empties = set()
+        self.axes = set()
+        self.decal_backups = set()
+        self.stashes = set()
+
+        self.sorted = {}
+
+    def invalidate(self):
+        if not self.is_dirty:
+            self.log("Invalidating visible object index")
+
+        self.is_dirty = True
+
+    def sync(self, context, objects=()):
+        if self.is_dirty:
+            return
+
+        view_layer = getattr(context, 'view_layer', None)
+
+        if not view_layer or self.view_layer != view_layer.as_pointer():
+            self.invalidate()
+            return
+
+        if objects:
+            self.log(f"Refreshing {len(objects)} objects in visible object index")
+
+            for obj in objects:
+                self._refresh_object(view_layer, obj)
+
+    def ensure(self, context):
+        view_layer = getattr(context, 'view_layer', None)
+
+        if view_layer and (self.is_dirty or self.view_layer != view_layer.as_pointer()):
+            self.rebuild(view_layer)
+
+    def rebuild(self, view_layer):
+        self.log(f"Rebuilding visible object index for view layer {view_layer.name}")
+
+        self.view_layer = view_layer.as_pointer()
+        self.is_dirty = False
+
+        for objects in self._get_sets():
+            objects.clear()
+
+        self.sorted.clear()
+
+        for obj in view_layer.objects:
+            self._refresh_object(view_layer, obj, is_member=True)
+
+    def get_visible(self, context):
+        self.ensure(context)
+        return list(self.visible)
+
+    def get_group_empties(self, context):
+        self.ensure(context)
+        return self._get_sorted('group_empties')
+
+    def has_group_empties(self, context):
+        self.ensure(context)
+        return bool(self.group_empties)
+
+    def get_axes_objects(self, context):
+        self.ensure(context)
+        return self._get_sorted('axes')
+
+    def get_decal_backups(self, context):
+        self.ensure(context)
+        return self._get_sorted('decal_backups')
+
+    def get_stashes(self, context):
+        self.ensure(context)
+        return self._get_sorted('stashes')
+
+    def _get_sorted(self, name):
+        if name not in self.sorted:
+            self.sorted[name] = sorted(getattr(self, name), key=lambda obj: obj.name)
+
+        return list(self.sorted[name])
+
+    def _get_sets(self):
+        return [self.visible, self.hidden, self.group_empties, self.axes, self.decal_backups, self.stashes]
+
+    def _refresh_object(self, view_layer, obj, is_member=False):
+        is_member = is_member or obj in self.visible or obj in self.hidden
+
+        for objects in self._get_sets():
+            objects.discard(obj)
+
+        self.sorted.clear()
+
+        try:
+            is_visible = obj.visible_get(view_layer=view_layer)
+
+        except ReferenceError:
+            return
+
+        if is_visible:
+            self.visible.add(obj)
+
+            if obj.M4.is_group_empty:
+                self.group_empties.add(obj)
+
+            if obj.M4.draw_axes:
+                self.axes.add(obj)
+
+            if (dm := getattr(obj, 'DM', None)) and dm.isbackup:
+                self.decal_backups.add(obj)
+
+            if (mm := getattr(obj, 'MM', None)) and mm.isstashobj:
+                self.stashes.add(obj)
+
+        elif is_member:
+            self.hidden.add(obj)
+
+visible_index = VisibleObjectIndex()
@@ -2,7 +2,352 @@ import bpy
 from bpy_extras.view3d_utils import region_2d_to_origin_3d, region_2d_to_vector_3d
 import bmesh
 from mathutils.bvhtree import BVHTree as BVH
+from mathutils import Vector
 import sys
+from math import inf, sqrt
+from heapq import heappush, heappop
+from collections import OrderedDict
+import numpy as np
+from . registration import get_prefs
+
+class GeometryCache:
+    def log(self, *args, **kwargs):
+        if self.debug:
+            print(*args, **kwargs)
+
+    debug = False
+
+    def __init__(self, debug=False):
+        self.debug = debug
+
+        self.entries = OrderedDict()
+        self.size = 0
+
+    def get(self, obj, depsgraph=None):
+        source = 'EVAL' if depsgraph else 'DATA'
+        key = (obj.as_pointer(), source)
+
+        if depsgraph:
+            mesh = obj.evaluated_get(depsgraph).data
+        else:
+            mesh = obj.data
+
+        token = self.get_token(mesh)
+
+        entry = self.entries.get(key)
+
+        if entry and entry['token'] == token:
+            self.entries.move_to_end(key)
+            return entry
+
+        if entry:
+            self.log(f"Geometry of {obj.name} changed, rebuilding {source} cache entry")
+            self._remove(key)
+
+            (bounds_bvh if depsgraph else data_bounds_bvh).invalidate(obj)
+
+        bm = bmesh.new()
+
+        if depsgraph:
+            bm.from_object(obj.evaluated_get(depsgraph), depsgraph)
+        else:
+            bm.from_mesh(mesh)
+
+        bm.verts.ensure_lookup_table()
+        bm.faces.ensure_lookup_table()
+
+        entry = {'name': obj.name,
+                 'mesh': mesh.as_pointer() if source == 'DATA' else None,
+                 'token': token,
+                 'bmesh': bm,
+                 'bvh': BVH.FromBMesh(bm),
+                 'loop_triangles': None,
+                 'size': len(bm.verts) * 200 + len(bm.edges) * 100 + len(bm.faces) * 300}
+
+        self.entries[key] = entry
+        self.size += entry['size']
+
+        self.log(f"Cached {source} geometry of {obj.name}, {round(entry['size'] / 1024 ** 2, 2)}MB, total {round(self.size / 1024 ** 2, 2)}MB")
+
+        self._evict(keep=key)
+
+        return entry
+
+    def get_token(self, mesh):
+        return (mesh.as_pointer(), len(mesh.vertices), len(mesh.edges), len(mesh.loops), len(mesh.polygons))
+
+    def get_loop_triangles(self, obj, depsgraph=None):
+        entry = self.get(obj, depsgraph=depsgraph)
+
+        if entry['loop_triangles'] is None:
+            entry['loop_triangles'] = entry['bmesh'].calc_loop_triangles()
+
+        return entry['loop_triangles']
+
+    def invalidate(self, obj=None, mesh=None):
+        if obj:
+            pointer = obj.as_pointer()
+            keys = [key for key in self.entries if key[0] == pointer]
+
+        elif mesh:
+            pointer = mesh.as_pointer()
+            keys = [key for key, entry in self.entries.items() if entry['mesh'] == pointer]
+
+        else:
+            keys = list(self.entries)
+
+        for key in keys:
+            self.log(f"Invalidating {key[1]} geometry of {self.entries[key]['name']}")
+            self._remove(key)
+
+    def clear(self):
+        self.invalidate()
+
+    def _remove(self, key):
+        # the bmesh isn't freed explicitly, ray cast caches and Snap may still hold it, it's released once the last of them lets go of it
+        entry = self.entries.pop(key)
+
+        self.size -= entry['size']
+
+    def _evict(self, keep=None):
+        budget = get_prefs().geometry_cache_budget * 1024 ** 2
+
+        while self.size > budget and len(self.entries) > 1:
+            key = next(iter(self.entries))
+
+            if key == keep:
+                break
+
+            self.log(f"Evicting {key[1]} geometry of {self.entries[key]['name']}")
+            self._remove(key)
+
+geometry_cache = GeometryCache()
+
+class BoundsBVH:
+    def log(self, *args, **kwargs):
+        if self.debug:
+            print(*args, **kwargs)
+
+    debug = False
+
+    padding = 0.0001
+
+    def __init__(self, source='EVAL', debug=False):
+        self.debug = debug
+        self.source = source
+
+        self.clear()
+
+    def clear(self):
+        self.objects = {}
+        self.leaves = {}
+        self.mesh_bounds = {}
+        self.dirty = set()
+
+        self.nodes = []
+        self.root = None
+
+    def invalidate(self, obj):
+        self.dirty.add(obj.as_pointer())
+
+        if obj.type == 'MESH':
+            self.mesh_bounds.pop(obj.data.as_pointer(), None)
+
+    def sync(self, objects):
+        pointers = {obj.as_pointer(): obj for obj in objects}
+
+        if pointers.keys() - self.leaves.keys():
+            self.objects.update(pointers)
+            self._build()
+
+        if self.dirty:
+            self._refit()
+
+        return pointers
+
+    def get_ray_candidates(self, origin, direction, objects):
+        pointers = self.sync(objects)
+
+        if self.root is None:
+            return
+
+        inverse = [1 / d if d else inf for d in direction]
+
+        heap = []
+
+        if (t := self._intersect_ray(self.root, origin, direction, inverse)) is not None:
+            heappush(heap, (t, self.root))
+
+        while heap:
+            t, idx = heappop(heap)
+            bmin, bmax, left, right, parent, pointer = self.nodes[idx]
+
+            if pointer is not None:
+                if pointer in pointers:
+                    yield t, pointers[pointer]
+
+            else:
+                for child in [left, right]:
+                    if (tc := self._intersect_ray(child, origin, direction, inverse)) is not None:
+                        heappush(heap, (tc, child))
+
+    def get_point_candidates(self, point, objects):
+        pointers = self.sync(objects)
+
+        if self.root is None:
+            return
+
+        heap = [(self._get_point_distance(self.root, point), self.root)]
+
+        while heap:
+            distance, idx = heappop(heap)
+            bmin, bmax, left, right, parent, pointer = self.nodes[idx]
+
+            if pointer is not None:
+                if pointer in pointers:
+                    yield distance, pointers[pointer]
+
+            else:
+                for child in [left, right]:
+                    heappush(heap, (self._get_point_distance(child, point), child))
+
+    def _get_local_corners(self, obj):
+        if self.source == 'DATA' and obj.type == 'MESH':
+            mesh = obj.data
+            key = mesh.as_pointer()
+
+            corners = self.mesh_bounds.get(key)
+
+            if corners is None:
+                if not mesh.vertices:
+                    return []
+
+                coords = np.empty((len(mesh.vertices), 3), dtype=np.float32)
+                mesh.vertices.foreach_get('co', coords.ravel())
+
+                bmin, bmax = coords.min(axis=0).tolist(), coords.max(axis=0).tolist()
+                corners = self.mesh_bounds[key] = [Vector((x, y, z)) for x in (bmin[0], bmax[0]) for y in (bmin[1], bmax[1]) for z in (bmin[2], bmax[2])]
+
+            return corners
+
+        return [Vector(co) for co in obj.bound_box]
+
+    def _get_world_bounds(self, obj):
+        try:
+            mx = obj.matrix_world
+            corners = [mx @ co for co in self._get_local_corners(obj)]
+
+        except ReferenceError:
+            return None
+
+        if not corners:
+            return [inf] * 3, [-inf] * 3
+
+        bmin = [min(co[i] for co in corners) - self.padding for i in range(3)]
+        bmax = [max(co[i] for co in corners) + self.padding for i in range(3)]
+
+        return bmin, bmax
+
+    def _build(self):
+        leaves = []
+
+        for pointer, obj in list(self.objects.items()):
+            bounds = self._get_world_bounds(obj)
+
+            if bounds:
+                leaves.append((pointer, *bounds))
+
+            else:
+                del self.objects[pointer]
+
+        self.nodes = []
+        self.leaves = {}
+        self.dirty = set()
+
+        self.root = self._build_node(leaves, None) if leaves else None
+
+        self.log(f"Built bounds BVH over {len(leaves)} objects with {len(self.nodes)} nodes")
+
+    def _build_node(self, leaves, parent):
+        idx = len(self.nodes)
+
+        bmin = [min(leaf[1][i] for leaf in leaves) for i in range(3)]
+        bmax = [max(leaf[2][i] for leaf in leaves) for i in range(3)]
+
+        node = [bmin, bmax, None, None, parent, None]
+        self.nodes.append(node)
+
+        if len(leaves) == 1:
+            node[5] = leaves[0][0]
+            self.leaves[node[5]] = idx
+
+        else:
+            axis = max(range(3), key=lambda i: bmax[i] - bmin[i])
+            leaves = sorted(leaves, key=lambda leaf: leaf[1][axis] + leaf[2][axis])
+            half = len(leaves) // 2
+
+            node[2] = self._build_node(leaves[:half], idx)
+            node[3] = self._build_node(leaves[half:], idx)
+
+        return idx
+
+    def _refit(self):
+        self.log(f"Refitting bounds BVH for {len(self.dirty)} objects")
+
+        for pointer in self.dirty:
+            idx = self.leaves.get(pointer)
+
+            if idx is None:
+                continue
+
+            node = self.nodes[idx]
+            bounds = self._get_world_bounds(self.objects[pointer])
+
+            node[0], node[1] = bounds if bounds else ([inf] * 3, [-inf] * 3)
+
+            while (idx := node[4]) is not None:
+                node = self.nodes[idx]
+                left, right = self.nodes[node[2]], self.nodes[node[3]]
+
+                node[0] = [min(left[0][i], right[0][i]) for i in range(3)]
+                node[1] = [max(left[1][i], right[1][i]) for i in range(3)]
+
+        self.dirty = set()
+
+    def _intersect_ray(self, idx, origin, direction, inverse):
+        bmin, bmax = self.nodes[idx][:2]
+
+        tmin = 0
+        tmax = inf
+
+        for i in range(3):
+            if direction[i] == 0:
+                if origin[i] < bmin[i] or origin[i] > bmax[i]:
+                    return None
+
+                continue
+
+            t1 = (bmin[i] - origin[i]) * inverse[i]
+            t2 = (bmax[i] - origin[i]) * inverse[i]
+
+            if t1 > t2:
+                t1, t2 = t2, t1
+
+            tmin = max(tmin, t1)
+            tmax = min(tmax, t2)
+
+            if tmin > tmax:
+                return None
+
+        return tmin
+
+    def _get_point_distance(self, idx, point):
+        bmin, bmax = self.nodes[idx][:2]
+
+        return sqrt(sum(max(bmin[i] - point[i], 0, point[i] - bmax[i]) ** 2 for i in range(3)))
+
+bounds_bvh = BoundsBVH(source='EVAL')
+data_bounds_bvh = BoundsBVH(source='DATA')
 
 def cast_bvh_ray_from_mouse(mousepos, candidates=None, bmeshes={}, bvhs={}, debug=False):
     region = bpy.context.region
@@ -11,7 +356,7 @@ def cast_bvh_ray_from_mouse(mousepos, candidates=None, bmeshes={}, bvhs={}, debu
     origin_3d = region_2d_to_origin_3d(region, region_data, mousepos)
     vector_3d = region_2d_to_vector_3d(region, region_data, mousepos)
 
-    objects = [(obj, None) for obj in candidates if obj.type == "MESH"]
+    objects = [obj for obj in candidates if obj.type == "MESH"]
 
     hitobj = None
     hitlocation = None
@@ -22,25 +367,24 @@ def cast_bvh_ray_from_mouse(mousepos, candidates=None, bmeshes={}, bvhs={}, debu
     cache = {'bmesh': {},
              'bvh': {}}
 
-    for obj, src in objects:
+    for entry_distance, obj in data_bounds_bvh.get_ray_candidates(origin_3d, vector_3d.normalized(), objects):
+        if entry_distance > hitdistance:
+            break
+
         mx = obj.matrix_world
         mxi = mx.inverted_safe()
 
         ray_origin = mxi @ origin_3d
         ray_direction = mxi.to_3x3() @ vector_3d
 
-        if obj.name in bmeshes:
+        if obj.name in bmeshes and obj.name in bvhs:
             bm = bmeshes[obj.name]
-        else:
-            bm = bmesh.new()
-            bm.from_mesh(obj.data)
-            cache['bmesh'][obj.name] = bm
-
-        if obj.name in bvhs:
             bvh = bvhs[obj.name]
+
         else:
-            bvh = BVH.FromBMesh(bm)
-            cache['bvh'][obj.name] = bvh
+            entry = geometry_cache.get(obj)
+            bm = cache['bmesh'][obj.name] = entry['bmesh']
+            bvh = cache['bvh'][obj.name] = entry['bvh']
 
         location, normal, index, distance = bvh.ray_cast(ray_origin, ray_direction)
 
@@ -76,25 +420,13 @@ def cast_bvh_ray_from_point(origin, direction, cache, candidates=None, debug=Fal
                  'bvh': {}}
 
     for obj in objects:
-        if obj.name in cache['bmesh']:
-            bm = cache['bmesh'][obj.name]
-
-            if obj.name not in cache['bmesh']:
-                cache['bmesh'][obj.name] = bm
-
-        else:
-            bm = bmesh.new()
-            bm.from_mesh(obj.data)
-            cache['bmesh'][obj.name] = bm
-
-        if obj.name in cache['bvh']:
+        if obj.name in cache['bmesh'] and obj.name in cache['bvh']:
             bvh = cache['bvh'][obj.name]
 
-            if obj.name not in cache['bvh']:
-                cache['bvh'][obj.name] = bvh
         else:
-            bvh = BVH.FromBMesh(bm)
-            cache['bvh'][obj.name] = bvh
+            entry = geometry_cache.get(obj)
+            cache['bmesh'][obj.name] = entry['bmesh']
+            bvh = cache['bvh'][obj.name] = entry['bvh']
 
         location, normal, index, distance = bvh.ray_cast(origin, direction)
 
@@ -135,7 +467,12 @@ def cast_obj_ray_from_mouse(mousepos, depsgraph=None, candidates=None, objtypes=
     hitindex = None
     hitdistance = sys.maxsize
 
-    for obj in objects:
+    broadphase = bounds_bvh if depsgraph else data_bounds_bvh
+
+    for entry_distance, obj in broadphase.get_ray_candidates(origin_3d, vector_3d.normalized(), objects):
+        if entry_distance > hitdistance:
+            break
+
         mx = obj.matrix_world
         mxi = mx.inverted_safe()
 
@@ -172,7 +509,12 @@ def get_closest(origin, candidates=[], depsgraph=None, debug=False):
 
     objects = [obj for obj in candidates if obj.type == 'MESH']
 
-    for obj in objects:
+    broadphase = bounds_bvh if depsgraph else data_bounds_bvh
+
+    for bounds_distance, obj in broadphase.get_point_candidates(origin, objects):
+        if bounds_distance > nearestdistance:
+            break
+
         mx = obj.matrix_world
 
         origin_local = mx.inverted_safe() @ origin
@@ -201,45 +543,50 @@ def get_closest(origin, candidates=[], depsgraph=None, debug=False):
 
     return None, None, None, None, None, None
 
-def cast_scene_ray_from_mouse(mousepos, depsgraph, exclude=[], exclude_wire=False, unhide=[], debug=False):
+def cast_scene_ray_from_mouse(mousepos, depsgraph, exclude=[], exclude_wire=False, unhide=[], max_steps=100, debug=False):
     region = bpy.context.region
     region_data = bpy.context.region_data
 
     view_origin = region_2d_to_origin_3d(region, region_data, mousepos)
-    view_dir = region_2d_to_vector_3d(region, region_data, mousepos)
+    view_dir = region_2d_to_vector_3d(region, region_data, mousepos).normalized()
 
     scene = bpy.context.scene
 
-    for ob in unhide:
-        ob.hide_set(False)
+    exclude = set(exclude)
 
-    hit, location, normal, index, obj, mx = scene.ray_cast(depsgraph=depsgraph, origin=view_origin, direction=view_dir)
+    origin = view_origin
+    travelled = 0
 
-    hidden = []
+    for step in range(max_steps):
+        hit, location, normal, index, obj, mx = scene.ray_cast(depsgraph=depsgraph, origin=origin, direction=view_dir)
 
-    if hit:
-        if obj in exclude or (exclude_wire and obj.display_type == 'WIRE'):
-            ignore = True
+        if not hit or not (obj in exclude or (exclude_wire and obj.display_type == 'WIRE')):
+            break
 
-            while ignore:
-                if debug:
-                    print(" Ignoring object", obj.name)
+        if debug:
+            print(" Ignoring object", obj.name)
 
-                obj.hide_set(True)
-                hidden.append(obj)
+        travelled = (location - view_origin).length
+        origin = location + view_dir * max(0.00001, travelled * 0.000001)
 
-                hit, location, normal, index, obj, mx = scene.ray_cast(depsgraph=depsgraph, origin=view_origin, direction=view_dir)
+    else:
+        hit = False
 
-                if hit:
-                    ignore = obj in exclude or (exclude_wire and obj.display_type == 'WIRE')
-                else:
-                    break
+    distance = (location - view_origin).length if hit else sys.maxsize
 
     for ob in unhide:
-        ob.hide_set(True)
+        ob_mx = ob.matrix_world
+        ob_mxi = ob_mx.inverted_safe()
+
+        bvh = geometry_cache.get(ob)['bvh']
+        ob_location, ob_normal, ob_index, ob_distance = bvh.ray_cast(ob_mxi @ view_origin, ob_mxi.to_3x3() @ view_dir)
+
+        if ob_location and (ob_mx @ ob_location - view_origin).length < distance:
+            if debug:
+                print(" Hit unhidden object", ob.name)
 
-    for ob in hidden:
-        ob.hide_set(False)
+            hit, location, normal, index, obj, mx = True, ob_mx @ ob_location, (ob_mx.to_3x3() @ ob_normal).normalized(), ob_index, ob, ob_mx
+            distance = (location - view_origin).length
 
     if hit:
         if debug:
@@ -6,7 +6,8 @@ from importlib import import_module
 
 from .. registration import keys as keysdict
 from .. registration import classes as classesdict
-from .. msgbus import group_name_change, group_color_change
+from .. msgbus import group_name_change, group_color_change, visibility_change
+from . developer import profiler
 
 def get_path():
     return os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
@@ -74,6 +75,9 @@ def register_classes(classlists, debug=False):
         if debug:
             print("REGISTERING", c)
 
+        if issubclass(c, bpy.types.Operator) and hasattr(c, 'modal') and not getattr(c.modal, 'is_profiled', False):
+            c.modal = profiler.wrap_modal(c.modal, c.bl_idname)
+
         register_class(c)
 
 
@@ -201,6 +205,11 @@ def register_msgbus(owner):
     bpy.msgbus.subscribe_rna(key=(bpy.types.Object, 'color'), owner=owner, args=(), notify=group_color_change)
     bpy.msgbus.subscribe_rna(key=(bpy.types.Object, 'name'), owner=owner, args=(), notify=group_name_change)
 
+    bpy.msgbus.subscribe_rna(key=(bpy.types.Object, 'hide_viewport'), owner=owner, args=(), notify=visibility_change)
+    bpy.msgbus.subscribe_rna(key=(bpy.types.Collection, 'hide_viewport'), owner=owner, args=(), notify=visibility_change)
+    bpy.msgbus.subscribe_rna(key=(bpy.types.LayerCollection, 'exclude'), owner=owner, args=(), notify=visibility_change)
+    bpy.msgbus.subscribe_rna(key=(bpy.types.LayerCollection, 'hide_viewport'), owner=owner, args=(), notify=visibility_change)
+
 def unregister_msgbus(owner):
     bpy.msgbus.clear_by_owner(owner)
 
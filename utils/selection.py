@@ -1,55 +1,80 @@
+from collections import deque
 
-def get_selected_vert_sequences(verts, ensure_seq_len=False, debug=False):
+def get_edge_adjacency(verts, edges=None):
+    if edges is None:
+        return {v: [e.other_vert(v) for e in v.link_edges if e.select] for v in verts}
+
+    edges = set(edges)
+    return {v: [e.other_vert(v) for e in v.link_edges if e in edges] for v in verts}
+
+def get_vert_sequences(verts, adjacency, strict=False):
     sequences = []
 
-    noncyclicstartverts = [v for v in verts if len([e for e in v.link_edges if e.select]) == 1]
+    remaining = set(verts)
+    order = list(verts)
+
+    noncyclicstartverts = [v for v in order if len(adjacency[v]) == 1]
+
+    order_idx = 0
+    start_idx = 0
 
-    if noncyclicstartverts:
-        v = noncyclicstartverts[0]
+    def get_start_vert():
+        nonlocal order_idx, start_idx
 
-    else:
-        v = verts[0]
+        while start_idx < len(noncyclicstartverts) and noncyclicstartverts[start_idx] not in remaining:
+            start_idx += 1
+
+        if start_idx < len(noncyclicstartverts):
+            return noncyclicstartverts[start_idx]
+
+        while order[order_idx] not in remaining:
+            order_idx += 1
+
+        return order[order_idx]
+
+    v = get_start_vert()
 
     seq = []
+    seen = set()
 
-    while verts:
+    while remaining:
         seq.append(v)
+        seen.add(v)
 
-        if v not in verts:
-            break
+        if v not in remaining:
+            if strict:
+                raise ValueError(f"vertex {v.index} is already part of another sequence")
 
-        else:
-            verts.remove(v)
+            break
 
-        if v in noncyclicstartverts:
-            noncyclicstartverts.remove(v)
+        remaining.discard(v)
 
-        nextv = [e.other_vert(v) for e in v.link_edges if e.select and e.other_vert(v) not in seq]
+        nextv = [other for other in adjacency.get(v, ()) if other not in seen]
 
         if nextv:
             v = nextv[0]
 
         else:
-            cyclic = True if len([e for e in v.link_edges if e.select]) == 2 else False
+            cyclic = len(adjacency.get(v, ())) == 2
 
             sequences.append((seq, cyclic))
 
-            if verts:
-                if noncyclicstartverts:
-                    v = noncyclicstartverts[0]
-                else:
-                    v = verts[0]
+            if remaining:
+                v = get_start_vert()
 
                 seq = []
+                seen = set()
 
-    if ensure_seq_len:
-        seqs = []
+    verts.clear()
 
-        for seq, cyclic in sequences:
-            if len(seq) > 1:
-                seqs.append((seq, cyclic))
+    return sequences
 
-        sequences = seqs
+def get_selected_vert_sequences(verts, ensure_seq_len=False, debug=False):
+    adjacency = get_edge_adjacency(verts)
+    sequences = get_vert_sequences(verts, adjacency)
+
+    if ensure_seq_len:
+        sequences = [(seq, cyclic) for seq, cyclic in sequences if len(seq) > 1]
 
     if debug:
         for seq, cyclic in sequences:
@@ -58,42 +83,8 @@ def get_selected_vert_sequences(verts, ensure_seq_len=False, debug=False):
     return sequences
 
 def get_edges_vert_sequences(verts, edges, debug=False):
-    sequences = []
-
-    noncyclicstartverts = [v for v in verts if len([e for e in v.link_edges if e in edges]) == 1]
-
-    if noncyclicstartverts:
-        v = noncyclicstartverts[0]
-
-    else:
-        v = verts[0]
-
-    seq = []
-
-    while verts:
-        seq.append(v)
-        verts.remove(v)
-
-        if v in noncyclicstartverts:
-            noncyclicstartverts.remove(v)
-
-        nextv = [e.other_vert(v) for e in v.link_edges if e in edges and e.other_vert(v) not in seq]
-
-        if nextv:
-            v = nextv[0]
-
-        else:
-            cyclic = True if len([e for e in v.link_edges if e in edges]) == 2 else False
-
-            sequences.append((seq, cyclic))
-
-            if verts:
-                if noncyclicstartverts:
-                    v = noncyclicstartverts[0]
-                else:
-                    v = verts[0]
-
-                seq = []
+    adjacency = get_edge_adjacency(verts, edges)
+    sequences = get_vert_sequences(verts, adjacency, strict=True)
 
     if debug:
         for verts, cyclic in sequences:
@@ -106,31 +97,32 @@ def get_selection_islands(faces, debug=False):
         print("selected:", [f.index for f in faces])
 
     face_islands = []
+    seen = set()
 
-    while faces:
-        island = [faces[0]]
-        foundmore = [faces[0]]
+    for face in faces:
+        if face in seen:
+            continue
 
-        if debug:
-            print("island:", [f.index for f in island])
-            print("foundmore:", [f.index for f in foundmore])
+        island = [face]
+        seen.add(face)
+
+        foundmore = deque(island)
 
         while foundmore:
-            for e in foundmore[0].edges:
-                bf = [f for f in e.link_faces if f.select and f not in island]
-                if bf:
-                    island.append(bf[0])
-                    foundmore.append(bf[0])
+            f = foundmore.popleft()
 
-            if debug:
-                print("popping", foundmore[0].index)
+            for e in f.edges:
+                for bf in e.link_faces:
+                    if bf.select and bf not in seen:
+                        seen.add(bf)
+                        island.append(bf)
+                        foundmore.append(bf)
 
-            foundmore.pop(0)
+                        break
 
         face_islands.append(island)
 
-        for f in island:
-            faces.remove(f)
+    faces.clear()
 
     if debug:
         print()
@@ -141,12 +133,8 @@ def get_selection_islands(faces, debug=False):
     islands = []
 
     for fi in face_islands:
-        vi = set()
-        ei = set()
-
-        for f in fi:
-            vi.update(f.verts)
-            ei.update(f.edges)
+        vi = dict.fromkeys(v for f in fi for v in f.verts)
+        ei = dict.fromkeys(e for f in fi for e in f.edges)
 
         islands.append((list(vi), list(ei), fi))
 
@@ -1,6 +1,5 @@
 import bpy
-import bmesh
-from . raycast import cast_scene_ray_from_mouse
+from . raycast import cast_scene_ray_from_mouse, geometry_cache
 
 class Snap:
     def log(self, *args, **kwargs):
@@ -63,25 +62,23 @@ class Snap:
             name = self.hitobj.name
 
             if name not in self.cache.objects:
-
                 self.cache.objects[name] = self.hitobj
+                self.cache.tri_coords[name] = {}
 
-                mesh = bpy.data.meshes.new_from_object(self.hitobj.evaluated_get(self.depsgraph), depsgraph=self.depsgraph)
-                self.cache.meshes[name] = mesh
-
-                bm = bmesh.new()
-                bm.from_mesh(mesh)
-                bm.verts.ensure_lookup_table()
-                bm.faces.ensure_lookup_table()
-                self.cache.bmeshes[name] = bm
+            depsgraph = None if self.hitobj in self.alternative else self.depsgraph
+            entry = geometry_cache.get(self.hitobj, depsgraph=depsgraph)
 
-                self.cache.loop_triangles[name] = bm.calc_loop_triangles()
+            if entry['bmesh'] is not self.cache.bmeshes.get(name):
+                self.cache.bmeshes[name] = entry['bmesh']
+                self.cache.loop_triangles[name] = geometry_cache.get_loop_triangles(self.hitobj, depsgraph=depsgraph)
                 self.cache.tri_coords[name] = {}
 
-            if not self.hitface or (self.hitface and self.hitface.index != self.hitindex):
+            hitface = self.cache.bmeshes[name].faces[self.hitindex]
+
+            if hitface != self.hitface:
                 self.log("Hitface changed to", self.hitindex)
 
-                self.hitface = self.cache.bmeshes[name].faces[self.hitindex]
+                self.hitface = hitface
 
             if self.hitindex not in self.cache.tri_coords[name]:
                 self.log("Adding tri coords for face index", self.hitindex)
@@ -124,8 +121,6 @@ class Snap:
 
                 dup = obj.copy()
                 dup.data = obj.data.copy()
-                context.scene.collection.objects.link(dup)
-                dup.hide_set(True)
 
                 self.alternative.append(dup)
 
@@ -134,7 +129,11 @@ class Snap:
     def _remove_alternatives(self):
         for obj in self.alternative:
             self.log(f" Removing alternave object {obj.name}")
-            bpy.data.meshes.remove(obj.data, do_unlink=True)
+            geometry_cache.invalidate(obj)
+
+            mesh = obj.data
+            bpy.data.objects.remove(obj, do_unlink=True)
+            bpy.data.meshes.remove(mesh, do_unlink=True)
 
     def _update_meshes(self, context):
         self._edit_mesh_objs = [obj for obj in context.visible_objects if obj.mode == 'EDIT']
@@ -164,7 +163,6 @@ class SnapCache:
     debug = False
 
     objects = {}
-    meshes = {}
 
     bmeshes = {}
 
@@ -176,16 +174,9 @@ class SnapCache:
         self.log(" Initialize SnappingCache")
 
     def clear(self):
-        for name, mesh in self.meshes.items():
-            self.log(f" Removing {name}'s temporary snapping mesh {mesh.name} with {len(mesh.polygons)} faces and {len(mesh.vertices)} verts")
-            bpy.data.meshes.remove(mesh, do_unlink=True)
-
-        for name, bm in self.bmeshes.items():
-            self.log(f" Freeing {name}'s temporary snapping bmesh")
-            bm.free()
+        self.log(" Releasing snapping bmeshes back to the geometry cache")
 
         self.objects.clear()
-        self.meshes.clear()
 
         self.bmeshes.clear()
 
@@ -5,6 +5,7 @@ from bpy_extras.view3d_utils import region_2d_to_location_3d, location_3d_to_reg
 from bl_ui.space_statusbar import STATUSBAR_HT_header as statusbar
 from . registration import get_prefs
 from time import time
+import numpy as np
 
 icons = None
 
@@ -135,6 +136,17 @@ def get_zoom_factor(context, depth_location, scale=10, ignore_obj_scale=False):
         return zoom_vector.length
     return (center_3d - offset_3d).length
 
+def get_zoom_factors(context, locations, scale=10):
+    region = context.region
+    rv3d = context.region_data
+
+    persp = np.array(rv3d.perspective_matrix)
+    window = np.array(rv3d.window_matrix)
+
+    w = np.abs(locations @ persp[3, :3] + persp[3, 3])
+
+    return scale * 2 * w / (window[0][0] * region.width)
+
 def get_flick_direction(context, mouse_loc_3d, flick_vector, axes):
     origin_2d = location_3d_to_region_2d(context.region, context.region_data, mouse_loc_3d, default=Vector((context.region.width / 2, context.region.height / 2)))
     axes_2d = {}
@@ -760,7 +760,7 @@ data = {
     "Enabled Auto Smooth with angle {}": '使用角度 {} 启用了自动平滑',
     "(incl. on Instances)": '（包括实例）',
     "Toggle Auto Smooth": '切换自动平滑',
-    "Cleared {} Edges": '清除了 {} 边',
+    "Cleared {} on {} Meshes": '清除了 {1} 个网格上的 {0}',
     "Marked Edges Sharp {}based on Angle {}": '基于角度 {} 标记了 {} 边缘为尖锐',
     "additively ": '叠加地',
     "Disabled Auto Smooth on {} Objects": '禁用了 {} 对象上的自动平滑',